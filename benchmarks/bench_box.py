@@ -0,0 +1,128 @@
+"""Benchmarks for the construction and use of a single Box."""
+import numpy as np
+
+from molbox import Box
+
+BOXES = {
+    "orthorhombic": ([3.0, 4.0, 5.0], [90.0, 90.0, 90.0]),
+    "triclinic": ([3.0, 6.0, 7.0], [97.0, 99.0, 120.0]),
+}
+
+
+class BoxConstruction:
+    params = list(BOXES)
+    param_names = ["box"]
+
+    def setup(self, kind):
+        (self.lengths, self.angles) = BOXES[kind]
+        box = Box(lengths=self.lengths, angles=self.angles)
+        self.vectors = box.vectors
+        self.tilt_factors = box.tilt_factors
+        self.uvec = box.vectors / np.linalg.norm(box.vectors, axis=1)[:, None]
+        self.mins = [0.0, 0.0, 0.0]
+        self.maxs = self.lengths
+
+    def time_init(self, kind):
+        Box(lengths=self.lengths, angles=self.angles)
+
+    def time_from_lengths_angles(self, kind):
+        Box.from_lengths_angles(lengths=self.lengths, angles=self.angles)
+
+    def time_from_vectors(self, kind):
+        Box.from_vectors(self.vectors)
+
+    def time_from_reduced_vectors(self, kind):
+        Box.from_reduced_vectors(self.vectors)
+
+    def time_from_uvec_lengths(self, kind):
+        Box.from_uvec_lengths(self.uvec, self.lengths)
+
+    def time_from_mins_maxs_angles(self, kind):
+        Box.from_mins_maxs_angles(self.mins, self.maxs, self.angles)
+
+    def time_from_lengths_tilt_factors(self, kind):
+        Box.from_lengths_tilt_factors(self.lengths, self.tilt_factors)
+
+    def time_from_lo_hi_tilt_factors(self, kind):
+        Box.from_lo_hi_tilt_factors(self.mins, self.maxs, self.tilt_factors)
+
+    def peakmem_many_boxes(self, kind):
+        [Box.from_reduced_vectors(self.vectors) for _ in range(10000)]
+
+
+class BoxProperties:
+    params = list(BOXES)
+    param_names = ["box"]
+
+    def setup(self, kind):
+        self.box = Box(*BOXES[kind])
+
+    def time_lengths(self, kind):
+        self.box.lengths
+
+    def time_angles(self, kind):
+        self.box.angles
+
+    def time_tilt_factors(self, kind):
+        self.box.tilt_factors
+
+    def time_bravais_parameters(self, kind):
+        self.box.bravais_parameters
+
+    def time_raw(self, kind):
+        self.box.raw.lengths
+
+    def time_inverse_vectors(self, kind):
+        self.box.inverse_vectors
+
+    def time_volume(self, kind):
+        self.box.volume
+
+
+class BoxCoordinates:
+    params = (list(BOXES), [1000, 100000, 1000000])
+    param_names = ["box", "n_particles"]
+
+    def setup(self, kind, n_particles):
+        self.box = Box(*BOXES[kind])
+        rng = np.random.default_rng(0)
+        self.positions = rng.uniform(-10.0, 10.0, size=(n_particles, 3))
+        self.out = np.empty_like(self.positions)
+
+    def time_to_fractional(self, kind, n_particles):
+        self.box.to_fractional(self.positions, out=self.out)
+
+    def time_to_cartesian(self, kind, n_particles):
+        self.box.to_cartesian(self.positions, out=self.out)
+
+    def time_wrap(self, kind, n_particles):
+        self.box.wrap(self.positions, out=self.out)
+
+    def time_minimum_image(self, kind, n_particles):
+        self.box.minimum_image(self.positions, out=self.out)
+
+    def time_sample_uniform(self, kind, n_particles):
+        self.box.sample_uniform(n_particles, rng=0)
+
+
+class BoxDistances:
+    params = (list(BOXES), [100, 1000])
+    param_names = ["box", "n_particles"]
+
+    def setup(self, kind, n_particles):
+        self.box = Box(*BOXES[kind])
+        rng = np.random.default_rng(0)
+        self.positions = rng.uniform(0.0, 5.0, size=(n_particles, 3))
+
+    def time_all_pairs(self, kind, n_particles):
+        self.box.distances(self.positions)
+
+    def peakmem_all_pairs_chunked(self, kind, n_particles):
+        self.box.distances(self.positions, chunk_size=16)
+
+
+def timeraw_import_molbox():
+    return "import molbox"
+
+
+timeraw_import_molbox.repeat = 10
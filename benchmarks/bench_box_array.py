@@ -0,0 +1,38 @@
+"""Benchmarks for batched boxes."""
+import warnings
+
+import numpy as np
+
+from molbox import BoxArray
+
+
+class BoxArrayConstruction:
+    params = (["orthorhombic", "triclinic"], [100, 10000, 1000000])
+    param_names = ["box", "n_frames"]
+
+    def setup(self, kind, n_frames):
+        rng = np.random.default_rng(0)
+        self.lengths = rng.uniform(3.0, 4.0, size=(n_frames, 3))
+        if kind == "orthorhombic":
+            self.angles = np.full((n_frames, 3), 90.0)
+        else:
+            self.angles = rng.uniform(80.0, 100.0, size=(n_frames, 3))
+        self.boxes = BoxArray(self.lengths, self.angles)
+        self.vectors = self.boxes.vectors
+        self.tilt_factors = self.boxes.tilt_factors
+        warnings.simplefilter("ignore")
+
+    def time_init(self, kind, n_frames):
+        BoxArray(self.lengths, self.angles)
+
+    def time_from_vectors(self, kind, n_frames):
+        BoxArray.from_vectors(self.vectors)
+
+    def time_from_lengths_tilt_factors(self, kind, n_frames):
+        BoxArray.from_lengths_tilt_factors(self.lengths, self.tilt_factors)
+
+    def time_angles(self, kind, n_frames):
+        self.boxes.angles
+
+    def time_getitem(self, kind, n_frames):
+        self.boxes[n_frames // 2]
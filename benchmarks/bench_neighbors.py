@@ -0,0 +1,30 @@
+"""Benchmarks for neighbor searches."""
+import numpy as np
+
+from molbox import Box
+from molbox.neighbors import CellList, VerletList
+
+
+class NeighborSearch:
+    params = (["orthorhombic", "triclinic"], [1000, 100000])
+    param_names = ["box", "n_particles"]
+    timeout = 120
+
+    def setup(self, kind, n_particles):
+        # Constant density of ~0.1 particles per unit volume
+        length = (n_particles / 0.1) ** (1.0 / 3.0)
+        angles = [90.0, 90.0, 90.0] if kind == "orthorhombic" else [80, 85, 95]
+        self.box = Box(lengths=[length] * 3, angles=angles)
+        rng = np.random.default_rng(0)
+        self.positions = self.box.wrap(
+            rng.uniform(0.0, length, size=(n_particles, 3))
+        )
+        self.cell_list = CellList(self.box, cutoff=3.0)
+        self.verlet_list = VerletList(self.box, cutoff=3.0, skin=0.5)
+        self.verlet_list.update(self.positions)
+
+    def time_cell_list(self, kind, n_particles):
+        self.cell_list.neighbors(self.positions)
+
+    def time_verlet_list_no_rebuild(self, kind, n_particles):
+        self.verlet_list.neighbors(self.positions)
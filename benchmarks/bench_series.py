@@ -0,0 +1,37 @@
+"""Benchmarks for memory-mapped box series."""
+import os
+import tempfile
+
+import numpy as np
+
+from molbox import BoxArray
+from molbox.series import BoxSeries
+
+
+class BoxSeriesAccess:
+    params = ([1000, 1000000],)
+    param_names = ["n_frames"]
+
+    def setup(self, n_frames):
+        rng = np.random.default_rng(0)
+        boxes = BoxArray(
+            rng.uniform(3.0, 4.0, size=(n_frames, 3)),
+            rng.uniform(80.0, 100.0, size=(n_frames, 3)),
+        )
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "boxes.npy")
+        boxes.save(self.path)
+        self.series = BoxSeries(self.path)
+
+    def teardown(self, n_frames):
+        del self.series
+        self.tmpdir.cleanup()
+
+    def time_open(self, n_frames):
+        BoxSeries(self.path)
+
+    def time_getitem_last(self, n_frames):
+        self.series[n_frames - 1]
+
+    def time_slice(self, n_frames):
+        self.series[n_frames // 2 : n_frames // 2 + 1000]
@@ -4,11 +4,20 @@ A generic Box implementation for molecular simulation objects
 """
 
 # Add imports here
-from .box import Box
-
-# Handle versioneer
-from ._version import get_versions
-versions = get_versions()
-__version__ = versions['version']
-__git_revision__ = versions['full-revisionid']
-del get_versions, versions
+from .box import Box, BoxInterner, FrozenBox, intern_box
+from .box_array import BoxArray, unique_boxes
+
+
+def __getattr__(name):
+    # Handle versioneer lazily, resolving the version from a source checkout
+    # may call git, which is only worth it when the version is requested.
+    # Installed packages get a static _version.py written at build time by
+    # the versioneer build_py/sdist commands.
+    if name in ("__version__", "__git_revision__"):
+        from ._version import get_versions
+
+        versions = get_versions()
+        globals()["__version__"] = versions["version"]
+        globals()["__git_revision__"] = versions["full-revisionid"]
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,15 +1,71 @@
 """generic box module."""
+import math
+import struct
+from collections import OrderedDict, namedtuple
 from warnings import warn
 
 import numpy as np
 
-__all__ = ["Box", "BoxError"]
+__all__ = ["Box", "BoxError", "BoxInterner", "FrozenBox", "intern_box"]
+
+# Number of rows processed at a time by methods operating on coordinates, this
+# bounds the size of the temporary arrays needed for large systems.
+_CHUNK_SIZE = 65536
+
+# Offsets of the 27 periodic images surrounding (and including) a cell.
+_IMAGE_OFFSETS = np.array(
+    [(i, j, k) for i in (-1, 0, 1) for j in (-1, 0, 1) for k in (-1, 0, 1)],
+    dtype=np.float64,
+)
+
+# Binary layout of a serialized box: the six lower triangular entries of the
+# reduced vectors (ax, bx, by, cx, cy, cz) as little-endian float64, followed
+# by the precision as an unsigned byte.
+_BOX_STRUCT = struct.Struct("<6dB")
+_TRIL_INDICES = np.tril_indices(3)
 
 
 class BoxError(Exception):
     """Exception to be raised when there's an error in Box methods"""
 
 
+class _BoxParameters(
+    namedtuple(
+        "_BoxParameters",
+        ["Lx", "Ly", "Lz", "xy", "xz", "yz", "alpha", "beta", "gamma"],
+    )
+):
+    """Lengths, tilt factors and angles of a box, computed once."""
+
+    __slots__ = ()
+
+    @property
+    def lengths(self):
+        """Lengths of the box."""
+        return self.Lx, self.Ly, self.Lz
+
+    @property
+    def tilt_factors(self):
+        """Return the 3 tilt_factors (xy, xz, yz) of the box."""
+        return self.xy, self.xz, self.yz
+
+    @property
+    def angles(self):
+        """Angles defining the tilt of the box (alpha, beta, gamma)."""
+        return self.alpha, self.beta, self.gamma
+
+    def round(self, precision):
+        """Return the lengths, tilt factors and angles rounded to `precision`.
+
+        Each group is a tuple of 3 values, so that the same tuples can be
+        returned by the properties of a box on every access.
+        """
+        return tuple(
+            tuple(round(value, precision) for value in group)
+            for group in (self.lengths, self.tilt_factors, self.angles)
+        )
+
+
 class Box(object):
     """A box representing the bounds of the system.
 
@@ -56,6 +112,11 @@ class Box(object):
     Box vectors are expected to be provided in row-major format.
     """
 
+    __slots__ = ("_precision", "_vectors", "_raw", "_rounded", "_cache")
+
+    # Boxes can be modified, use `Box.freeze` to get a hashable box.
+    __hash__ = None
+
     def __init__(self, lengths, angles=None, precision=None):
         if precision is not None:
             self._precision = int(precision)
@@ -65,16 +126,55 @@ class Box(object):
         if angles is None:
             angles = [90.0, 90.0, 90.0]
 
-        self._vectors = _lengths_angles_to_vectors(
-            lengths=lengths, angles=angles, precision=self.precision
+        self._set_vectors(
+            _lengths_angles_to_vectors(
+                lengths=lengths, angles=angles, precision=self.precision
+            )
         )
-        (Lx, Ly, Lz, xy, xz, yz) = self._from_vecs_to_lengths_tilt_factors()
-        self._Lx = Lx
-        self._Ly = Ly
-        self._Lz = Lz
-        self._xy = xy
-        self._xz = xz
-        self._yz = yz
+
+    def _set_vectors(self, vectors):
+        """Set the reduced box vectors.
+
+        Derived parameters and cached quantities are only computed when first
+        accessed, a freshly created box only holds its vectors. The vectors
+        are made read-only so that those cannot go stale.
+        """
+        vectors.flags.writeable = False
+        self._vectors = vectors
+        self._raw = None
+        self._rounded = None
+        self._cache = None
+
+    @classmethod
+    def from_reduced_vectors(cls, vectors, precision=None, validate=False):
+        """Generate a box from vectors already in the reduced form.
+
+        This is the cheapest way to construct a box, intended for vectors
+        produced by molbox itself (e.g. `box.vectors`, or the vectors of a
+        `BoxArray`). The vectors must be lower triangular with a positive
+        diagonal, i.e. the first vector along x and the second one in the xy
+        plane. No trigonometry or normalization is performed unless
+        `validate` is True.
+
+        Parameters
+        ----------
+        vectors : array-like, shape=(3,3), dtype=float
+            Box vectors in the reduced, row-major form.
+        precision : int, optional, default=None
+            Control the precision of the floating point representation of box
+            attributes. If none provided, the default is 6 decimals.
+        validate : bool, optional, default=False
+            If True, the vectors are validated and normalized into the reduced
+            form as done by `Box.from_vectors`.
+        """
+        box = cls.__new__(cls)
+        box._precision = 6 if precision is None else int(precision)
+        if validate:
+            vectors = _validate_box_vectors(vectors)
+        else:
+            vectors = np.array(vectors, dtype=np.float64).reshape(3, 3)
+        box._set_vectors(vectors.round(box._precision))
+        return box
 
     @classmethod
     def from_lengths_angles(cls, lengths, angles, precision=None):
@@ -114,18 +214,8 @@ class Box(object):
     @classmethod
     def from_vectors(cls, vectors, precision=None):
         """Generate a box from box vectors."""
-        vectors = _validate_box_vectors(vectors)
-        (alpha, beta, gamma) = _calc_angles(vectors)
-        v1 = vectors[0, :]
-        v2 = vectors[1, :]
-        v3 = vectors[2, :]
-
-        Lx = np.linalg.norm(v1)
-        Ly = np.linalg.norm(v2)
-        Lz = np.linalg.norm(v3)
-        lengths = (Lx, Ly, Lz)
-        return cls(
-            lengths=lengths, angles=(alpha, beta, gamma), precision=precision
+        return cls.from_reduced_vectors(
+            vectors, precision=precision, validate=True
         )
 
     @classmethod
@@ -177,51 +267,59 @@ class Box(object):
     @property
     def Lx(self):
         """Length in the x direction."""
-        return round(self._Lx, self.precision)
+        return self._get_rounded()[0][0]
 
     @property
     def Ly(self):
         """Length in the y direction."""
-        return round(self._Ly, self.precision)
+        return self._get_rounded()[0][1]
 
     @property
     def Lz(self):
         """Length in the z direction."""
-        return round(self._Lz, self.precision)
+        return self._get_rounded()[0][2]
 
     @property
     def lengths(self):
         """Lengths of the box."""
-        return self.Lx, self.Ly, self.Lz
+        return self._get_rounded()[0]
 
     @property
     def xy(self):
         """Tilt factor xy of the box."""
-        return round(self._xy, self.precision)
+        return self._get_rounded()[1][0]
 
     @property
     def xz(self):
         """Tilt factor xz of the box."""
-        return round(self._xz, self.precision)
+        return self._get_rounded()[1][1]
 
     @property
     def yz(self):
         """Tilt factor yz of the box."""
-        return round(self._yz, self.precision)
+        return self._get_rounded()[1][2]
 
     @property
     def tilt_factors(self):
         """Return the 3 tilt_factors (xy, xz, yz) of the box."""
-        return self.xy, self.xz, self.yz
+        return self._get_rounded()[1]
 
     @property
     def angles(self):
         """Angles defining the tilt of the box (alpha, beta, gamma)."""
-        (alpha, beta, gamma) = self._get_angles()
-        alpha = round(alpha, self.precision)
-        beta = round(beta, self.precision)
-        gamma = round(gamma, self.precision)
-        return alpha, beta, gamma
+        return self._get_rounded()[2]
+
+    @property
+    def raw(self):
+        """Unrounded lengths, tilt factors and angles of the box.
+
+        Values are computed once from the box vectors and are not rounded to
+        `precision`, for numerical code that needs full precision. The
+        returned named tuple has the fields Lx, Ly, Lz, xy, xz, yz, alpha,
+        beta and gamma, as well as the `lengths`, `tilt_factors` and `angles`
+        groups, e.g. `box.raw.lengths`.
+        """
+        return self._get_raw()
 
     @property
     def precision(self):
@@ -236,6 +334,82 @@ class Box(object):
         else:
             precision = int(value)
         self._precision = precision
+        self._rounded = None
+        self._cache = None
+
+    @property
+    def inverse_vectors(self):
+        """Inverse of the box vectors matrix, computed once and cached.
+
+        Maps Cartesian coordinates (row vectors) to fractional coordinates,
+        `frac = xyz @ box.inverse_vectors`.
+        """
+        return self._get_cached(
+            "inverse_vectors", lambda: np.linalg.inv(self._vectors)
+        )
+
+    @property
+    def metric_tensor(self):
+        """Metric tensor G = V V^T of the box vectors, cached."""
+        return self._get_cached(
+            "metric_tensor", lambda: np.matmul(self._vectors, self._vectors.T)
+        )
+
+    @property
+    def reciprocal_vectors(self):
+        """Reciprocal lattice vectors (as rows), cached.
+
+        The crystallographic convention is used, without the factor of 2*pi,
+        so that the dot product of box vector i and reciprocal vector j is
+        1 if i == j and 0 otherwise.
+        """
+        return self._get_cached(
+            "reciprocal_vectors", lambda: self.inverse_vectors.T.copy()
+        )
+
+    @property
+    def volume(self):
+        """Volume of the box, cached."""
+        return self._get_cached(
+            "volume", lambda: float(abs(np.linalg.det(self._vectors)))
+        )
+
+    @property
+    def face_areas(self):
+        """Areas of the faces of the box, cached.
+
+        Face i is the face spanned by the two box vectors other than vector
+        i, e.g. the first area is the norm of the cross product of the second
+        and third box vectors.
+        """
+
+        def compute():
+            v = self._vectors
+            return np.linalg.norm(np.cross(v[[1, 2, 0]], v[[2, 0, 1]]), axis=1)
+
+        return self._get_cached("face_areas", compute)
+
+    @property
+    def perpendicular_widths(self):
+        """Distances between opposite faces of the box, cached.
+
+        Width i is measured along the normal of face i (see `face_areas`),
+        i.e. the spacing of the lattice planes spanned by the two other box
+        vectors.
+        """
+        return self._get_cached(
+            "perpendicular_widths", lambda: self.volume / self.face_areas
+        )
+
+    @property
+    def max_cutoff(self):
+        """Largest cutoff for which the minimum image convention is unique.
+
+        Equal to half the smallest perpendicular width of the box.
+        """
+        return self._get_cached(
+            "max_cutoff", lambda: 0.5 * float(self.perpendicular_widths.min())
+        )
 
     @property
     def bravais_parameters(self):
@@ -256,6 +430,423 @@ class Box(object):
         (Lx, Ly, Lz) = self.lengths
         return Lx, Ly, Lz, alpha, beta, gamma
 
+    def isclose(self, other, rtol=1e-05, atol=1e-08):
+        """Check if two boxes are equal within a tolerance.
+
+        Boxes are compared through their vectors in the reduced form, so
+        boxes built from rotated vectors compare equal. The tolerances follow
+        `np.isclose`, each vector component must satisfy
+        `abs(a - b) <= atol + rtol * abs(b)`.
+
+        Parameters
+        ----------
+        other : molbox.Box
+            Box to compare to.
+        rtol : float, optional, default=1e-05
+            Relative tolerance.
+        atol : float, optional, default=1e-08
+            Absolute tolerance, in units of length.
+
+        Returns
+        -------
+        isclose : bool
+        """
+        if not isinstance(other, Box):
+            raise BoxError(
+                f"Can only compare a Box with another Box, got {type(other)}"
+            )
+        return bool(
+            np.allclose(self._vectors, other._vectors, rtol=rtol, atol=atol)
+        )
+
+    def to_fractional(self, xyz, out=None):
+        """Convert Cartesian coordinates to fractional coordinates.
+
+        The box vectors are lower triangular, so the conversion is done by
+        forward substitution on the columns instead of a general matrix
+        product with the inverse.
+
+        Parameters
+        ----------
+        xyz : array-like, shape=(..., 3), dtype=float
+            Cartesian coordinates. float32 input is processed in single
+            precision.
+        out : np.ndarray, shape=(..., 3), optional, default=None
+            Array to store the fractional coordinates in, may be `xyz` itself
+            for an in-place conversion.
+
+        Returns
+        -------
+        frac : np.ndarray, shape=(..., 3)
+            The fractional coordinates, `out` if it was provided.
+        """
+        (xyz, out) = _prepare_coordinates(xyz, out)
+        v = self._vectors.astype(out.dtype, copy=False)
+        for (src, dst) in _chunks(xyz, out):
+            # Columns are computed from z to x, so that each input column is
+            # read before being overwritten when converting in place.
+            dst[..., 2] = src[..., 2] / v[2, 2]
+            dst[..., 1] = (src[..., 1] - dst[..., 2] * v[2, 1]) / v[1, 1]
+            dst[..., 0] = (
+                src[..., 0] - dst[..., 1] * v[1, 0] - dst[..., 2] * v[2, 0]
+            ) / v[0, 0]
+        return out
+
+    def to_cartesian(self, frac, out=None):
+        """Convert fractional coordinates to Cartesian coordinates.
+
+        Parameters
+        ----------
+        frac : array-like, shape=(..., 3), dtype=float
+            Fractional coordinates. float32 input is processed in single
+            precision.
+        out : np.ndarray, shape=(..., 3), optional, default=None
+            Array to store the Cartesian coordinates in, may be `frac` itself
+            for an in-place conversion.
+
+        Returns
+        -------
+        xyz : np.ndarray, shape=(..., 3)
+            The Cartesian coordinates, `out` if it was provided.
+        """
+        (frac, out) = _prepare_coordinates(frac, out)
+        v = self._vectors.astype(out.dtype, copy=False)
+        for (src, dst) in _chunks(frac, out):
+            # Columns are computed from x to z, so that each input column is
+            # read before being overwritten when converting in place.
+            dst[..., 0] = (
+                src[..., 0] * v[0, 0]
+                + src[..., 1] * v[1, 0]
+                + src[..., 2] * v[2, 0]
+            )
+            dst[..., 1] = src[..., 1] * v[1, 1] + src[..., 2] * v[2, 1]
+            dst[..., 2] = src[..., 2] * v[2, 2]
+        return out
+
+    def wrap(self, positions, out=None):
+        """Wrap positions into the primary cell of the box.
+
+        Positions are mapped to fractional coordinates, wrapped into [0, 1)
+        and mapped back to Cartesian coordinates. The origin of the box is
+        assumed to be at (0, 0, 0).
+
+        Parameters
+        ----------
+        positions : array-like, shape=(..., 3), dtype=float
+            Cartesian coordinates to wrap. float32 input is processed in
+            single precision.
+        out : np.ndarray, shape=(..., 3), optional, default=None
+            Array to store the wrapped coordinates in. Passing `positions`
+            itself wraps the coordinates in place.
+
+        Returns
+        -------
+        wrapped : np.ndarray, shape=(..., 3)
+            The wrapped coordinates, `out` if it was provided.
+        """
+        (positions, out) = _prepare_coordinates(positions, out)
+        for (src, dst) in _chunks(positions, out):
+            self.to_fractional(src, out=dst)
+            np.remainder(dst, 1.0, out=dst)
+            # Tiny negative values round up to exactly 1.0, which is outside
+            # the half-open unit cell.
+            dst[dst == 1.0] = 0.0
+            self.to_cartesian(dst, out=dst)
+        return out
+
+    def sample_uniform(self, n, rng=None, dtype=np.float64):
+        """Draw points uniformly distributed inside the box.
+
+        Points are drawn in fractional coordinates and mapped through the box
+        vectors, so no rejection is needed for tilted boxes.
+
+        Parameters
+        ----------
+        n : int
+            Number of points to draw.
+        rng : int or np.random.Generator, optional, default=None
+            Seed or random number generator, for reproducible sampling.
+        dtype : np.float32 or np.float64, optional, default=np.float64
+            Floating point type of the returned coordinates.
+
+        Returns
+        -------
+        points : np.ndarray, shape=(n, 3)
+            Cartesian coordinates of the points.
+        """
+        rng = np.random.default_rng(rng)
+        frac = rng.random((n, 3), dtype=dtype)
+        return self.to_cartesian(frac, out=frac)
+
+    def replicate(self, nx, ny, nz, positions=None):
+        """Replicate the box, and optionally coordinates, into a supercell.
+
+        Parameters
+        ----------
+        nx, ny, nz : int
+            Number of replicas along each of the three box vectors.
+        positions : array-like, shape=(N, 3), dtype=float, optional
+            Cartesian coordinates of the particles in the box.
+
+        Returns
+        -------
+        box : molbox.Box
+            The supercell box, when `positions` is None.
+        box, positions : molbox.Box, np.ndarray, shape=(nx*ny*nz*N, 3)
+            The supercell box and the tiled coordinates, when `positions` is
+            provided. Coordinates are ordered image by image, with the image
+            index along the first box vector varying slowest.
+
+        See Also
+        --------
+        Box.iter_replicate : to stream the tiled coordinates block by block.
+        """
+        counts = _replica_counts(nx, ny, nz)
+        box = type(self).from_reduced_vectors(
+            self._vectors * counts[:, np.newaxis], precision=self.precision
+        )
+        if positions is None:
+            return box
+        positions = np.asarray(positions)
+        if not np.issubdtype(positions.dtype, np.floating):
+            positions = positions.astype(np.float64)
+        shifts = self._image_shifts(counts).astype(positions.dtype)
+        tiled = shifts[:, np.newaxis, :] + positions.reshape(1, -1, 3)
+        return box, tiled.reshape(-1, 3)
+
+    def iter_replicate(self, nx, ny, nz, positions, images_per_block=1):
+        """Iterate over the tiled coordinates of a supercell, block by block.
+
+        Only one block is held in memory at a time, so very large supercells
+        can be streamed, e.g. to disk. Blocks are yielded in the same order
+        as the coordinates returned by `Box.replicate`.
+
+        Parameters
+        ----------
+        nx, ny, nz : int
+            Number of replicas along each of the three box vectors.
+        positions : array-like, shape=(N, 3), dtype=float
+            Cartesian coordinates of the particles in the box.
+        images_per_block : int, optional, default=1
+            Number of periodic images in each yielded block.
+
+        Yields
+        ------
+        block : np.ndarray, shape=(images_per_block*N, 3)
+            Tiled coordinates, the last block may contain fewer images.
+        """
+        counts = _replica_counts(nx, ny, nz)
+        positions = np.asarray(positions)
+        if not np.issubdtype(positions.dtype, np.floating):
+            positions = positions.astype(np.float64)
+        positions = positions.reshape(1, -1, 3)
+        shifts = self._image_shifts(counts).astype(positions.dtype)
+        for start in range(0, shifts.shape[0], int(images_per_block)):
+            block = shifts[start : start + images_per_block, np.newaxis, :]
+            yield (block + positions).reshape(-1, 3)
+
+    def freeze(self):
+        """Return an immutable, hashable copy of the box.
+
+        The returned `FrozenBox` shares the box vectors and starts with the
+        derived quantities already computed for this box.
+
+        Returns
+        -------
+        box : molbox.FrozenBox
+        """
+        if isinstance(self, FrozenBox):
+            return self
+        box = FrozenBox.__new__(FrozenBox)
+        box._precision = self._precision
+        box._set_vectors(self._vectors)
+        box._raw = self._raw
+        box._rounded = self._rounded
+        if self._cache:
+            box._cache = dict(self._cache)
+        return box
+
+    def reduce(self):
+        """Reduce the box to its most compact equivalent cell.
+
+        Highly sheared boxes (e.g. from deformation runs) can have tilt
+        factors far outside [-0.5, 0.5], which makes minimum image searches
+        and cell lists inefficient. The box vectors are reduced with a greedy,
+        Minkowski-style lattice reduction: each vector is repeatedly replaced
+        by the shortest vector of its coset modulo the other two, until no
+        vector can be shortened. The reduced cell spans the same lattice, and
+        is returned in the reduced (lower triangular) form.
+
+        A final pass of flips, as done by LAMMPS, bounds the off-diagonal
+        entries of the returned vectors: with vectors a=(ax,0,0),
+        b=(bx,by,0) and c=(cx,cy,cz), `|bx| <= ax/2`, `|cx| <= ax/2` and
+        `|cy| <= by/2`.
+
+        Returns
+        -------
+        box : molbox.Box
+            The reduced box, with the same volume and precision.
+        transform : np.ndarray, shape=(3,3), dtype=int
+            Unimodular integer matrix with determinant +1, such that the new
+            box vectors are `transform @ self.vectors` up to a rotation.
+            Fractional coordinates are remapped with
+            `frac @ np.linalg.inv(transform)`, which is integer valued.
+        """
+        transform = _lattice_reduce(self._vectors)
+        vectors = _reduced_form_vectors(transform @ self._vectors)
+        box = type(self).from_reduced_vectors(vectors, precision=self.precision)
+        return box, transform
+
+    def minimum_image(self, dr, out=None):
+        """Apply the minimum image convention to displacement vectors.
+
+        Orthorhombic boxes use a fast path rounding each Cartesian component
+        independently. For triclinic boxes the displacements are first
+        rounded in fractional space, displacements that are not guaranteed to
+        be minimal after this step (longer than half the smallest
+        perpendicular width of the box) are then compared against the 26
+        surrounding images. This is exact as long as the tilt of the box is
+        not extreme (e.g. |xy| <= 0.5 in the LAMMPS convention).
+
+        Parameters
+        ----------
+        dr : array-like, shape=(..., 3), dtype=float
+            Displacement vectors, any number of leading dimensions is allowed.
+        out : np.ndarray, shape=(..., 3), optional, default=None
+            Array to store the result in, may be `dr` itself.
+
+        Returns
+        -------
+        dr : np.ndarray, shape=(..., 3)
+            The minimum image displacement vectors.
+        """
+        (dr, out) = _prepare_coordinates(dr, out)
+        if self._is_orthorhombic():
+            lengths = np.diagonal(self._vectors).astype(out.dtype)
+            for (src, dst) in _chunks(dr, out):
+                shift = np.round(src / lengths)
+                shift *= lengths
+                np.subtract(src, shift, out=dst)
+            return out
+
+        half_width_sq = (0.5 * self.perpendicular_widths.min()) ** 2
+        shifts = np.matmul(_IMAGE_OFFSETS, self._vectors).astype(out.dtype)
+        for (src, dst) in _chunks(dr, out):
+            self.to_fractional(src, out=dst)
+            dst -= np.round(dst)
+            self.to_cartesian(dst, out=dst)
+            far = np.einsum("...i,...i->...", dst, dst) > half_width_sq
+            if np.any(far):
+                candidates = dst[far][:, np.newaxis, :] + shifts
+                nearest = np.argmin(
+                    np.einsum("...i,...i->...", candidates, candidates), axis=1
+                )
+                dst[far] = candidates[np.arange(nearest.size), nearest]
+        return out
+
+    def distances(self, a, b=None, pairs=None, chunk_size=None):
+        """Compute minimum image distances between sets of points.
+
+        Parameters
+        ----------
+        a : array-like, shape=(N, 3), dtype=float
+            Cartesian coordinates of the first set of points.
+        b : array-like, shape=(M, 3), dtype=float, optional, default=None
+            Cartesian coordinates of the second set of points. If None, the
+            distances are computed within `a`.
+        pairs : array-like, shape=(P, 2), dtype=int, optional, default=None
+            Indices (i, j) of the pairs to compute distances for, where i
+            indexes `a` and j indexes `b` (or `a` if `b` is None). If None,
+            all pairs are computed.
+        chunk_size : int, optional, default=None
+            Number of rows of `a` (or of `pairs`) processed at a time. This
+            bounds the peak memory needed for the intermediate displacement
+            vectors. If None, a chunk size is chosen so that about 65536
+            displacements are held in memory at a time.
+
+        Returns
+        -------
+        distances : np.ndarray
+            Array of shape (P,) if `pairs` is provided, (N, M) otherwise.
+        """
+        a = np.asarray(a)
+        if not np.issubdtype(a.dtype, np.floating):
+            a = a.astype(np.float64)
+        b = a if b is None else np.asarray(b, dtype=a.dtype)
+
+        if pairs is not None:
+            pairs = np.asarray(pairs, dtype=np.intp).reshape(-1, 2)
+            if chunk_size is None:
+                chunk_size = _CHUNK_SIZE
+            dist = np.empty(pairs.shape[0], dtype=a.dtype)
+            for start in range(0, pairs.shape[0], chunk_size):
+                chunk = pairs[start : start + chunk_size]
+                dr = self.minimum_image(b[chunk[:, 1]] - a[chunk[:, 0]])
+                dist[start : start + chunk_size] = np.linalg.norm(dr, axis=-1)
+            return dist
+
+        if chunk_size is None:
+            chunk_size = max(1, _CHUNK_SIZE // max(1, b.shape[0]))
+        dist = np.empty((a.shape[0], b.shape[0]), dtype=a.dtype)
+        for start in range(0, a.shape[0], chunk_size):
+            chunk = slice(start, start + chunk_size)
+            dr = b[np.newaxis, :, :] - a[chunk, np.newaxis, :]
+            self.minimum_image(dr, out=dr)
+            dist[chunk] = np.linalg.norm(dr, axis=-1)
+        return dist
+
+    def to_bytes(self):
+        """Serialize the box into a compact, fixed size binary record.
+
+        The record holds the six lower triangular entries of the box vectors
+        (ax, bx, by, cx, cy, cz) as little-endian float64, followed by the
+        precision as an unsigned byte, for a total of 49 bytes.
+
+        Returns
+        -------
+        data : bytes
+
+        See Also
+        --------
+        Box.from_bytes : to read a box back.
+        """
+        if not 0 <= self._precision <= 255:
+            raise BoxError(
+                f"The precision {self._precision} cannot be serialized, it "
+                "must be between 0 and 255."
+            )
+        return _BOX_STRUCT.pack(
+            *self._vectors[_TRIL_INDICES].tolist(), self._precision
+        )
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Generate a box from a record written by `Box.to_bytes`.
+
+        Parameters
+        ----------
+        data : bytes-like
+            Serialized box, exactly 49 bytes long.
+        """
+        try:
+            (*entries, precision) = _BOX_STRUCT.unpack(data)
+        except struct.error as err:
+            raise BoxError(
+                f"Serialized boxes are {_BOX_STRUCT.size} bytes long, got "
+                f"{len(data)} bytes."
+            ) from err
+        vectors = np.zeros((3, 3))
+        vectors[_TRIL_INDICES] = entries
+        # The vectors are restored as is, rounding them again could lose
+        # digits when the precision was lowered after construction.
+        box = cls.__new__(cls)
+        box._precision = precision
+        box._set_vectors(vectors)
+        return box
+
+    def __reduce__(self):
+        return (type(self).from_bytes, (self.to_bytes(),))
+
     def __repr__(self):
         """Return a string representation of the box."""
         (Lx, Ly, Lz, xy, xz, yz) = self.box_parameters
@@ -271,30 +862,295 @@ class Box(object):
         return desc
 
     def _from_vecs_to_lengths_tilt_factors(self):
-        # vectors should already be aligned by _normalize_box
-        v = np.zeros((3, 3))
-        v[0, :] = self._vectors[0, :]
-        v[1, :] = self._vectors[1, :]
-        v[2, :] = self._vectors[2, :]
-
-        Lx = np.sqrt(np.dot(v[0], v[0]))
-        a2x = np.dot(v[0], v[1]) / Lx
-        Ly = np.sqrt(np.dot(v[1], v[1]) - a2x * a2x)
+        # vectors are in the reduced (lower triangular) form, see
+        # _reduced_form_vectors for the general expressions
+        ((ax, _, _), (bx, by, _), (cx, cy, cz)) = self._vectors.tolist()
+        sign_a = math.copysign(1.0, ax)
+        a2x = sign_a * bx
+        Ly = abs(by)
         xy = a2x / Ly
-        v0xv1 = np.cross(v[0], v[1])
-        v0xv1mag = np.sqrt(np.dot(v0xv1, v0xv1))
-        Lz = np.dot(v[2], v0xv1) / v0xv1mag
-        a3x = np.dot(v[0], v[2]) / Lx
+        Lz = math.copysign(1.0, ax * by) * cz
+        a3x = sign_a * cx
         xz = a3x / Lz
-        yz = (np.dot(v[1], v[2]) - a2x * a3x) / (Ly * Lz)
+        yz = by * cy / (Ly * Lz)
 
-        len_x = np.sqrt(np.dot(v[0], v[0]))
-        len_y = np.sqrt(np.dot(v[1], v[1]))
-        len_z = np.sqrt(np.dot(v[2], v[2]))
+        len_x = abs(ax)
+        len_y = math.hypot(bx, by)
+        len_z = math.sqrt(cx * cx + cy * cy + cz * cz)
         return len_x, len_y, len_z, xy, xz, yz
 
-    def _get_angles(self):
-        return _calc_angles(self.vectors)
+    def _image_shifts(self, counts):
+        """Cartesian shifts of the images of a supercell, in C order."""
+        images = np.indices(counts).reshape(3, -1).T
+        return np.matmul(images, self._vectors)
+
+    def _get_raw(self):
+        """Return the unrounded parameters, computing them on first access."""
+        if self._raw is None:
+            self._raw = _BoxParameters(
+                *self._from_vecs_to_lengths_tilt_factors(),
+                *_reduced_vectors_to_angles(self._vectors),
+            )
+        return self._raw
+
+    def _get_rounded(self):
+        """Return the rounded parameter groups, computing them once."""
+        if self._rounded is None:
+            self._rounded = self._get_raw().round(self._precision)
+        return self._rounded
+
+    def _get_cached(self, key, compute):
+        """Return a derived quantity, computing and caching it if needed.
+
+        Cached arrays are made read-only since they are shared between calls.
+        The cache itself is only created when first needed.
+        """
+        if self._cache is None:
+            self._cache = {}
+        try:
+            return self._cache[key]
+        except KeyError:
+            value = compute()
+            if isinstance(value, np.ndarray):
+                value.flags.writeable = False
+            self._cache[key] = value
+            return value
+
+    def _is_orthorhombic(self):
+        return not np.any(self._vectors[np.tril_indices(3, k=-1)])
+
+
+class FrozenBox(Box):
+    """Immutable and hashable variant of `Box`.
+
+    The box vectors and precision of a frozen box cannot be changed, which
+    makes it safe to share a single instance, and its cached derived
+    quantities, between many frames or objects. Two frozen boxes compare
+    equal when they have the same precision and the same box vectors once
+    rounded to that precision.
+
+    Frozen boxes are created with the same constructors as `Box`, or from an
+    existing box with `Box.freeze`.
+
+    See Also
+    --------
+    BoxInterner : to share a single instance between identical boxes.
+    """
+
+    __slots__ = ()
+
+    @property
+    def precision(self):
+        """Amount of decimals to represent floating point values."""
+        return self._precision
+
+    @precision.setter
+    def precision(self, value):
+        raise BoxError(
+            "The precision of a FrozenBox cannot be changed, create a new box "
+            "instead."
+        )
+
+    @property
+    def _key(self):
+        """Precision and rounded vectors, used for hashing and equality."""
+
+        def compute():
+            # Adding 0.0 turns negative zeros into positive ones
+            vectors = self._vectors.round(self._precision) + 0.0
+            return (self._precision, vectors.tobytes())
+
+        return self._get_cached("key", compute)
+
+    def __eq__(self, other):
+        if not isinstance(other, FrozenBox):
+            return NotImplemented
+        return self is other or self._key == other._key
+
+    def __hash__(self):
+        return hash(self._key)
+
+
+class BoxInterner(object):
+    """Bounded least-recently-used cache of frozen boxes.
+
+    Interning maps equal boxes onto a single `FrozenBox` instance, so that
+    e.g. the frames of a constant volume trajectory share one box object and
+    its cached derived quantities (inverse vectors, volume, ...) instead of
+    allocating and recomputing them for every frame.
+
+    Parameters
+    ----------
+    maxsize : int, optional, default=128
+        Maximum number of distinct boxes kept, the least recently used box is
+        evicted first.
+
+    Attributes
+    ----------
+    hits : int
+        Number of lookups that returned an existing box.
+    misses : int
+        Number of lookups that added a new box.
+    """
+
+    def __init__(self, maxsize=128):
+        if int(maxsize) < 1:
+            raise BoxError(f"maxsize must be a positive integer, got {maxsize}")
+        self._maxsize = int(maxsize)
+        self._boxes = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def maxsize(self):
+        """Maximum number of boxes kept in the cache."""
+        return self._maxsize
+
+    def intern(self, box):
+        """Return the shared frozen box equal to `box`.
+
+        Parameters
+        ----------
+        box : molbox.Box
+            Box to intern, a mutable box is frozen first.
+
+        Returns
+        -------
+        box : molbox.FrozenBox
+            The cached box equal to `box`, or the frozen `box` itself if no
+            equal box is cached.
+        """
+        box = box.freeze()
+        key = box._key
+        try:
+            cached = self._boxes[key]
+        except KeyError:
+            self.misses += 1
+            self._boxes[key] = box
+            if len(self._boxes) > self._maxsize:
+                self._boxes.popitem(last=False)
+            return box
+        self.hits += 1
+        self._boxes.move_to_end(key)
+        return cached
+
+    __call__ = intern
+
+    def clear(self):
+        """Remove all boxes from the cache and reset the statistics."""
+        self._boxes.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._boxes)
+
+    def __contains__(self, box):
+        return isinstance(box, Box) and box.freeze()._key in self._boxes
+
+
+_DEFAULT_INTERNER = BoxInterner()
+
+
+def intern_box(box):
+    """Intern a box in the module level `BoxInterner`.
+
+    Parameters
+    ----------
+    box : molbox.Box
+        Box to intern.
+
+    Returns
+    -------
+    box : molbox.FrozenBox
+        Shared frozen box equal to `box`.
+    """
+    return _DEFAULT_INTERNER.intern(box)
+
+
+def _prepare_coordinates(coords, out):
+    """Coerce coordinates to a floating point array and check or create out."""
+    coords = np.asarray(coords)
+    if not np.issubdtype(coords.dtype, np.floating):
+        coords = coords.astype(np.float64)
+    if coords.shape[-1:] != (3,):
+        raise BoxError(
+            f"Coordinates must be of shape (..., 3), got shape {coords.shape}."
+        )
+    if out is None:
+        out = np.empty_like(coords)
+    elif out.shape != coords.shape:
+        raise BoxError(
+            f"Output array of shape {out.shape} does not match the shape of "
+            f"the input {coords.shape}."
+        )
+    return coords, out
+
+
+def _replica_counts(nx, ny, nz):
+    """Validate the number of replicas of a supercell."""
+    counts = np.array([nx, ny, nz])
+    if not np.issubdtype(counts.dtype, np.integer) or np.any(counts < 1):
+        raise BoxError(
+            "The number of replicas must be positive integers, got "
+            f"{(nx, ny, nz)}."
+        )
+    return counts
+
+
+def _chunks(src, dst):
+    """Yield matching chunks of two arrays along their first axis."""
+    if src.ndim == 1:
+        yield src[np.newaxis], dst[np.newaxis]
+        return
+    for start in range(0, src.shape[0], _CHUNK_SIZE):
+        chunk = slice(start, start + _CHUNK_SIZE)
+        yield src[chunk], dst[chunk]
+
+
+def _lattice_reduce(vectors, max_iter=1000):
+    """Compute the integer transformation reducing a set of lattice vectors.
+
+    Each vector is replaced by the shortest of `b_k - m*b_i - n*b_j`, where
+    `m` and `n` are the integers surrounding the projection of `b_k` onto the
+    plane of the two other vectors. The norm of the basis strictly decreases
+    at each step, so the iteration terminates.
+    """
+    transform = np.eye(3, dtype=np.int64)
+    basis = np.array(vectors, dtype=np.float64)
+    for _ in range(max_iter):
+        changed = False
+        for k in range(3):
+            (i, j) = [axis for axis in range(3) if axis != k]
+            gram = basis[[i, j]] @ basis[[i, j]].T
+            coeffs = np.linalg.solve(gram, basis[[i, j]] @ basis[k])
+            norm = basis[k] @ basis[k]
+            best = None
+            for m in {math.floor(coeffs[0]), math.ceil(coeffs[0])}:
+                for n in {math.floor(coeffs[1]), math.ceil(coeffs[1])}:
+                    candidate = basis[k] - m * basis[i] - n * basis[j]
+                    if candidate @ candidate < norm * (1.0 - 1e-10):
+                        (norm, best) = (candidate @ candidate, (m, n))
+            if best is not None:
+                (m, n) = best
+                basis[k] -= m * basis[i] + n * basis[j]
+                transform[k] -= m * transform[i] + n * transform[j]
+                changed = True
+        if not changed:
+            break
+    # Flipping all three vectors keeps the lattice and restores handedness
+    if round(np.linalg.det(transform)) < 0:
+        transform = -transform
+    # Final flips as done by LAMMPS, bounding the off-diagonal entries of the
+    # lower triangular vectors by half of the diagonal entry of their column.
+    # Subtracting integer multiples of other rows keeps the determinant.
+    reduced = _reduced_form_vectors(transform @ vectors)
+    shift = round(reduced[2, 1] / reduced[1, 1])
+    transform[2] -= shift * transform[1]
+    reduced[2] -= shift * reduced[1]
+    for k in (1, 2):
+        transform[k] -= round(reduced[k, 0] / reduced[0, 0]) * transform[0]
+    return transform
 
 
 def _validate_box_vectors(box_vectors):
@@ -322,44 +1178,37 @@ def _validate_box_vectors(box_vectors):
 
 
 def _lengths_angles_to_vectors(lengths, angles, precision):
-    (a, b, c) = lengths
-    (alpha, beta, gamma) = np.deg2rad(angles)
-    cos_a = np.clip(np.cos(alpha), -1.0, 1.0)
-    cos_b = np.clip(np.cos(beta), -1.0, 1.0)
-    cos_g = np.clip(np.cos(gamma), -1.0, 1.0)
-
-    sin_a = np.clip(np.sin(alpha), -1.0, 1.0)
-    sin_b = np.clip(np.sin(beta), -1.0, 1.0)
-    sin_g = np.clip(np.sin(gamma), -1.0, 1.0)
-    a_vec = np.asarray([a, 0.0, 0.0])
+    (a, b, c) = (float(length) for length in lengths)
+    (alpha, beta, gamma) = (math.radians(float(angle)) for angle in angles)
+    cos_a = _clip_unit(math.cos(alpha))
+    cos_b = _clip_unit(math.cos(beta))
+    cos_g = _clip_unit(math.cos(gamma))
+    sin_g = _clip_unit(math.sin(gamma))
 
     b_x = b * cos_g
     b_y = b * sin_g
-    b_vec = np.asarray([b_x, b_y, 0.0])
 
     c_x = c * cos_b
     c_cos_y_term = (cos_a - (cos_b * cos_g)) / sin_g
     c_y = c * c_cos_y_term
-    c_z = c * np.sqrt(1 - np.square(cos_b) - np.square(c_cos_y_term))
-    c_vec = np.asarray([c_x, c_y, c_z])
-    box_vectors = np.asarray((a_vec, b_vec, c_vec))
-    box_vectors.reshape(3, 3)
-    _validate_box_vectors(box_vectors=box_vectors)
+    c_z = c * np.sqrt(1 - cos_b * cos_b - c_cos_y_term * c_cos_y_term)
+    box_vectors = np.array(
+        [[a, 0.0, 0.0], [b_x, b_y, 0.0], [c_x, c_y, c_z]], dtype=np.float64
+    )
+    # The vectors are lower triangular by construction, only the determinant
+    # needs to be checked instead of going through _validate_box_vectors.
+    _check_determinant(a * b_y * c_z, box_vectors)
     return box_vectors.round(precision)
 
 
-def _normalize_box(vectors):
-    """Align the box matrix into a right-handed coordinate frame.
+def _clip_unit(value):
+    return min(max(value, -1.0), 1.0)
 
-    NOTE: This assumes that the matrix is in a row-major format.
 
-    NOTE: Inspiration and logic are from the Glotzer group package, Garnett;
-    which is provided under a BSD 3-clause License.
-    For additional information, refer to the License file provided with this
-    package.
-    """
-    det = np.linalg.det(vectors)
-    if np.isclose(det, 0.0, atol=1e-5):
+def _check_determinant(det, vectors):
+    """Raise for co-linear box vectors, warn for a left-handed basis."""
+    # Equivalent to np.isclose(det, 0.0, atol=1e-5), without its overhead
+    if abs(det) <= 1e-5:
         raise BoxError(
             "The vectors to define the box are co-linear, this does not form a "
             f"3D region in space.\n Box vectors evaluated: {vectors}"
@@ -370,6 +1219,19 @@ def _normalize_box(vectors):
             "transformed into a right-handed basis automatically."
         )
 
+
+def _normalize_box(vectors):
+    """Align the box matrix into a right-handed coordinate frame.
+
+    NOTE: This assumes that the matrix is in a row-major format.
+
+    NOTE: Inspiration and logic are from the Glotzer group package, Garnett;
+    which is provided under a BSD 3-clause License.
+    For additional information, refer to the License file provided with this
+    package.
+    """
+    _check_determinant(np.linalg.det(vectors), vectors)
+
     # transpose to column-major for the time being
     Q, R = np.linalg.qr(vectors.T)
 
@@ -411,6 +1273,25 @@ def _reduced_form_vectors(box_vectors):
     return reduced_vecs
 
 
+def _reduced_vectors_to_angles(vectors):
+    """Calculate the angles (in degrees) of reduced, lower triangular vectors.
+
+    Scalar equivalent of `_calc_angles` taking advantage of the zeros of the
+    reduced form.
+    """
+    ((ax, _, _), (bx, by, _), (cx, cy, cz)) = vectors.tolist()
+    len_b = math.hypot(bx, by)
+    len_c = math.sqrt(cx * cx + cy * cy + cz * cz)
+    cos_alpha = (bx * cx + by * cy) / (len_b * len_c)
+    sign_a = math.copysign(1.0, ax)
+    cos_beta = sign_a * cx / len_c
+    cos_gamma = sign_a * bx / len_b
+    return tuple(
+        math.degrees(math.acos(_clip_unit(cos)))
+        for cos in (cos_alpha, cos_beta, cos_gamma)
+    )
+
+
 def _calc_angles(vectors):
     """Calculate the angles between the vectors that define the box.
 
@@ -0,0 +1,481 @@
+"""Batched box module for series of boxes, e.g. from trajectories."""
+from warnings import warn
+
+import numpy as np
+
+from molbox.box import _TRIL_INDICES, Box, BoxError
+
+__all__ = ["BoxArray", "unique_boxes"]
+
+
+class BoxArray(object):
+    """A series of boxes stored as a single (N,3,3) array.
+
+    All validation, normalization and conversions are performed as batched
+    NumPy operations, following the same conventions as `Box`. Individual
+    `Box` objects are only created when a single frame is indexed.
+
+    Parameters
+    ----------
+    lengths : array-like, shape=(N,3), dtype=float
+        Lengths of the edges of each box.
+    angles : array-like, shape=(N,3), dtype=float, default=None
+        Angles (in degrees) that define the tilt of the edges of each box. If
+        None is given, angles are assumed to be [90.0, 90.0, 90.0] for every
+        box.
+    precision : int, optional, default=None
+        Control the precision of the floating point representation of box
+        attributes. If none provided, the default is 6 decimals.
+
+    Attributes
+    ----------
+    vectors : np.ndarray, shape=(N,3,3), dtype=float
+        Vectors that define each parallelepiped (Box).
+    lengths : np.ndarray, shape=(N,3), dtype=float
+        Lengths of each box in x,y,z
+    angles : np.ndarray, shape=(N,3), dtype=float
+        Angles defining the tilt of each box.
+    tilt_factors : np.ndarray, shape=(N,3), dtype=float
+        Tilt factors (xy, xz, yz) of each box.
+    precision : int
+        Precision of the floating point numbers when accessing values.
+
+    Notes
+    -----
+    Box vectors are expected to be provided in row-major format.
+    """
+
+    def __init__(self, lengths, angles=None, precision=None):
+        if precision is not None:
+            self._precision = int(precision)
+        else:
+            self._precision = 6
+
+        lengths = np.asarray(lengths, dtype=np.float64).reshape(-1, 3)
+        if angles is None:
+            angles = np.full(lengths.shape, 90.0)
+        angles = np.asarray(angles, dtype=np.float64).reshape(-1, 3)
+        if lengths.shape != angles.shape:
+            raise BoxError(
+                "The number of lengths and angles provided do not match, "
+                f"lengths: {lengths.shape}, angles: {angles.shape}"
+            )
+
+        self._set_vectors(
+            _lengths_angles_to_vectors_batch(
+                lengths=lengths, angles=angles, precision=self.precision
+            )
+        )
+
+    def _set_vectors(self, vectors):
+        self._vectors = vectors
+        (lengths, tilt_factors) = _vecs_to_lengths_tilt_factors_batch(vectors)
+        self._lengths = lengths
+        self._tilt_factors = tilt_factors
+        self._angles = _calc_angles_batch(vectors)
+        self._cache = {}
+
+    @classmethod
+    def _from_reduced_vectors(cls, vectors, precision):
+        """Wrap already normalized and rounded vectors without recomputing."""
+        box_array = cls.__new__(cls)
+        box_array._precision = precision
+        box_array._set_vectors(vectors)
+        return box_array
+
+    @classmethod
+    def from_lengths_angles(cls, lengths, angles, precision=None):
+        """Generate a series of boxes from lengths and angles."""
+        return cls(lengths=lengths, angles=angles, precision=precision)
+
+    @classmethod
+    def from_vectors(cls, vectors, precision=None):
+        """Generate a series of boxes from an (N,3,3) array of box vectors."""
+        vectors = _validate_box_vectors_batch(vectors)
+        angles = _calc_angles_batch(vectors)
+        lengths = np.linalg.norm(vectors, axis=2)
+        return cls(lengths=lengths, angles=angles, precision=precision)
+
+    @classmethod
+    def from_lengths_tilt_factors(
+        cls, lengths, tilt_factors=None, precision=None
+    ):
+        """Generate a series of boxes from box lengths and tilt factors."""
+        lengths = np.asarray(lengths, dtype=np.float64).reshape(-1, 3)
+        if tilt_factors is None:
+            tilt_factors = np.zeros(lengths.shape)
+        tilt_factors = np.asarray(tilt_factors, dtype=np.float64).reshape(-1, 3)
+        (Lx, Ly, Lz) = lengths.T
+        (xy, xz, yz) = tilt_factors.T
+
+        vecs = np.zeros((lengths.shape[0], 3, 3))
+        vecs[:, 0, 0] = Lx
+        vecs[:, 1, 0] = Ly * xy
+        vecs[:, 1, 1] = Ly
+        vecs[:, 2, 0] = Lz * xz
+        vecs[:, 2, 1] = Lz * yz
+        vecs[:, 2, 2] = Lz
+        angles = _calc_angles_batch(vecs)
+        return cls(lengths=lengths, angles=angles, precision=precision)
+
+    @classmethod
+    def from_boxes(cls, boxes, precision=None):
+        """Generate a series of boxes from an iterable of `Box` objects."""
+        boxes = list(boxes)
+        if precision is None:
+            precision = boxes[0].precision if boxes else None
+        lengths = [box.lengths for box in boxes]
+        angles = [box.angles for box in boxes]
+        return cls(lengths=lengths, angles=angles, precision=precision)
+
+    def save(self, path):
+        """Save the boxes to a NumPy `.npy` file.
+
+        Boxes are stored as an (N,6) float64 array with the lower triangular
+        entries of the reduced vectors (ax, bx, by, cx, cy, cz), the same
+        layout as `Box.to_bytes`. The file can be memory-mapped and read back
+        with `BoxArray.load` without any per-frame conversion. The precision
+        is not stored.
+
+        Parameters
+        ----------
+        path : str or os.PathLike
+            Path of the file to write.
+        """
+        np.save(path, self._vectors[:, _TRIL_INDICES[0], _TRIL_INDICES[1]])
+
+    @classmethod
+    def load(cls, path, precision=None, mmap_mode="r"):
+        """Load boxes saved with `BoxArray.save`.
+
+        Parameters
+        ----------
+        path : str or os.PathLike
+            Path of the `.npy` file to read.
+        precision : int, optional, default=None
+            Control the precision of the floating point representation of box
+            attributes. If none provided, the default is 6 decimals.
+        mmap_mode : {None, "r", "r+", "c"}, optional, default="r"
+            Memory-map mode passed to `np.load`. The file is only read once,
+            when the batched vectors are assembled.
+        """
+        entries = np.load(path, mmap_mode=mmap_mode)
+        if entries.ndim != 2 or entries.shape[1] != 6:
+            raise BoxError(
+                f"Expected an (N,6) array of box entries in {path}, got an "
+                f"array of shape {entries.shape}"
+            )
+        precision = 6 if precision is None else int(precision)
+        vectors = _tril_entries_to_vectors_batch(entries)
+        return cls._from_reduced_vectors(vectors.round(precision), precision)
+
+    @property
+    def vectors(self):
+        """Box representations as an (N,3,3) array."""
+        return self._vectors
+
+    @property
+    def lengths(self):
+        """Lengths of the boxes, shape (N,3)."""
+        return self._lengths.round(self.precision)
+
+    @property
+    def angles(self):
+        """Angles defining the tilt of the boxes (alpha, beta, gamma)."""
+        return self._angles.round(self.precision)
+
+    @property
+    def tilt_factors(self):
+        """Tilt factors (xy, xz, yz) of the boxes, shape (N,3)."""
+        return self._tilt_factors.round(self.precision)
+
+    @property
+    def bravais_parameters(self):
+        """Bravais lattice parameters (a, b, c, alpha, beta, gamma), (N,6)."""
+        return np.concatenate((self.lengths, self.angles), axis=1)
+
+    @property
+    def volume(self):
+        """Volumes of the boxes, shape (N,), cached."""
+
+        def compute():
+            v = self._vectors
+            return np.abs(v[:, 0, 0] * v[:, 1, 1] * v[:, 2, 2])
+
+        return self._get_cached("volume", compute)
+
+    @property
+    def face_areas(self):
+        """Areas of the faces of the boxes, shape (N,3), cached.
+
+        See `Box.face_areas` for the ordering of the faces.
+        """
+
+        def compute():
+            v = self._vectors
+            return np.linalg.norm(
+                np.cross(v[:, [1, 2, 0]], v[:, [2, 0, 1]]), axis=2
+            )
+
+        return self._get_cached("face_areas", compute)
+
+    @property
+    def perpendicular_widths(self):
+        """Distances between opposite faces of the boxes, shape (N,3), cached."""
+        return self._get_cached(
+            "perpendicular_widths",
+            lambda: self.volume[:, np.newaxis] / self.face_areas,
+        )
+
+    @property
+    def max_cutoff(self):
+        """Half the smallest perpendicular width of each box, shape (N,)."""
+        return self._get_cached(
+            "max_cutoff", lambda: 0.5 * self.perpendicular_widths.min(axis=1)
+        )
+
+    @property
+    def precision(self):
+        """Amount of decimals to represent floating point values."""
+        return self._precision
+
+    @precision.setter
+    def precision(self, value):
+        """Decimal point precision, if None use 16, else cast as int."""
+        if not value:
+            precision = 16
+        else:
+            precision = int(value)
+        self._precision = precision
+
+    def _get_cached(self, key, compute):
+        """Return a derived quantity, computing and caching it if needed."""
+        try:
+            return self._cache[key]
+        except KeyError:
+            value = compute()
+            value.flags.writeable = False
+            self._cache[key] = value
+            return value
+
+    def __len__(self):
+        return self._vectors.shape[0]
+
+    def __getitem__(self, index):
+        """Return a `Box` for an integer index, a `BoxArray` otherwise."""
+        if isinstance(index, (int, np.integer)):
+            return Box.from_reduced_vectors(
+                self._vectors[index], precision=self.precision
+            )
+        return self._from_reduced_vectors(
+            self._vectors[index].reshape(-1, 3, 3), self.precision
+        )
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __repr__(self):
+        """Return a string representation of the box series."""
+        return f"BoxArray: {len(self)} boxes, precision={self.precision}"
+
+
+def unique_boxes(boxes, length_tolerance=1e-3, angle_tolerance=1e-2):
+    """Group near-identical boxes together.
+
+    Boxes are grouped by quantizing their Bravais lattice parameters on a
+    grid of the given tolerances and sorting the resulting integer keys, which
+    takes O(N log N) instead of the O(N^2) of pairwise comparisons. Boxes
+    whose parameters all fall in the same grid cell are considered identical;
+    values differing by less than the tolerance may still be split when they
+    sit on both sides of a cell boundary.
+
+    Parameters
+    ----------
+    boxes : molbox.BoxArray or iterable of molbox.Box
+        Boxes to group.
+    length_tolerance : float, optional, default=1e-3
+        Grid spacing used to quantize the lengths of the boxes.
+    angle_tolerance : float, optional, default=1e-2
+        Grid spacing used to quantize the angles of the boxes, in degrees.
+
+    Returns
+    -------
+    unique : molbox.BoxArray
+        One representative box per group, the first box of each group in the
+        input order. Groups are ordered by their first occurrence.
+    index : np.ndarray, shape=(M,), dtype=int
+        Indices of the representative boxes in `boxes`.
+    inverse : np.ndarray, shape=(N,), dtype=int
+        Group of each box, such that `unique[inverse[i]]` is the
+        representative of `boxes[i]`.
+    """
+    if not isinstance(boxes, BoxArray):
+        boxes = BoxArray.from_boxes(boxes)
+    if length_tolerance <= 0 or angle_tolerance <= 0:
+        raise BoxError(
+            "Tolerances must be positive, got "
+            f"{length_tolerance} and {angle_tolerance}"
+        )
+    if len(boxes) == 0:
+        empty = np.zeros(0, dtype=np.intp)
+        return boxes, empty, empty
+
+    keys = np.empty((len(boxes), 6), dtype=np.int64)
+    np.rint(
+        boxes._lengths / length_tolerance, out=keys[:, :3], casting="unsafe"
+    )
+    np.rint(boxes._angles / angle_tolerance, out=keys[:, 3:], casting="unsafe")
+    (_, index, inverse) = np.unique(
+        keys, axis=0, return_index=True, return_inverse=True
+    )
+    # np.unique orders the groups by key, renumber them by first occurrence
+    order = np.argsort(index, kind="stable")
+    rank = np.empty_like(order)
+    rank[order] = np.arange(order.size)
+    index = index[order]
+    inverse = rank[inverse.reshape(-1)]
+    return boxes[index], index, inverse
+
+
+def _tril_entries_to_vectors_batch(entries):
+    """Scatter (N,6) lower triangular entries into (N,3,3) box vectors."""
+    vectors = np.zeros((entries.shape[0], 3, 3))
+    vectors[:, _TRIL_INDICES[0], _TRIL_INDICES[1]] = entries
+    return vectors
+
+
+def _validate_box_vectors_batch(box_vectors):
+    """Batched equivalent of `molbox.box._validate_box_vectors`."""
+    vecs = np.asarray(box_vectors, dtype=np.float64).reshape(-1, 3, 3)
+    return _normalize_box_batch(vecs)
+
+
+def _lengths_angles_to_vectors_batch(lengths, angles, precision):
+    """Batched equivalent of `molbox.box._lengths_angles_to_vectors`."""
+    (a, b, c) = np.asarray(lengths, dtype=np.float64).T
+    (alpha, beta, gamma) = np.deg2rad(np.asarray(angles, dtype=np.float64).T)
+    cos_a = np.clip(np.cos(alpha), -1.0, 1.0)
+    cos_b = np.clip(np.cos(beta), -1.0, 1.0)
+    cos_g = np.clip(np.cos(gamma), -1.0, 1.0)
+    sin_g = np.clip(np.sin(gamma), -1.0, 1.0)
+
+    box_vectors = np.zeros((a.shape[0], 3, 3))
+    box_vectors[:, 0, 0] = a
+    box_vectors[:, 1, 0] = b * cos_g
+    box_vectors[:, 1, 1] = b * sin_g
+
+    c_cos_y_term = (cos_a - (cos_b * cos_g)) / sin_g
+    box_vectors[:, 2, 0] = c * cos_b
+    box_vectors[:, 2, 1] = c * c_cos_y_term
+    box_vectors[:, 2, 2] = c * np.sqrt(
+        1 - np.square(cos_b) - np.square(c_cos_y_term)
+    )
+    # The vectors are lower triangular by construction, only the determinant
+    # needs to be checked instead of going through the full normalization.
+    _check_determinant_batch(
+        box_vectors[:, 0, 0] * box_vectors[:, 1, 1] * box_vectors[:, 2, 2]
+    )
+    return box_vectors.round(precision)
+
+
+def _normalize_box_batch(vectors):
+    """Batched equivalent of `molbox.box._normalize_box`."""
+    _check_determinant_batch(np.linalg.det(vectors))
+
+    # transpose to column-major for the time being
+    Q, R = np.linalg.qr(np.swapaxes(vectors, 1, 2))
+
+    # left or right handed: det<0 left, >0, right
+    sign = np.linalg.det(Q)
+    R = R * sign[:, None, None]
+
+    diag = np.diagonal(R, axis1=1, axis2=2)
+    signs = np.where(diag < 0, -1.0, 1.0)
+    transformed_vecs = R * signs[:, None, :]
+    return _reduced_form_vectors_batch(np.swapaxes(transformed_vecs, 1, 2))
+
+
+def _check_determinant_batch(det):
+    """Batched equivalent of `molbox.box._check_determinant`."""
+    colinear = np.isclose(det, 0.0, atol=1e-5)
+    if np.any(colinear):
+        raise BoxError(
+            "The vectors to define the box are co-linear, this does not form a "
+            "3D region in space.\n Frames with co-linear box vectors: "
+            f"{np.flatnonzero(colinear)}"
+        )
+    n_left = np.count_nonzero(det < 0.0)
+    if n_left:
+        warn(
+            f"Box vectors provided for a left-handed basis in {n_left} "
+            "frame(s), these will be transformed into a right-handed basis "
+            "automatically."
+        )
+
+
+def _reduced_form_vectors_batch(box_vectors):
+    """Batched equivalent of `molbox.box._reduced_form_vectors`."""
+    v1 = box_vectors[:, 0, :]
+    v2 = box_vectors[:, 1, :]
+    v3 = box_vectors[:, 2, :]
+
+    lx = np.linalg.norm(v1, axis=1)
+    a_2x = np.einsum("ij,ij->i", v1, v2) / lx
+    ly = np.sqrt(np.einsum("ij,ij->i", v2, v2) - a_2x * a_2x)
+    xy = a_2x / ly
+    v1_x_v2 = np.cross(v1, v2)
+    lz = np.einsum(
+        "ij,ij->i",
+        v3,
+        v1_x_v2 / np.linalg.norm(v1_x_v2, axis=1)[:, None],
+    )
+    a_3x = np.einsum("ij,ij->i", v1, v3) / lx
+    xz = a_3x / lz
+    yz = (np.einsum("ij,ij->i", v2, v3) - a_2x * a_3x) / (ly * lz)
+
+    reduced_vecs = np.zeros(box_vectors.shape)
+    reduced_vecs[:, 0, 0] = lx
+    reduced_vecs[:, 1, 0] = xy * ly
+    reduced_vecs[:, 1, 1] = ly
+    reduced_vecs[:, 2, 0] = xz * lz
+    reduced_vecs[:, 2, 1] = yz * lz
+    reduced_vecs[:, 2, 2] = lz
+    return reduced_vecs
+
+
+def _vecs_to_lengths_tilt_factors_batch(vectors):
+    """Batched equivalent of `Box._from_vecs_to_lengths_tilt_factors`."""
+    v0 = vectors[:, 0, :]
+    v1 = vectors[:, 1, :]
+    v2 = vectors[:, 2, :]
+
+    lengths = np.linalg.norm(vectors, axis=2)
+    Lx = lengths[:, 0]
+    a2x = np.einsum("ij,ij->i", v0, v1) / Lx
+    Ly = np.sqrt(np.einsum("ij,ij->i", v1, v1) - a2x * a2x)
+    xy = a2x / Ly
+    v0xv1 = np.cross(v0, v1)
+    Lz = np.einsum("ij,ij->i", v2, v0xv1) / np.linalg.norm(v0xv1, axis=1)
+    a3x = np.einsum("ij,ij->i", v0, v2) / Lx
+    xz = a3x / Lz
+    yz = (np.einsum("ij,ij->i", v1, v2) - a2x * a3x) / (Ly * Lz)
+    return lengths, np.stack((xy, xz, yz), axis=1)
+
+
+def _calc_angles_batch(vectors):
+    """Batched equivalent of `molbox.box._calc_angles`, in degrees."""
+    vector_magnitudes = np.linalg.norm(vectors, axis=2)
+    a_dot_b = np.einsum("ij,ij->i", vectors[:, 0], vectors[:, 1])
+    b_dot_c = np.einsum("ij,ij->i", vectors[:, 1], vectors[:, 2])
+    a_dot_c = np.einsum("ij,ij->i", vectors[:, 0], vectors[:, 2])
+
+    alpha_raw = b_dot_c / (vector_magnitudes[:, 1] * vector_magnitudes[:, 2])
+    beta_raw = a_dot_c / (vector_magnitudes[:, 0] * vector_magnitudes[:, 2])
+    gamma_raw = a_dot_b / (vector_magnitudes[:, 0] * vector_magnitudes[:, 1])
+
+    return np.rad2deg(
+        np.arccos(
+            np.clip(np.stack((alpha_raw, beta_raw, gamma_raw), axis=1), -1, 1)
+        )
+    )
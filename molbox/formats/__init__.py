@@ -0,0 +1 @@
+"""Readers extracting boxes from simulation file formats."""
@@ -0,0 +1,71 @@
+"""Helpers shared by the readers of text file formats."""
+import numpy as np
+
+from molbox.box import Box, BoxError
+from molbox.box_array import BoxArray
+
+# Maximum size of the binary chunks read when skipping blocks of lines.
+_SKIP_CHUNK_SIZE = 1 << 20
+
+
+def skip_lines(f, n_lines, line_size=80):
+    """Move the position of `f` past the next `n_lines` lines.
+
+    The lines are skipped by counting newlines in binary chunks, then seeking
+    right after the last newline of the block. Chunks are sized from the
+    expected line size so that the block is usually read in a single call
+    without reading far past its end.
+
+    Returns
+    -------
+    line_size : float
+        Average size of the skipped lines, to size the chunks of the next
+        call.
+    """
+    origin = f.tell()
+    remaining = n_lines
+    chunk = b""
+    while remaining > 0:
+        start = f.tell()
+        previous = chunk
+        size = int(remaining * line_size * 1.05) + 64
+        chunk = f.read(min(size, _SKIP_CHUNK_SIZE))
+        if not chunk:
+            # The last line of the file may not end with a newline
+            if remaining == 1 and previous[-1:] not in (b"", b"\n"):
+                break
+            raise BoxError(
+                f"Unexpected end of file, {remaining} lines are missing"
+            )
+        count = chunk.count(b"\n")
+        if count < remaining:
+            remaining -= count
+            continue
+        newlines = np.flatnonzero(np.frombuffer(chunk, dtype=np.uint8) == 10)
+        f.seek(start + int(newlines[remaining - 1]) + 1)
+        break
+    return max((f.tell() - origin) / max(n_lines, 1), 1.0)
+
+
+def box_from_vectors(vectors, precision=None):
+    """Build a box, skipping the normalization of lower triangular vectors."""
+    if _is_reduced(vectors[np.newaxis]):
+        return Box.from_reduced_vectors(vectors, precision=precision)
+    return Box.from_vectors(vectors, precision=precision)
+
+
+def box_array_from_vectors(vectors, precision=None):
+    """Batched equivalent of `box_from_vectors`, for (N,3,3) vectors."""
+    if _is_reduced(vectors):
+        precision = 6 if precision is None else int(precision)
+        return BoxArray._from_reduced_vectors(
+            vectors.round(precision), precision
+        )
+    return BoxArray.from_vectors(vectors, precision=precision)
+
+
+def _is_reduced(vectors):
+    """Check that (N,3,3) vectors are lower triangular with positive diagonal."""
+    upper = vectors[:, [0, 0, 1], [1, 2, 2]]
+    diagonal = vectors[:, [0, 1, 2], [0, 1, 2]]
+    return not np.any(upper) and np.all(diagonal > 0)
@@ -0,0 +1,156 @@
+"""Extraction of the unit cells of CHARMM/NAMD DCD trajectories.
+
+DCD files are sequences of Fortran unformatted records. When the header
+flags a unit cell, each frame starts with a 48-byte record of six float64
+values ordered (A, gamma, B, beta, alpha, C), followed by the coordinate
+records. All the frames but the first one have the same size, so the unit
+cells are read as a single strided view over the memory-mapped file,
+without touching the coordinates.
+"""
+import struct
+
+import numpy as np
+
+from molbox.box import BoxError
+from molbox.box_array import BoxArray
+
+__all__ = ["read_dcd_boxes", "read_dcd_unitcells"]
+
+_BYTEORDER = {"<": "little", ">": "big"}
+
+
+def read_dcd_unitcells(filename):
+    """Read the raw unit cell records of a DCD file.
+
+    Parameters
+    ----------
+    filename : str or os.PathLike
+        Path of the DCD file.
+
+    Returns
+    -------
+    unitcells : np.ndarray, shape=(N,6), dtype=float64
+        Read-only view over the memory-mapped file, in the DCD order
+        (A, gamma, B, beta, alpha, C). Depending on the program that wrote
+        the file, the angles are either in degrees or stored as cosines.
+        Files with fixed atoms have a larger first frame, the first unit
+        cell is then copied in front of the view of the other ones.
+    """
+    data = np.memmap(filename, dtype=np.uint8, mode="r")
+    header = _read_header(data, filename)
+    if not header["has_unitcell"]:
+        raise BoxError(f"The DCD file {filename} does not store unit cells")
+    (endian, marker_size) = (header["endian"], header["marker_size"])
+    first = header["first_frame"]
+    (size0, size) = (header["first_frame_size"], header["frame_size"])
+    if data.size < first + size0:
+        return np.zeros((0, 6))
+    n_frames = 1 + (data.size - first - size0) // size
+
+    markers = _strided(
+        data, first, n_frames - 1, size0, size, f"{endian}i{marker_size}"
+    )
+    if np.any(markers != 48):
+        raise BoxError(
+            f"Invalid unit cell records in {filename}, the file may be "
+            "corrupted"
+        )
+    return _strided(
+        data, first + marker_size, n_frames - 1, size0, size, f"{endian}f8", 6
+    )
+
+
+def read_dcd_boxes(filename, precision=None):
+    """Read the boxes of all the frames of a DCD file.
+
+    Angles stored as cosines are detected (all three values within [-1, 1])
+    and converted to degrees before the boxes are built in a single batch.
+
+    Parameters
+    ----------
+    filename : str or os.PathLike
+        Path of the DCD file.
+    precision : int, optional, default=None
+        Control the precision of the floating point representation of box
+        attributes. If none provided, the default is 6 decimals.
+
+    Returns
+    -------
+    boxes : molbox.BoxArray
+        Box of each frame, lengths in the units of the file (angstrom).
+    """
+    unitcells = np.array(read_dcd_unitcells(filename), dtype=np.float64)
+    lengths = unitcells[:, [0, 2, 5]]
+    angles = unitcells[:, [4, 3, 1]]
+    cosines = np.all(np.abs(angles) <= 1.0, axis=1)
+    angles[cosines] = np.degrees(np.arccos(angles[cosines]))
+    return BoxArray(lengths, angles, precision=precision)
+
+
+def _read_header(data, filename):
+    """Parse the header records of a DCD file."""
+    head = data[:12].tobytes()
+    for (endian, marker_size) in (("<", 4), (">", 4), ("<", 8), (">", 8)):
+        if len(head) < 12 or head[marker_size : marker_size + 4] != b"CORD":
+            continue
+        marker = int.from_bytes(head[:marker_size], _BYTEORDER[endian])
+        if marker == 84:
+            break
+    else:
+        raise BoxError(f"{filename} is not a DCD file")
+
+    def record(offset):
+        """Return the contents of the record at `offset` and the next one."""
+        length = int.from_bytes(
+            data[offset : offset + marker_size].tobytes(), _BYTEORDER[endian]
+        )
+        start = offset + marker_size
+        return (
+            data[start : start + length].tobytes(),
+            start + length + marker_size,
+        )
+
+    (control, offset) = record(0)
+    icntrl = struct.unpack(f"{endian}20i", control[4:84])
+    (_, offset) = record(offset)
+    (natom_record, offset) = record(offset)
+    (n_atoms,) = struct.unpack(f"{endian}i", natom_record)
+    n_fixed = icntrl[8]
+    if n_fixed > 0:
+        (_, offset) = record(offset)
+    # Only CHARMM-style files (non zero version) can have unit cells
+    is_charmm = icntrl[19] != 0
+    has_unitcell = is_charmm and icntrl[10] != 0
+    n_dims = 4 if is_charmm and icntrl[11] != 0 else 3
+    cell_size = 48 + 2 * marker_size if has_unitcell else 0
+    coordinates_size = n_dims * (2 * marker_size)
+    return {
+        "endian": endian,
+        "marker_size": marker_size,
+        "has_unitcell": has_unitcell,
+        "first_frame": offset,
+        "first_frame_size": cell_size + coordinates_size + n_dims * 4 * n_atoms,
+        "frame_size": cell_size
+        + coordinates_size
+        + n_dims * 4 * (n_atoms - n_fixed),
+    }
+
+
+def _strided(data, offset, n_rest, size0, size, dtype, count=1):
+    """View `count` values of `dtype` at the same position of each frame.
+
+    The first frame starts at `offset` and is `size0` bytes long, the
+    `n_rest` following frames are `size` bytes long.
+    """
+    dtype = np.dtype(dtype)
+    if size0 == size or n_rest == 0:
+        return np.ndarray(
+            shape=(n_rest + 1, count),
+            dtype=dtype,
+            buffer=data,
+            offset=offset,
+            strides=(size, dtype.itemsize),
+        )
+    first = _strided(data, offset, 0, size0, size0, dtype, count)
+    rest = _strided(data, offset + size0, n_rest - 1, size, size, dtype, count)
+    return np.concatenate((first, rest))
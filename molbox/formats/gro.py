@@ -0,0 +1,145 @@
+"""Reading and writing the boxes of GROMACS .gro files.
+
+The last line of each frame of a .gro file holds the box vectors in nm, as
+either three values (v1x, v2y, v3z) for rectangular boxes or nine values
+(v1x, v2y, v3z, v1y, v1z, v2x, v2z, v3x, v3y) for triclinic ones. GROMACS
+boxes are lower triangular, the same reduced form as `Box`. No unit
+conversion is performed.
+"""
+import numpy as np
+
+from molbox.box import BoxError
+from molbox.formats._utils import (
+    box_array_from_vectors,
+    box_from_vectors,
+    skip_lines,
+)
+
+__all__ = [
+    "format_gro_box",
+    "format_gro_boxes",
+    "iter_gro_boxes",
+    "read_gro_boxes",
+]
+
+# Position of the nine values of a .gro box line in the flattened vectors.
+_GRO_ORDER = [0, 4, 8, 1, 2, 3, 5, 6, 7]
+
+
+def iter_gro_boxes(filename, precision=None):
+    """Iterate over the boxes of the frames of a .gro file.
+
+    Parameters
+    ----------
+    filename : str or os.PathLike
+        Path of the .gro file.
+    precision : int, optional, default=None
+        Control the precision of the floating point representation of box
+        attributes. If none provided, the default is 6 decimals.
+
+    Yields
+    ------
+    box : molbox.Box
+        Box of each frame.
+    """
+    with open(filename, "rb") as f:
+        for values in _iter_box_lines(f):
+            yield box_from_vectors(
+                _to_vectors([values])[0], precision=precision
+            )
+
+
+def read_gro_boxes(filename, precision=None):
+    """Read the boxes of all the frames of a .gro file in a single pass.
+
+    Parameters
+    ----------
+    filename : str or os.PathLike
+        Path of the .gro file.
+    precision : int, optional, default=None
+        Control the precision of the floating point representation of box
+        attributes. If none provided, the default is 6 decimals.
+
+    Returns
+    -------
+    boxes : molbox.BoxArray
+        Box of each frame.
+    """
+    with open(filename, "rb") as f:
+        values = list(_iter_box_lines(f))
+    return box_array_from_vectors(_to_vectors(values), precision=precision)
+
+
+def format_gro_box(box):
+    """Format the box line of a .gro frame, without the trailing newline.
+
+    Parameters
+    ----------
+    box : molbox.Box
+
+    Returns
+    -------
+    line : str
+        Three values for rectangular boxes, nine values otherwise.
+    """
+    return format_gro_boxes(box.vectors[np.newaxis])[0]
+
+
+def format_gro_boxes(boxes):
+    """Format the box lines of a series of .gro frames.
+
+    Parameters
+    ----------
+    boxes : molbox.BoxArray or array-like, shape=(N,3,3), dtype=float
+        Boxes, or their vectors in the reduced form.
+
+    Returns
+    -------
+    lines : list of str
+        One line per box, without the trailing newlines.
+    """
+    vectors = getattr(boxes, "vectors", boxes)
+    values = np.asarray(vectors, dtype=np.float64).reshape(-1, 9)
+    values = values[:, _GRO_ORDER]
+    triclinic = np.any(values[:, 3:], axis=1)
+    return [
+        "".join(f"{value:10.5f}" for value in (row if tilted else row[:3]))
+        for (row, tilted) in zip(values.tolist(), triclinic.tolist())
+    ]
+
+
+def _iter_box_lines(f):
+    """Yield the values of the box line of each frame of a .gro file."""
+    line_size = 45
+    while True:
+        title = f.readline()
+        if not title:
+            return
+        count = f.readline()
+        try:
+            n_atoms = int(count)
+        except ValueError as err:
+            # Titles may be empty, blank lines are only padding when nothing
+            # but blank lines follow them
+            if not title.strip() and not count.strip():
+                if not any(line.strip() for line in f):
+                    return
+            raise BoxError(
+                f"Could not read the number of atoms after byte {f.tell()}"
+            ) from err
+        line_size = skip_lines(f, n_atoms, line_size)
+        fields = f.readline().split()
+        if len(fields) not in (3, 9):
+            raise BoxError(
+                "Expected 3 or 9 values on the box line of a .gro frame, got "
+                f"{fields}"
+            )
+        yield [float(value) for value in fields]
+
+
+def _to_vectors(values):
+    """Convert .gro box values into (N,3,3) box vectors."""
+    flat = np.zeros((len(values), 9))
+    for (i, row) in enumerate(values):
+        flat[i, _GRO_ORDER[: len(row)]] = row
+    return flat.reshape(-1, 3, 3)
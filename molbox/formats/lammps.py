@@ -0,0 +1,187 @@
+"""Streaming readers for the boxes of LAMMPS dump and data files.
+
+Only the box headers are parsed. In dump files, the per-atom blocks are
+skipped by counting newlines in large binary chunks, without splitting or
+converting their lines, so extracting the box history of a long trajectory
+is bounded by the disk throughput rather than by text parsing.
+"""
+import numpy as np
+
+from molbox.box import _TRIL_INDICES, Box, BoxError
+from molbox.box_array import BoxArray, _tril_entries_to_vectors_batch
+from molbox.formats._utils import skip_lines
+
+__all__ = ["iter_dump_boxes", "read_data_box", "read_dump_boxes"]
+
+
+def iter_dump_boxes(filename, precision=None):
+    """Iterate over the boxes of a LAMMPS dump file, frame by frame.
+
+    Parameters
+    ----------
+    filename : str or os.PathLike
+        Path of a text LAMMPS dump file (e.g. `dump atom` or `dump custom`).
+    precision : int, optional, default=None
+        Control the precision of the floating point representation of box
+        attributes. If none provided, the default is 6 decimals.
+
+    Yields
+    ------
+    timestep : int
+        Timestep of the frame.
+    box : molbox.Box
+        Box of the frame.
+    """
+    with open(filename, "rb") as f:
+        for (timestep, entries) in _iter_dump_headers(f):
+            vectors = np.zeros((3, 3))
+            vectors[_TRIL_INDICES] = entries
+            yield timestep, Box.from_reduced_vectors(
+                vectors, precision=precision
+            )
+
+
+def read_dump_boxes(filename, precision=None):
+    """Read the boxes of all the frames of a LAMMPS dump file at once.
+
+    The boxes are collected into a `BoxArray` without creating a `Box` for
+    each frame.
+
+    Parameters
+    ----------
+    filename : str or os.PathLike
+        Path of a text LAMMPS dump file (e.g. `dump atom` or `dump custom`).
+    precision : int, optional, default=None
+        Control the precision of the floating point representation of box
+        attributes. If none provided, the default is 6 decimals.
+
+    Returns
+    -------
+    timesteps : np.ndarray, shape=(N,), dtype=int
+        Timestep of each frame.
+    boxes : molbox.BoxArray
+        Box of each frame.
+    """
+    timesteps = []
+    entries = []
+    with open(filename, "rb") as f:
+        for (timestep, frame_entries) in _iter_dump_headers(f):
+            timesteps.append(timestep)
+            entries.append(frame_entries)
+    precision = 6 if precision is None else int(precision)
+    vectors = _tril_entries_to_vectors_batch(
+        np.array(entries, dtype=np.float64).reshape(-1, 6)
+    )
+    return (
+        np.array(timesteps, dtype=np.int64),
+        BoxArray._from_reduced_vectors(vectors.round(precision), precision),
+    )
+
+
+def read_data_box(filename, precision=None):
+    """Read the box of a LAMMPS data file.
+
+    Only the header of the file is read, up to the first section (e.g.
+    `Masses` or `Atoms`).
+
+    Parameters
+    ----------
+    filename : str or os.PathLike
+        Path of a LAMMPS data file.
+    precision : int, optional, default=None
+        Control the precision of the floating point representation of box
+        attributes. If none provided, the default is 6 decimals.
+
+    Returns
+    -------
+    box : molbox.Box
+    """
+    bounds = {}
+    tilt_factors = (0.0, 0.0, 0.0)
+    with open(filename, "rb") as f:
+        # The first line is always a comment
+        f.readline()
+        for line in f:
+            fields = line.split(b"#", 1)[0].split()
+            if not fields:
+                continue
+            if fields[0][:1].isalpha():
+                # First section of the body
+                break
+            keyword = b" ".join(fields[2:]) if len(fields) > 2 else b""
+            if keyword in (b"xlo xhi", b"ylo yhi", b"zlo zhi"):
+                bounds[keyword[:1]] = (float(fields[0]), float(fields[1]))
+            elif fields[3:] == [b"xy", b"xz", b"yz"]:
+                tilt_factors = tuple(float(value) for value in fields[:3])
+            elif fields[-1] in (b"avec", b"bvec", b"cvec", b"origin"):
+                raise BoxError(
+                    "General triclinic LAMMPS boxes are not supported, in "
+                    f"{filename}"
+                )
+    if len(bounds) != 3:
+        raise BoxError(f"Incomplete box bounds in the header of {filename}")
+    (xy, xz, yz) = tilt_factors
+    ((xlo, xhi), (ylo, yhi), (zlo, zhi)) = (
+        bounds[k] for k in (b"x", b"y", b"z")
+    )
+    vectors = np.array(
+        [[xhi - xlo, 0.0, 0.0], [xy, yhi - ylo, 0.0], [xz, yz, zhi - zlo]]
+    )
+    return Box.from_reduced_vectors(vectors, precision=precision)
+
+
+def _iter_dump_headers(f):
+    """Yield the timestep and box entries of each frame of a dump file.
+
+    The box entries are the lower triangular entries of the reduced box
+    vectors (ax, bx, by, cx, cy, cz). `f` must be opened in binary mode.
+    """
+    timestep = None
+    n_atoms = None
+    entries = None
+    line_size = 80
+    while True:
+        line = f.readline()
+        if not line:
+            break
+        if not line.startswith(b"ITEM:"):
+            continue
+        item = line[5:].strip()
+        if item == b"TIMESTEP":
+            timestep = int(f.readline())
+        elif item == b"NUMBER OF ATOMS":
+            n_atoms = int(f.readline())
+        elif item.startswith(b"BOX BOUNDS"):
+            entries = _read_box_bounds(f, item.split()[2:])
+        elif item.startswith(b"ATOMS"):
+            if timestep is None or n_atoms is None or entries is None:
+                raise BoxError(
+                    "Incomplete dump frame header before the atoms at byte "
+                    f"{f.tell()}"
+                )
+            line_size = skip_lines(f, n_atoms, line_size)
+            yield timestep, entries
+            (timestep, n_atoms, entries) = (None, None, None)
+
+
+def _read_box_bounds(f, flags):
+    """Read the three lines of a dump BOX BOUNDS item into box entries."""
+    if b"abc" in flags:
+        raise BoxError("General triclinic LAMMPS boxes are not supported")
+    rows = [f.readline().split() for _ in range(3)]
+    try:
+        values = [[float(value) for value in row] for row in rows]
+    except ValueError as err:
+        raise BoxError(f"Could not parse the box bounds {rows}") from err
+    if b"xy" in flags:
+        ((xlo_b, xhi_b, xy), (ylo_b, yhi_b, xz), (zlo, zhi, yz)) = values
+    else:
+        ((xlo_b, xhi_b), (ylo_b, yhi_b), (zlo, zhi)) = values
+        (xy, xz, yz) = (0.0, 0.0, 0.0)
+    # Dump files store the bounding box of the tilted box, remove the extent
+    # of the tilts to recover the lo/hi bounds of the box itself.
+    lx = (xhi_b - max(0.0, xy, xz, xy + xz)) - (
+        xlo_b - min(0.0, xy, xz, xy + xz)
+    )
+    ly = (yhi_b - max(0.0, yz)) - (ylo_b - min(0.0, yz))
+    return (lx, xy, ly, xz, yz, zhi - zlo)
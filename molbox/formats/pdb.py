@@ -0,0 +1,173 @@
+"""Reading and writing the boxes of PDB CRYST1 records.
+
+CRYST1 records hold the box as lengths (in angstrom) and angles (in
+degrees). Multi-model files may carry one record per model. No unit
+conversion is performed.
+"""
+import numpy as np
+
+from molbox.box import Box, BoxError
+from molbox.box_array import BoxArray
+
+__all__ = [
+    "format_cryst1",
+    "format_cryst1_records",
+    "iter_cryst1_boxes",
+    "read_cryst1_boxes",
+]
+
+# Size of the binary chunks scanned for CRYST1 records.
+_SCAN_CHUNK_SIZE = 1 << 22
+
+
+def iter_cryst1_boxes(filename, precision=None):
+    """Iterate over the boxes of the CRYST1 records of a PDB file.
+
+    Parameters
+    ----------
+    filename : str or os.PathLike
+        Path of the PDB file.
+    precision : int, optional, default=None
+        Control the precision of the floating point representation of box
+        attributes. If none provided, the default is 6 decimals.
+
+    Yields
+    ------
+    box : molbox.Box
+        Box of each CRYST1 record, in the order of the file.
+    """
+    for record in _iter_cryst1_records(filename):
+        parameters = _parse_cryst1(record)
+        yield Box.from_lengths_angles(
+            parameters[:3], parameters[3:], precision=precision
+        )
+
+
+def read_cryst1_boxes(filename, precision=None):
+    """Read the boxes of all the CRYST1 records of a PDB file.
+
+    The file is scanned in large binary chunks for CRYST1 records, the other
+    records (e.g. ATOM, HETATM) are never split into lines in Python. The
+    boxes are converted as a single batch, without creating a `Box` per
+    model.
+
+    Parameters
+    ----------
+    filename : str or os.PathLike
+        Path of the PDB file.
+    precision : int, optional, default=None
+        Control the precision of the floating point representation of box
+        attributes. If none provided, the default is 6 decimals.
+
+    Returns
+    -------
+    boxes : molbox.BoxArray
+        Box of each CRYST1 record, in the order of the file.
+    """
+    parameters = np.array(
+        [_parse_cryst1(record) for record in _iter_cryst1_records(filename)],
+        dtype=np.float64,
+    ).reshape(-1, 6)
+    return BoxArray.from_lengths_angles(
+        parameters[:, :3], parameters[:, 3:], precision=precision
+    )
+
+
+def format_cryst1(box, space_group="P 1", z=1):
+    """Format the CRYST1 record of a box, without the trailing newline.
+
+    Parameters
+    ----------
+    box : molbox.Box
+    space_group : str, optional, default="P 1"
+        Space group symbol.
+    z : int, optional, default=1
+        Number of polymeric chains in the unit cell.
+
+    Returns
+    -------
+    record : str
+    """
+    return _format_record(box.lengths, box.angles, space_group, z)
+
+
+def format_cryst1_records(boxes, space_group="P 1", z=1):
+    """Format the CRYST1 records of a series of boxes.
+
+    Parameters
+    ----------
+    boxes : molbox.BoxArray
+    space_group : str, optional, default="P 1"
+        Space group symbol.
+    z : int, optional, default=1
+        Number of polymeric chains in the unit cell.
+
+    Returns
+    -------
+    records : list of str
+        One record per box, without the trailing newlines.
+    """
+    return [
+        _format_record(lengths, angles, space_group, z)
+        for (lengths, angles) in zip(
+            boxes.lengths.tolist(), boxes.angles.tolist()
+        )
+    ]
+
+
+def _format_record(lengths, angles, space_group, z):
+    (a, b, c) = lengths
+    (alpha, beta, gamma) = angles
+    return (
+        f"CRYST1{a:9.3f}{b:9.3f}{c:9.3f}{alpha:7.2f}{beta:7.2f}{gamma:7.2f} "
+        f"{space_group:<11s}{z:4d}"
+    )
+
+
+def _iter_cryst1_records(filename):
+    """Yield the CRYST1 lines of a file, scanning it in binary chunks."""
+    with open(filename, "rb") as f:
+        # Blocks always start with a newline, so that every record, including
+        # the first line of the file, is found as b"\nCRYST1".
+        tail = b"\n"
+        while True:
+            chunk = f.read(_SCAN_CHUNK_SIZE)
+            if not chunk:
+                break
+            data = tail + chunk
+            # Keep the last, possibly incomplete, line for the next chunk
+            end = data.rfind(b"\n")
+            (data, tail) = (data[:end], data[end:])
+            yield from _find_records(data)
+        yield from _find_records(tail)
+
+
+def _find_records(data):
+    """Yield the CRYST1 lines of a block of lines starting with a newline."""
+    start = data.find(b"\nCRYST1")
+    while start >= 0:
+        end = data.find(b"\n", start + 1)
+        if end < 0:
+            end = len(data)
+        yield data[start + 1 : end].rstrip(b"\r")
+        start = data.find(b"\nCRYST1", end)
+
+
+def _parse_cryst1(record):
+    """Parse the lengths and angles of a CRYST1 record, by column."""
+    try:
+        return [
+            float(record[start:end])
+            for (start, end) in (
+                (6, 15),
+                (15, 24),
+                (24, 33),
+                (33, 40),
+                (40, 47),
+                (47, 54),
+            )
+        ]
+    except ValueError as err:
+        raise BoxError(
+            f"Could not parse the CRYST1 record {record.decode()!r}"
+        ) from err
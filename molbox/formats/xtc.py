@@ -0,0 +1,110 @@
+"""Extraction of the boxes of GROMACS XTC trajectories.
+
+XTC frames are XDR (big-endian) records made of a fixed size header with the
+step, time and box, followed by the compressed coordinates, whose size in
+bytes is stored right before them. The boxes are read by jumping from header
+to header over the memory-mapped file, the coordinates are never decoded.
+"""
+import struct
+
+import numpy as np
+
+from molbox.box import BoxError
+from molbox.formats._utils import box_array_from_vectors, box_from_vectors
+
+__all__ = ["iter_xtc_boxes", "read_xtc_boxes"]
+
+_XTC_MAGIC = 1995
+
+# magic, natoms, step, time, box (3x3), natoms again
+_HEADER = struct.Struct(">3if9fi")
+# precision, minint (3), maxint (3), smallidx, size of the compressed block
+_COMPRESSED_HEADER = struct.Struct(">f3i3iii")
+
+
+def iter_xtc_boxes(filename, precision=None):
+    """Iterate over the boxes of the frames of an XTC file.
+
+    Parameters
+    ----------
+    filename : str or os.PathLike
+        Path of the XTC file.
+    precision : int, optional, default=None
+        Control the precision of the floating point representation of box
+        attributes. If none provided, the default is 6 decimals.
+
+    Yields
+    ------
+    step : int
+        Simulation step of the frame.
+    time : float
+        Simulation time of the frame, in ps.
+    box : molbox.Box
+        Box of the frame, in nm.
+    """
+    for (step, time, box) in _iter_headers(filename):
+        vectors = np.array(box, dtype=np.float64).reshape(3, 3)
+        yield step, time, box_from_vectors(vectors, precision=precision)
+
+
+def read_xtc_boxes(filename, precision=None):
+    """Read the boxes of all the frames of an XTC file.
+
+    Parameters
+    ----------
+    filename : str or os.PathLike
+        Path of the XTC file.
+    precision : int, optional, default=None
+        Control the precision of the floating point representation of box
+        attributes. If none provided, the default is 6 decimals.
+
+    Returns
+    -------
+    steps : np.ndarray, shape=(N,), dtype=int
+        Simulation step of each frame.
+    times : np.ndarray, shape=(N,), dtype=float
+        Simulation time of each frame, in ps.
+    boxes : molbox.BoxArray
+        Box of each frame, in nm.
+    """
+    steps = []
+    times = []
+    boxes = []
+    for (step, time, box) in _iter_headers(filename):
+        steps.append(step)
+        times.append(time)
+        boxes.append(box)
+    vectors = np.array(boxes, dtype=np.float64).reshape(-1, 3, 3)
+    return (
+        np.array(steps, dtype=np.int64),
+        np.array(times, dtype=np.float64),
+        box_array_from_vectors(vectors, precision=precision),
+    )
+
+
+def _iter_headers(filename):
+    """Yield the step, time and flat box of each frame of an XTC file."""
+    data = np.memmap(filename, dtype=np.uint8, mode="r")
+    buffer = memoryview(data)
+    offset = 0
+    while offset < data.size:
+        if data.size - offset < _HEADER.size:
+            raise BoxError(f"Truncated XTC frame header at byte {offset}")
+        (magic, n_atoms, step, time, *box, n_atoms_check) = _HEADER.unpack_from(
+            buffer, offset
+        )
+        if magic != _XTC_MAGIC or n_atoms != n_atoms_check:
+            raise BoxError(f"Invalid XTC frame header at byte {offset}")
+        offset += _HEADER.size
+        if n_atoms <= 9:
+            # Small systems are stored uncompressed
+            offset += 12 * n_atoms
+        elif data.size - offset < _COMPRESSED_HEADER.size:
+            raise BoxError(f"Truncated XTC frame, step {step}")
+        else:
+            size = _COMPRESSED_HEADER.unpack_from(buffer, offset)[-1]
+            # XDR opaque data is padded to a multiple of 4 bytes
+            offset += _COMPRESSED_HEADER.size + 4 * ((size + 3) // 4)
+        if offset > data.size:
+            raise BoxError(f"Truncated XTC frame, step {step}")
+        yield step, time, box
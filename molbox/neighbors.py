@@ -0,0 +1,448 @@
+"""Neighbor search module using cell lists built on Box geometry."""
+import numpy as np
+
+from molbox.box import BoxError
+
+__all__ = ["CellList", "VerletList", "neighbor_list"]
+
+
+class CellList(object):
+    """A grid of cells spanning a box, used for fixed cutoff neighbor search.
+
+    The grid is defined in fractional coordinates of the box, so tilted boxes
+    are handled the same way as orthorhombic ones: each cell is a small
+    parallelepiped whose perpendicular widths are at least `cutoff`, and all
+    neighbors of a particle are found in the 27 cells surrounding its own.
+
+    Parameters
+    ----------
+    box : molbox.Box
+        The periodic box the particles are in.
+    cutoff : float
+        The neighbor search cutoff distance.
+
+    Attributes
+    ----------
+    box : molbox.Box
+        The box the grid currently spans.
+    cutoff : float
+        The neighbor search cutoff distance.
+    shape : tuple of int, shape=(3,)
+        Number of cells along each box vector.
+    """
+
+    def __init__(self, box, cutoff):
+        self._cutoff = float(cutoff)
+        if self._cutoff <= 0.0:
+            raise BoxError(f"The cutoff must be positive, got {cutoff}.")
+        self._box = None
+        self._shape = None
+        self.update_box(box)
+
+    @property
+    def box(self):
+        """The box the grid currently spans."""
+        return self._box
+
+    @property
+    def cutoff(self):
+        """The neighbor search cutoff distance."""
+        return self._cutoff
+
+    @property
+    def shape(self):
+        """Number of cells along each box vector."""
+        return tuple(int(n) for n in self._shape)
+
+    def update_box(self, box):
+        """Set the box spanned by the grid, reusing the grid if possible.
+
+        The current grid is kept as long as its cells remain at least
+        `cutoff` wide in the new box, which is the case for the small box
+        fluctuations of e.g. NPT trajectories.
+
+        Parameters
+        ----------
+        box : molbox.Box
+            The new box.
+
+        Returns
+        -------
+        rebuilt : bool
+            True if the grid had to be rebuilt for the new box.
+        """
+        if self._cutoff > box.max_cutoff:
+            raise BoxError(
+                f"The cutoff {self._cutoff} is larger than half the smallest "
+                f"perpendicular width of the box ({box.max_cutoff}), neighbors "
+                "would not be unique under the minimum image convention."
+            )
+        widths = box.perpendicular_widths
+        self._box = box
+        if self._shape is not None and np.all(
+            widths / self._shape >= self._cutoff
+        ):
+            return False
+
+        self._shape = np.floor(widths / self._cutoff).astype(np.intp)
+        # With fewer than 3 cells along a direction, the -1 and +1 neighbors
+        # are the same cell, only keep unique offsets to avoid duplicates.
+        per_dim = [
+            (-1, 0, 1) if n >= 3 else tuple(range(n)) for n in self._shape
+        ]
+        self._offsets = np.array(
+            [
+                (i, j, k)
+                for i in per_dim[0]
+                for j in per_dim[1]
+                for k in per_dim[2]
+            ],
+            dtype=np.intp,
+        )
+        return True
+
+    def cell_indices(self, positions):
+        """Return the (i, j, k) index of the cell containing each particle.
+
+        Parameters
+        ----------
+        positions : array-like, shape=(N, 3), dtype=float
+            Cartesian coordinates of the particles, these do not need to be
+            wrapped into the box.
+
+        Returns
+        -------
+        indices : np.ndarray, shape=(N, 3), dtype=int
+        """
+        positions = np.asarray(positions, dtype=np.float64).reshape(-1, 3)
+        frac = self._box.to_fractional(positions)
+        frac -= np.floor(frac)
+        indices = (frac * self._shape).astype(np.intp)
+        # Guard against fractional coordinates rounding up to exactly 1.0
+        np.minimum(indices, self._shape - 1, out=indices)
+        return indices
+
+    def cell_ids(self, indices):
+        """Return the flat index of cells, in C order of the grid `shape`.
+
+        Parameters
+        ----------
+        indices : array-like, shape=(..., 3), dtype=int
+            (i, j, k) indices of the cells, as returned by `cell_indices`.
+
+        Returns
+        -------
+        ids : np.ndarray, shape=(...), dtype=int
+        """
+        indices = np.asarray(indices, dtype=np.intp)
+        (_, ny, nz) = self._shape
+        return (indices[..., 0] * ny + indices[..., 1]) * nz + indices[..., 2]
+
+    def neighbor_cell_ids(self, indices):
+        """Return the flat index of the cells surrounding the given cells.
+
+        Each cell is its own neighbor, and neighboring cells are only listed
+        once when the grid has fewer than 3 cells along a box vector.
+
+        Parameters
+        ----------
+        indices : array-like, shape=(..., 3), dtype=int
+            (i, j, k) indices of the cells, as returned by `cell_indices`.
+
+        Returns
+        -------
+        ids : np.ndarray, shape=(..., M), dtype=int
+            Flat indices of the M neighboring cells of each cell, see
+            `cell_ids`.
+        """
+        indices = np.asarray(indices, dtype=np.intp)[..., np.newaxis, :]
+        return self.cell_ids((indices + self._offsets) % self._shape)
+
+    def neighbors(self, positions, full=False, return_distances=False):
+        """Find all pairs of particles within the cutoff distance.
+
+        Parameters
+        ----------
+        positions : array-like, shape=(N, 3), dtype=float
+            Cartesian coordinates of the particles.
+        full : bool, optional, default=False
+            If True, each pair (i, j) is reported for both i and j, otherwise
+            only once, for the particle with the lower index.
+        return_distances : bool, optional, default=False
+            If True, also return the distance of each pair.
+
+        Returns
+        -------
+        indptr : np.ndarray, shape=(N + 1,), dtype=int
+            The neighbors of particle i are `indices[indptr[i]:indptr[i+1]]`.
+        indices : np.ndarray, dtype=int
+            Neighbor indices, sorted for each particle.
+        distances : np.ndarray, dtype=float
+            Distance of each pair in `indices`, only if `return_distances`.
+        """
+        positions = np.asarray(positions, dtype=np.float64).reshape(-1, 3)
+        n_particles = positions.shape[0]
+        cell_idx = self.cell_indices(positions)
+        cell_id = self.cell_ids(cell_idx)
+
+        order = np.argsort(cell_id, kind="stable")
+        counts = np.bincount(cell_id, minlength=np.prod(self._shape))
+        starts = np.cumsum(counts) - counts
+        particles = np.arange(n_particles)
+        cutoff_sq = self._cutoff * self._cutoff
+
+        pairs_i = []
+        pairs_j = []
+        pairs_d = []
+        for nbr_id in self.neighbor_cell_ids(cell_idx).T:
+            nbr_counts = counts[nbr_id]
+            total = nbr_counts.sum()
+            if total == 0:
+                continue
+            i = np.repeat(particles, nbr_counts)
+            within = np.arange(total) - np.repeat(
+                np.cumsum(nbr_counts) - nbr_counts, nbr_counts
+            )
+            j = order[np.repeat(starts[nbr_id], nbr_counts) + within]
+            keep = (i != j) if full else (i < j)
+            i = i[keep]
+            j = j[keep]
+
+            dr = self._box.minimum_image(positions[j] - positions[i])
+            d_sq = np.einsum("ij,ij->i", dr, dr)
+            keep = d_sq < cutoff_sq
+            pairs_i.append(i[keep])
+            pairs_j.append(j[keep])
+            pairs_d.append(d_sq[keep])
+
+        if pairs_i:
+            i = np.concatenate(pairs_i)
+            j = np.concatenate(pairs_j)
+            d_sq = np.concatenate(pairs_d)
+        else:
+            i = j = np.zeros(0, dtype=np.intp)
+            d_sq = np.zeros(0)
+        sort = np.lexsort((j, i))
+        indptr = np.zeros(n_particles + 1, dtype=np.intp)
+        np.cumsum(np.bincount(i, minlength=n_particles), out=indptr[1:])
+        if return_distances:
+            return indptr, j[sort], np.sqrt(d_sq[sort])
+        return indptr, j[sort]
+
+
+class VerletList(object):
+    """A Verlet neighbor list with a skin, only rebuilt when needed.
+
+    Pairs are stored up to `cutoff + skin`, the list then stays valid until a
+    particle moves by more than half the skin, or the box changes. Calling
+    `update` with the positions of each frame rebuilds the list only in
+    these cases, the number of rebuilds can be used to tune the skin.
+
+    Parameters
+    ----------
+    box : molbox.Box
+        The periodic box the particles are in.
+    cutoff : float
+        The neighbor search cutoff distance.
+    skin : float
+        Extra distance added to the cutoff when building the list.
+    full : bool, optional, default=False
+        If True, each pair (i, j) is stored for both i and j, otherwise only
+        once, for the particle with the lower index.
+    box_tolerance : float, optional, default=1e-6
+        Absolute tolerance on the box vectors under which a new box is
+        considered unchanged.
+
+    Attributes
+    ----------
+    indptr : np.ndarray, shape=(N + 1,), dtype=int
+        The neighbors of particle i are `indices[indptr[i]:indptr[i+1]]`.
+    indices : np.ndarray, dtype=int
+        Neighbor indices within `cutoff + skin`, sorted for each particle.
+    n_builds : int
+        Number of times the list was built.
+    n_updates : int
+        Number of calls to `update`.
+    """
+
+    def __init__(self, box, cutoff, skin, full=False, box_tolerance=1e-6):
+        if skin < 0.0:
+            raise BoxError(f"The skin must not be negative, got {skin}.")
+        self._box = box
+        self._cutoff = float(cutoff)
+        self._skin = float(skin)
+        self._full = full
+        self._box_tolerance = box_tolerance
+        self._cell_list = CellList(box, self._cutoff + self._skin)
+        self._reference = None
+        self._reference_box = None
+        self._indptr = None
+        self._indices = None
+        self.n_builds = 0
+        self.n_updates = 0
+
+    @property
+    def box(self):
+        """The box of the latest update."""
+        return self._box
+
+    @property
+    def cutoff(self):
+        """The neighbor search cutoff distance."""
+        return self._cutoff
+
+    @property
+    def skin(self):
+        """Extra distance added to the cutoff when building the list."""
+        return self._skin
+
+    @property
+    def indptr(self):
+        """Index pointers of the neighbors of each particle."""
+        return self._indptr
+
+    @property
+    def indices(self):
+        """Neighbor indices within `cutoff + skin`."""
+        return self._indices
+
+    def max_displacement(self, positions, box=None):
+        """Largest displacement of any particle since the list was built.
+
+        Displacements follow the minimum image convention of `box`, or of
+        the box of the latest update if None.
+        """
+        if self._reference is None:
+            return np.inf
+        box = self._box if box is None else box
+        positions = np.asarray(positions, dtype=np.float64).reshape(-1, 3)
+        if positions.shape != self._reference.shape:
+            return np.inf
+        dr = box.minimum_image(positions - self._reference)
+        return np.sqrt(np.einsum("ij,ij->i", dr, dr).max(initial=0.0))
+
+    def needs_rebuild(self, positions, box=None):
+        """Return True if the list is not valid anymore for these positions.
+
+        Parameters
+        ----------
+        positions : array-like, shape=(N, 3), dtype=float
+            Cartesian coordinates of the particles.
+        box : molbox.Box, optional, default=None
+            The box of the frame, if None the box is assumed unchanged.
+        """
+        if self._reference is None:
+            return True
+        if box is not None and not np.allclose(
+            box.vectors,
+            self._reference_box.vectors,
+            rtol=0.0,
+            atol=self._box_tolerance,
+        ):
+            return True
+        return self.max_displacement(positions, box) > 0.5 * self._skin
+
+    def update(self, positions, box=None):
+        """Update the list for a new frame, rebuilding it if needed.
+
+        Parameters
+        ----------
+        positions : array-like, shape=(N, 3), dtype=float
+            Cartesian coordinates of the particles.
+        box : molbox.Box, optional, default=None
+            The box of the frame, if None the box is assumed unchanged.
+
+        Returns
+        -------
+        rebuilt : bool
+            True if the list was rebuilt.
+        """
+        self.n_updates += 1
+        rebuild = self.needs_rebuild(positions, box)
+        if box is not None:
+            self._box = box
+        if not rebuild:
+            return False
+
+        positions = np.array(positions, dtype=np.float64).reshape(-1, 3)
+        self._cell_list.update_box(self._box)
+        (self._indptr, self._indices) = self._cell_list.neighbors(
+            positions, full=self._full
+        )
+        self._reference = positions
+        self._reference_box = self._box
+        self.n_builds += 1
+        return True
+
+    def neighbors(self, positions, box=None, return_distances=False):
+        """Return the pairs within the cutoff for the current frame.
+
+        The list is updated first, the pairs within `cutoff + skin` are then
+        filtered down to those within `cutoff` for these positions.
+
+        Parameters
+        ----------
+        positions : array-like, shape=(N, 3), dtype=float
+            Cartesian coordinates of the particles.
+        box : molbox.Box, optional, default=None
+            The box of the frame, if None the box is assumed unchanged.
+        return_distances : bool, optional, default=False
+            If True, also return the distance of each pair.
+
+        Returns
+        -------
+        indptr : np.ndarray, shape=(N + 1,), dtype=int
+            The neighbors of particle i are `indices[indptr[i]:indptr[i+1]]`.
+        indices : np.ndarray, dtype=int
+            Neighbor indices, sorted for each particle.
+        distances : np.ndarray, dtype=float
+            Distance of each pair in `indices`, only if `return_distances`.
+        """
+        self.update(positions, box)
+        positions = np.asarray(positions, dtype=np.float64).reshape(-1, 3)
+        counts = np.diff(self._indptr)
+        i = np.repeat(np.arange(counts.size), counts)
+        dr = self._box.minimum_image(positions[self._indices] - positions[i])
+        d_sq = np.einsum("ij,ij->i", dr, dr)
+        keep = d_sq < self._cutoff * self._cutoff
+
+        indptr = np.zeros_like(self._indptr)
+        np.cumsum(np.bincount(i[keep], minlength=counts.size), out=indptr[1:])
+        if return_distances:
+            return indptr, self._indices[keep], np.sqrt(d_sq[keep])
+        return indptr, self._indices[keep]
+
+
+def neighbor_list(box, positions, cutoff, full=False, return_distances=False):
+    """Find all pairs of particles within a cutoff distance using a cell list.
+
+    Parameters
+    ----------
+    box : molbox.Box
+        The periodic box the particles are in.
+    positions : array-like, shape=(N, 3), dtype=float
+        Cartesian coordinates of the particles.
+    cutoff : float
+        The neighbor search cutoff distance.
+    full : bool, optional, default=False
+        If True, each pair (i, j) is reported for both i and j, otherwise only
+        once, for the particle with the lower index.
+    return_distances : bool, optional, default=False
+        If True, also return the distance of each pair.
+
+    Returns
+    -------
+    indptr : np.ndarray, shape=(N + 1,), dtype=int
+        The neighbors of particle i are `indices[indptr[i]:indptr[i+1]]`.
+    indices : np.ndarray, dtype=int
+        Neighbor indices, sorted for each particle.
+    distances : np.ndarray, dtype=float
+        Distance of each pair in `indices`, only if `return_distances`.
+
+    See Also
+    --------
+    CellList : to reuse the cell grid across the frames of a trajectory.
+    """
+    return CellList(box, cutoff).neighbors(
+        positions, full=full, return_distances=return_distances
+    )
@@ -0,0 +1,107 @@
+"""Random insertion of non-overlapping points in a Box."""
+import numpy as np
+
+from molbox.box import BoxError
+from molbox.neighbors import CellList
+
+__all__ = ["insert_points"]
+
+
+def insert_points(
+    box,
+    n,
+    min_distance,
+    existing=None,
+    rng=None,
+    max_attempts=None,
+    batch_size=1024,
+):
+    """Randomly insert points in a box, rejecting overlapping ones.
+
+    Candidates are drawn uniformly in the box (see `Box.sample_uniform`) and
+    accepted if no point lies within `min_distance` of them, under the minimum
+    image convention. Accepted points are stored in a grid of cells at least
+    `min_distance` wide, so each trial only checks the points of the 27
+    surrounding cells and costs O(1) on average.
+
+    Parameters
+    ----------
+    box : molbox.Box
+        The periodic box to insert the points in.
+    n : int
+        Number of points to insert.
+    min_distance : float
+        Minimum allowed distance between any two points.
+    existing : array-like, shape=(M, 3), dtype=float, optional, default=None
+        Cartesian coordinates of points already in the box, e.g. a solute.
+    rng : int or np.random.Generator, optional, default=None
+        Seed or random number generator, for reproducible insertions.
+    max_attempts : int, optional, default=None
+        Maximum number of candidates to try, 1000 * n if None.
+    batch_size : int, optional, default=1024
+        Number of candidates drawn at a time.
+
+    Returns
+    -------
+    points : np.ndarray, shape=(n, 3)
+        Cartesian coordinates of the inserted points, wrapped into the box.
+    """
+    rng = np.random.default_rng(rng)
+    if max_attempts is None:
+        max_attempts = 1000 * n
+    if min_distance <= 0.0:
+        raise BoxError(
+            f"The minimum distance must be positive, got {min_distance}."
+        )
+    if min_distance > box.max_cutoff:
+        raise BoxError(
+            f"The minimum distance {min_distance} is larger than half the "
+            f"smallest perpendicular width of the box ({box.max_cutoff}), "
+            "overlaps with periodic images could not all be detected. Use a "
+            "larger box or a smaller minimum distance."
+        )
+    cell_list = CellList(box, min_distance)
+    min_distance_sq = min_distance * min_distance
+
+    if existing is None:
+        existing = np.zeros((0, 3))
+    existing = np.asarray(existing, dtype=np.float64).reshape(-1, 3)
+    n_existing = existing.shape[0]
+    points = np.empty((n_existing + n, 3))
+    points[:n_existing] = existing
+
+    grid = {}
+    cell_ids = cell_list.cell_ids(cell_list.cell_indices(existing))
+    for (index, cell_id) in enumerate(cell_ids.tolist()):
+        grid.setdefault(cell_id, []).append(index)
+
+    count = n_existing
+    attempts = 0
+    while count < n_existing + n:
+        if attempts >= max_attempts:
+            raise BoxError(
+                f"Could only insert {count - n_existing} of {n} points with a "
+                f"minimum distance of {min_distance} after {attempts} attempts."
+            )
+        size = min(batch_size, max_attempts - attempts)
+        candidates = box.sample_uniform(size, rng=rng)
+        cells = cell_list.cell_indices(candidates)
+        cell_ids = cell_list.cell_ids(cells).tolist()
+        neighbor_ids = cell_list.neighbor_cell_ids(cells).tolist()
+        for (candidate, cell_id, nbr_ids) in zip(
+            candidates, cell_ids, neighbor_ids
+        ):
+            attempts += 1
+            neighbors = [
+                index for nbr_id in nbr_ids for index in grid.get(nbr_id, ())
+            ]
+            if neighbors:
+                dr = box.minimum_image(points[neighbors] - candidate)
+                if np.einsum("ij,ij->i", dr, dr).min() < min_distance_sq:
+                    continue
+            points[count] = candidate
+            grid.setdefault(cell_id, []).append(count)
+            count += 1
+            if count == n_existing + n:
+                break
+    return points[n_existing:]
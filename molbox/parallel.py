@@ -0,0 +1,246 @@
+"""Parallel extraction and conversion of boxes over a pool of processes.
+
+Results are shipped back from the worker processes through shared memory
+blocks (`multiprocessing.shared_memory`, Python 3.8+) instead of pickling
+the arrays or `Box` objects, only a small description of each block goes
+through the pipes of the process pool. Results are always returned in
+the order of the inputs, with a bounded number of tasks in flight so the
+memory use does not grow with the number of inputs.
+"""
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from molbox.box import BoxError
+from molbox.box_array import BoxArray
+
+try:
+    from multiprocessing import resource_tracker, shared_memory
+except ImportError:  # pragma: no cover
+    # Python 3.7
+    resource_tracker = shared_memory = None
+
+__all__ = ["from_vectors", "map_boxes"]
+
+# Arrays packed in a shared memory block start on multiples of this size.
+_ALIGNMENT = 64
+
+
+def map_boxes(func, items, executor=None, max_workers=None, max_in_flight=None):
+    """Apply a box extraction function to many inputs in parallel.
+
+    `func` is typically a reader of `molbox.formats` applied to many files,
+    e.g. `molbox.formats.lammps.read_dump_boxes`. It is called in worker
+    processes, so it must be picklable (a module level function). The
+    `BoxArray` and NumPy arrays it returns, also inside a tuple, are moved
+    to shared memory and rebuilt in the calling process, other values are
+    pickled as usual.
+
+    Parameters
+    ----------
+    func : callable
+        Function called with each item, returning a `BoxArray`, an array or
+        a tuple of those.
+    items : iterable
+        Inputs of `func`, e.g. file names.
+    executor : concurrent.futures.ProcessPoolExecutor, optional, default=None
+        Pool of processes to use, if None a pool is created and shut down
+        once all the results were yielded.
+    max_workers : int, optional, default=None
+        Number of processes of the created pool, ignored if `executor` is
+        given. If None, the number of processors is used.
+    max_in_flight : int, optional, default=None
+        Maximum number of submitted but not yet yielded items, if None twice
+        the number of workers.
+
+    Yields
+    ------
+    result
+        The result of `func` for each item, in the order of `items`.
+    """
+    if shared_memory is None:
+        raise BoxError(
+            "Parallel box extraction requires multiprocessing.shared_memory, "
+            "available from Python 3.8"
+        )
+    if max_in_flight is not None and int(max_in_flight) < 1:
+        raise BoxError(
+            f"max_in_flight must be a positive integer, got {max_in_flight}"
+        )
+    return _map_boxes(func, items, executor, max_workers, max_in_flight)
+
+
+def _map_boxes(func, items, executor, max_workers, max_in_flight):
+    owned = executor is None
+    pool = ProcessPoolExecutor(max_workers) if owned else executor
+    if max_in_flight is None:
+        max_in_flight = 2 * getattr(pool, "_max_workers", os.cpu_count() or 1)
+    pending = deque()
+    try:
+        for item in items:
+            if len(pending) >= max_in_flight:
+                yield _collect(pending.popleft().result())
+            pending.append(pool.submit(_call_and_share, func, item))
+        while pending:
+            yield _collect(pending.popleft().result())
+    finally:
+        _discard(pending)
+        if owned:
+            pool.shutdown(wait=True)
+
+
+def from_vectors(
+    vectors,
+    precision=None,
+    chunk_size=65536,
+    executor=None,
+    max_workers=None,
+    max_in_flight=None,
+):
+    """Parallel equivalent of `BoxArray.from_vectors` for very large series.
+
+    Each worker validates and normalizes a chunk of frames, the reduced
+    vectors come back through shared memory and are assembled into a single
+    `BoxArray`.
+
+    Parameters
+    ----------
+    vectors : array-like, shape=(N,3,3), dtype=float
+        Box vectors of each frame, in row-major format.
+    precision : int, optional, default=None
+        Control the precision of the floating point representation of box
+        attributes. If none provided, the default is 6 decimals.
+    chunk_size : int, optional, default=65536
+        Number of frames converted by each task.
+    executor : concurrent.futures.ProcessPoolExecutor, optional, default=None
+        Pool of processes to use, if None a pool is created for the call.
+    max_workers : int, optional, default=None
+        Number of processes of the created pool, ignored if `executor` is
+        given.
+    max_in_flight : int, optional, default=None
+        Maximum number of chunks being converted at a time, if None twice the
+        number of workers.
+
+    Returns
+    -------
+    boxes : molbox.BoxArray
+    """
+    vectors = np.asarray(vectors, dtype=np.float64).reshape(-1, 3, 3)
+    precision = 6 if precision is None else int(precision)
+    chunk_size = int(chunk_size)
+    tasks = (
+        (vectors[start : start + chunk_size], precision)
+        for start in range(0, vectors.shape[0], chunk_size)
+    )
+    reduced = [np.zeros((0, 3, 3))]
+    for boxes in map_boxes(
+        _convert_chunk,
+        tasks,
+        executor=executor,
+        max_workers=max_workers,
+        max_in_flight=max_in_flight,
+    ):
+        reduced.append(boxes.vectors)
+    return BoxArray._from_reduced_vectors(np.concatenate(reduced), precision)
+
+
+def _call_and_share(func, item):
+    """Worker side: call `func` and move its arrays to shared memory."""
+    return _share(func(item))
+
+
+def _convert_chunk(task):
+    """Worker side: convert a chunk of frames."""
+    (vectors, precision) = task
+    return BoxArray.from_vectors(vectors, precision=precision)
+
+
+def _share(result):
+    """Pack the arrays of a result into a new shared memory block.
+
+    Returns the name of the block (None if there are no arrays), whether the
+    result is a tuple, and the description of each value of the result.
+    """
+    is_tuple = isinstance(result, tuple)
+    values = result if is_tuple else (result,)
+    (arrays, specs, size) = ([], [], 0)
+    for value in values:
+        if isinstance(value, BoxArray):
+            (kind, array, extra) = ("boxes", value.vectors, value.precision)
+        elif isinstance(value, np.ndarray) and not value.dtype.hasobject:
+            (kind, array, extra) = ("array", value, None)
+        else:
+            specs.append(("object", value))
+            continue
+        array = np.ascontiguousarray(array)
+        arrays.append((size, array))
+        specs.append((kind, size, array.shape, array.dtype.str, extra))
+        size += -(-array.nbytes // _ALIGNMENT) * _ALIGNMENT
+    name = None
+    if arrays:
+        block = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        try:
+            for (offset, array) in arrays:
+                view = np.ndarray(
+                    array.shape, array.dtype, buffer=block.buf, offset=offset
+                )
+                view[...] = array
+                del view
+        finally:
+            block.close()
+        _untrack(block)
+        name = block.name
+    return name, is_tuple, specs
+
+
+def _untrack(block):
+    """Hand the lifetime of a block created in a worker to the caller.
+
+    The block is unlinked by the calling process once collected, the
+    resource tracker of the worker must not unlink it again at exit.
+    """
+    if os.name == "posix":
+        resource_tracker.unregister(block._name, "shared_memory")
+
+
+def _collect(shared):
+    """Rebuild a result packed by `_share`, and free its memory block."""
+    (name, is_tuple, specs) = shared
+    block = None if name is None else shared_memory.SharedMemory(name=name)
+    values = []
+    try:
+        for spec in specs:
+            if spec[0] == "object":
+                values.append(spec[1])
+                continue
+            (kind, offset, shape, dtype, extra) = spec
+            array = np.ndarray(
+                shape, np.dtype(dtype), buffer=block.buf, offset=offset
+            ).copy()
+            if kind == "boxes":
+                array = BoxArray._from_reduced_vectors(array, extra)
+            values.append(array)
+    finally:
+        if block is not None:
+            block.close()
+            block.unlink()
+    return tuple(values) if is_tuple else values[0]
+
+
+def _discard(pending):
+    """Cancel pending tasks and free the blocks of the finished ones."""
+    for future in pending:
+        future.cancel()
+    for future in pending:
+        if future.cancelled():
+            continue
+        try:
+            (name, _, _) = future.result()
+        except Exception:
+            continue
+        if name is not None:
+            block = shared_memory.SharedMemory(name=name)
+            block.close()
+            block.unlink()
@@ -0,0 +1,155 @@
+"""Memory-mapped readers for long series of boxes stored on disk."""
+import numpy as np
+
+from molbox.box import _TRIL_INDICES, Box, BoxError
+from molbox.box_array import BoxArray, _tril_entries_to_vectors_batch
+
+__all__ = ["BoxSeries"]
+
+# Expected shape of a single frame for each supported layout.
+_LAYOUTS = {
+    "vectors": (3, 3),
+    "reduced": (6,),
+    "lengths_angles": (6,),
+}
+
+
+class BoxSeries(object):
+    """Random access to a series of boxes stored in a `.npy` file.
+
+    The file is memory-mapped, so only the frames that are accessed are read
+    from disk: indexing a single frame of a multi-gigabyte series costs a page
+    fault rather than a full load. Integer indices return a `Box`, any other
+    index (slices, integer arrays, boolean masks) returns a `BoxArray`.
+
+    Parameters
+    ----------
+    source : str, os.PathLike or np.ndarray
+        Path of a `.npy` file, or an array (e.g. an `np.memmap` over a raw
+        binary file) holding the series.
+    layout : {"vectors", "reduced", "lengths_angles"}, optional, default=None
+        How each frame is stored:
+
+        - "vectors": (N,3,3) row-major box vectors, in any orientation.
+        - "reduced": (N,6) lower triangular entries of the reduced vectors
+          (ax, bx, by, cx, cy, cz), as written by `BoxArray.save`.
+        - "lengths_angles": (N,6) lengths followed by angles in degrees.
+
+        If None, (N,3,3) arrays are read as "vectors" and (N,6) arrays as
+        "reduced".
+    precision : int, optional, default=None
+        Control the precision of the floating point representation of box
+        attributes. If none provided, the default is 6 decimals.
+    mmap_mode : {"r", "r+", "c"}, optional, default="r"
+        Memory-map mode passed to `np.load` when `source` is a path.
+
+    Attributes
+    ----------
+    data : np.ndarray
+        The underlying (memory-mapped) array.
+    layout : str
+        Layout of the frames in `data`.
+    precision : int
+        Precision of the boxes created from the series.
+    """
+
+    def __init__(self, source, layout=None, precision=None, mmap_mode="r"):
+        if isinstance(source, np.ndarray):
+            data = source
+        else:
+            data = np.load(source, mmap_mode=mmap_mode)
+        if layout is None:
+            layout = "vectors" if data.shape[1:] == (3, 3) else "reduced"
+        if layout not in _LAYOUTS:
+            raise BoxError(
+                f"Unknown layout {layout!r}, expected one of {list(_LAYOUTS)}"
+            )
+        if data.shape[1:] != _LAYOUTS[layout]:
+            raise BoxError(
+                f"Expected frames of shape {_LAYOUTS[layout]} for the "
+                f"{layout!r} layout, got an array of shape {data.shape}"
+            )
+        self._data = data
+        self._layout = layout
+        self._precision = 6 if precision is None else int(precision)
+
+    @property
+    def data(self):
+        """The underlying (memory-mapped) array."""
+        return self._data
+
+    @property
+    def layout(self):
+        """Layout of the frames in the underlying array."""
+        return self._layout
+
+    @property
+    def precision(self):
+        """Amount of decimals to represent floating point values."""
+        return self._precision
+
+    def __len__(self):
+        return self._data.shape[0]
+
+    def __getitem__(self, index):
+        """Return a `Box` for an integer index, a `BoxArray` otherwise."""
+        if isinstance(index, (int, np.integer)):
+            return self._to_box(np.asarray(self._data[index], dtype=np.float64))
+        frames = np.asarray(self._data[index], dtype=np.float64)
+        return self._to_box_array(frames.reshape(-1, *_LAYOUTS[self._layout]))
+
+    def __iter__(self):
+        for (_, chunk) in self.iter_chunks():
+            for i in range(len(chunk)):
+                yield chunk[i]
+
+    def iter_chunks(self, chunk_size=65536):
+        """Iterate over the series in batches of frames.
+
+        Only one chunk of frames is read into memory at a time.
+
+        Parameters
+        ----------
+        chunk_size : int, optional, default=65536
+            Number of frames in each chunk.
+
+        Yields
+        ------
+        start : int
+            Index of the first frame of the chunk.
+        boxes : molbox.BoxArray
+            The boxes of the chunk, the last one may be shorter.
+        """
+        chunk_size = int(chunk_size)
+        if chunk_size < 1:
+            raise BoxError(
+                f"chunk_size must be a positive integer, got {chunk_size}"
+            )
+        for start in range(0, len(self), chunk_size):
+            yield start, self[start : start + chunk_size]
+
+    def __repr__(self):
+        """Return a string representation of the box series."""
+        return (
+            f"BoxSeries: {len(self)} boxes, layout={self._layout!r}, "
+            f"precision={self._precision}"
+        )
+
+    def _to_box(self, frame):
+        if self._layout == "vectors":
+            return Box.from_vectors(frame, precision=self._precision)
+        if self._layout == "reduced":
+            vectors = np.zeros((3, 3))
+            vectors[_TRIL_INDICES] = frame
+            return Box.from_reduced_vectors(vectors, precision=self._precision)
+        return Box(frame[:3], frame[3:], precision=self._precision)
+
+    def _to_box_array(self, frames):
+        if self._layout == "vectors":
+            return BoxArray.from_vectors(frames, precision=self._precision)
+        if self._layout == "reduced":
+            return BoxArray._from_reduced_vectors(
+                _tril_entries_to_vectors_batch(frames).round(self._precision),
+                self._precision,
+            )
+        return BoxArray(frames[:, :3], frames[:, 3:], precision=self._precision)
@@ -0,0 +1,412 @@
+"""Chunked, appendable storage of box series in HDF5, Zarr or NumPy files.
+
+HDF5 (h5py) and Zarr are optional dependencies, a directory of chunked
+`.npy` files is used as a pure NumPy fallback. All backends store the
+boxes as an (N,6) float64 dataset with the lower triangular entries of the
+reduced vectors (ax, bx, by, cx, cy, cz), the layout of `BoxArray.save`.
+"""
+import glob
+import json
+import os
+
+import numpy as np
+
+from molbox.box import _TRIL_INDICES, Box, BoxError
+from molbox.box_array import BoxArray, _tril_entries_to_vectors_batch
+
+try:
+    import h5py
+except ImportError:  # pragma: no cover
+    h5py = None
+
+try:
+    import zarr
+except ImportError:  # pragma: no cover
+    zarr = None
+
+__all__ = ["BoxStore"]
+
+_BACKENDS = ("hdf5", "zarr", "npy")
+_SUFFIXES = {".h5": "hdf5", ".hdf5": "hdf5", ".zarr": "zarr"}
+
+
+class BoxStore(object):
+    """Appendable, chunked on-disk storage of a series of boxes.
+
+    Boxes can be appended while a simulation is running, and any range of
+    frames can be read back directly as a `BoxArray`, only the chunks
+    overlapping the range are read from disk.
+
+    Parameters
+    ----------
+    path : str, os.PathLike, h5py.Group or zarr.Group
+        Path of the file (HDF5), group (Zarr) or directory (NumPy) to store
+        the boxes in. An open HDF5 or Zarr group can also be given, e.g. to
+        store the boxes next to the coordinates of a trajectory.
+    mode : {"r", "a", "w"}, optional, default="a"
+        Read only, read and append (creating the storage if needed), or
+        overwrite any existing box series.
+    backend : {"hdf5", "zarr", "npy"}, optional, default=None
+        Storage backend, if None it is inferred from `path`: ".h5" and
+        ".hdf5" files use HDF5, ".zarr" paths use Zarr, anything else the
+        NumPy fallback.
+    name : str, optional, default="boxes"
+        Name of the dataset in HDF5 and Zarr groups.
+    chunk_size : int, optional, default=4096
+        Number of frames per chunk, used when the dataset is created.
+    compression : {None, "gzip"}, optional, default=None
+        Compression of the chunks, used when the dataset is created. The
+        NumPy fallback stores compressed chunks as `.npz` files, which cannot
+        be memory-mapped.
+    compression_level : int, optional, default=None
+        Compression level, if None the library default is used.
+    precision : int, optional, default=None
+        Precision of the boxes, stored along with them when the dataset is
+        created. If None, the stored precision, or 6 decimals, is used.
+    """
+
+    def __init__(
+        self,
+        path,
+        mode="a",
+        backend=None,
+        name="boxes",
+        chunk_size=4096,
+        compression=None,
+        compression_level=None,
+        precision=None,
+    ):
+        if mode not in ("r", "a", "w"):
+            raise BoxError(f"Invalid mode {mode!r}, expected 'r', 'a' or 'w'")
+        if compression not in (None, "gzip"):
+            raise BoxError(
+                f"Unsupported compression {compression!r}, expected None or "
+                "'gzip'"
+            )
+        if backend is None:
+            backend = _infer_backend(path)
+        if backend not in _BACKENDS:
+            raise BoxError(
+                f"Unknown backend {backend!r}, expected one of {_BACKENDS}"
+            )
+        options = {
+            "chunk_size": int(chunk_size),
+            "compression": compression,
+            "compression_level": compression_level,
+            "precision": 6 if precision is None else int(precision),
+        }
+        if backend == "hdf5":
+            self._backend = _Hdf5Backend(path, mode, name, options)
+        elif backend == "zarr":
+            self._backend = _ZarrBackend(path, mode, name, options)
+        else:
+            self._backend = _NpyBackend(path, mode, options)
+        self._mode = mode
+        self._precision = (
+            int(precision) if precision is not None else self._backend.precision
+        )
+
+    @property
+    def backend(self):
+        """Name of the storage backend."""
+        return self._backend.name
+
+    @property
+    def precision(self):
+        """Precision of the boxes read from the storage."""
+        return self._precision
+
+    def __len__(self):
+        return len(self._backend)
+
+    def append(self, boxes):
+        """Append boxes at the end of the series.
+
+        Parameters
+        ----------
+        boxes : molbox.Box, molbox.BoxArray or iterable of molbox.Box
+            Boxes to append.
+        """
+        if self._mode == "r":
+            raise BoxError("Cannot append to a BoxStore opened in read mode")
+        if isinstance(boxes, Box):
+            entries = boxes.vectors[_TRIL_INDICES][np.newaxis]
+        else:
+            if not isinstance(boxes, BoxArray):
+                boxes = BoxArray.from_boxes(boxes)
+            entries = boxes.vectors[:, _TRIL_INDICES[0], _TRIL_INDICES[1]]
+        if len(entries):
+            self._backend.append(np.ascontiguousarray(entries))
+
+    def read(self, start=None, stop=None):
+        """Read a range of frames.
+
+        Parameters
+        ----------
+        start, stop : int, optional, default=None
+            Range of frames to read, following the slicing conventions.
+
+        Returns
+        -------
+        boxes : molbox.BoxArray
+        """
+        (start, stop, _) = slice(start, stop).indices(len(self))
+        entries = self._backend.read(start, max(start, stop))
+        vectors = _tril_entries_to_vectors_batch(entries)
+        return BoxArray._from_reduced_vectors(
+            vectors.round(self._precision), self._precision
+        )
+
+    def __getitem__(self, index):
+        """Return a `Box` for an integer index, a `BoxArray` for a slice."""
+        if isinstance(index, (int, np.integer)):
+            n_frames = len(self)
+            if not -n_frames <= index < n_frames:
+                raise IndexError(f"Frame {index} out of range ({n_frames})")
+            index = int(index) % n_frames
+            return self.read(index, index + 1)[0]
+        if isinstance(index, slice):
+            (start, stop, step) = index.indices(len(self))
+            if step > 0:
+                return self.read(start, stop)[::step]
+            return self.read()[index]
+        raise BoxError(f"Unsupported index {index!r}")
+
+    def flush(self):
+        """Write buffered data to disk."""
+        self._backend.flush()
+
+    def close(self):
+        """Flush and close the underlying storage."""
+        self._backend.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __repr__(self):
+        """Return a string representation of the box store."""
+        return (
+            f"BoxStore: {len(self)} boxes, backend={self.backend!r}, "
+            f"precision={self.precision}"
+        )
+
+
+def _infer_backend(path):
+    if h5py is not None and isinstance(path, h5py.Group):
+        return "hdf5"
+    if zarr is not None and isinstance(path, zarr.Group):
+        return "zarr"
+    suffix = os.path.splitext(os.fspath(path).rstrip("/\\"))[1].lower()
+    return _SUFFIXES.get(suffix, "npy")
+
+
+def _require(module, name, backend):
+    if module is None:
+        raise BoxError(
+            f"The {backend} backend requires the optional dependency {name}, "
+            f"install it or use backend='npy'"
+        )
+
+
+class _Hdf5Backend(object):
+    name = "hdf5"
+
+    def __init__(self, path, mode, name, options):
+        _require(h5py, "h5py", self.name)
+        if isinstance(path, h5py.Group):
+            (self._file, group) = (None, path)
+        else:
+            self._file = h5py.File(path, {"w": "a"}.get(mode, mode))
+            group = self._file
+        if mode == "w" and name in group:
+            del group[name]
+        if name in group:
+            self._dataset = group[name]
+        elif mode == "r":
+            raise BoxError(f"No dataset {name!r} in {path}")
+        else:
+            self._dataset = group.create_dataset(
+                name,
+                shape=(0, 6),
+                maxshape=(None, 6),
+                chunks=(options["chunk_size"], 6),
+                dtype=np.float64,
+                compression=options["compression"],
+                compression_opts=options["compression_level"],
+            )
+            self._dataset.attrs["precision"] = options["precision"]
+        self.precision = int(self._dataset.attrs.get("precision", 6))
+
+    def __len__(self):
+        return self._dataset.shape[0]
+
+    def append(self, entries):
+        n_frames = self._dataset.shape[0]
+        self._dataset.resize(n_frames + entries.shape[0], axis=0)
+        self._dataset[n_frames:] = entries
+
+    def read(self, start, stop):
+        return self._dataset[start:stop]
+
+    def flush(self):
+        self._dataset.file.flush()
+
+    def close(self):
+        if self._file is not None and self._file.id:
+            self._file.close()
+
+
+class _ZarrBackend(object):
+    name = "zarr"
+
+    def __init__(self, path, mode, name, options):
+        _require(zarr, "zarr", self.name)
+        if isinstance(path, zarr.Group):
+            group = path
+        else:
+            group = zarr.open_group(path, mode="r" if mode == "r" else "a")
+        if mode == "w" and name in group:
+            del group[name]
+        if name in group:
+            self._array = group[name]
+        elif mode == "r":
+            raise BoxError(f"No dataset {name!r} in {path}")
+        else:
+            self._array = _create_zarr_array(group, name, options)
+            self._array.attrs["precision"] = options["precision"]
+        self.precision = int(self._array.attrs.get("precision", 6))
+
+    def __len__(self):
+        return self._array.shape[0]
+
+    def append(self, entries):
+        self._array.append(entries, axis=0)
+
+    def read(self, start, stop):
+        return self._array[start:stop]
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def _create_zarr_array(group, name, options):
+    """Create an extendable (0,6) array, with the Zarr 2 or 3 API."""
+    (compression, level) = (
+        options["compression"],
+        options["compression_level"],
+    )
+    kwargs = {
+        "shape": (0, 6),
+        "chunks": (options["chunk_size"], 6),
+        "dtype": np.float64,
+    }
+    if hasattr(group, "create_array"):
+        from zarr.codecs import GzipCodec
+
+        compressors = None
+        if compression == "gzip":
+            compressors = [GzipCodec() if level is None else GzipCodec(level)]
+        return group.create_array(name, compressors=compressors, **kwargs)
+    from numcodecs import GZip
+
+    compressor = None
+    if compression == "gzip":
+        compressor = GZip() if level is None else GZip(level)
+    return group.create_dataset(name, compressor=compressor, **kwargs)
+
+
+class _NpyBackend(object):
+    """Directory of numbered chunk files, and a JSON file of metadata."""
+
+    name = "npy"
+
+    def __init__(self, path, mode, options):
+        self._path = os.fspath(path)
+        self._meta_path = os.path.join(self._path, "boxes.json")
+        if mode == "w":
+            for filename in self._chunk_files() + [self._meta_path]:
+                if os.path.exists(filename):
+                    os.remove(filename)
+        if os.path.exists(self._meta_path):
+            with open(self._meta_path) as f:
+                self._meta = json.load(f)
+        elif mode == "r":
+            raise BoxError(f"No box series in {self._path}")
+        else:
+            os.makedirs(self._path, exist_ok=True)
+            self._meta = {
+                "n_frames": 0,
+                "chunk_size": options["chunk_size"],
+                "compressed": options["compression"] is not None,
+                "precision": options["precision"],
+            }
+            self._write_meta()
+        self.precision = self._meta["precision"]
+
+    def __len__(self):
+        return self._meta["n_frames"]
+
+    def append(self, entries):
+        chunk_size = self._meta["chunk_size"]
+        n_frames = self._meta["n_frames"]
+        # Fill the last, partial chunk first, then write new chunks
+        (index, used) = divmod(n_frames, chunk_size)
+        if used:
+            last = np.array(self._load_chunk(index))
+            entries = np.concatenate((last, entries))
+        for start in range(0, entries.shape[0], chunk_size):
+            self._save_chunk(index, entries[start : start + chunk_size])
+            index += 1
+        self._meta["n_frames"] = n_frames - used + entries.shape[0]
+        self._write_meta()
+
+    def read(self, start, stop):
+        chunk_size = self._meta["chunk_size"]
+        blocks = [np.zeros((0, 6))]
+        for index in range(start // chunk_size, -(-stop // chunk_size)):
+            offset = index * chunk_size
+            chunk = self._load_chunk(index)
+            blocks.append(chunk[max(start - offset, 0) : stop - offset])
+        return np.concatenate(blocks)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+    def _chunk_path(self, index):
+        suffix = ".npz" if self._meta["compressed"] else ".npy"
+        return os.path.join(self._path, f"boxes.{index:08d}{suffix}")
+
+    def _chunk_files(self):
+        return sorted(glob.glob(os.path.join(self._path, "boxes.*.np[yz]")))
+
+    def _load_chunk(self, index):
+        if self._meta["compressed"]:
+            with np.load(self._chunk_path(index)) as archive:
+                return archive["boxes"]
+        return np.load(self._chunk_path(index), mmap_mode="r")
+
+    def _save_chunk(self, index, entries):
+        # Write to a temporary file first, readers never see partial chunks
+        path = self._chunk_path(index)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            if self._meta["compressed"]:
+                np.savez_compressed(f, boxes=entries)
+            else:
+                np.save(f, entries)
+        os.replace(tmp_path, path)
+
+    def _write_meta(self):
+        tmp_path = f"{self._meta_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self._meta, f)
+        os.replace(tmp_path, self._meta_path)
@@ -157,3 +157,562 @@ class TestBox:
                 list(box.bravais_parameters), [a, b, c, alpha, beta, gamma]
             )
         )
+
+    @pytest.mark.parametrize(
+        "lengths, angles",
+        [
+            ([2, 3, 4], [90, 90, 90]),
+            ([3, 4, 5], [90, 90, 120]),
+            ([3, 6, 7], [97, 99, 120]),
+        ],
+    )
+    def test_wrap(self, lengths, angles):
+        box = molbox.Box(lengths=lengths, angles=angles)
+        rng = np.random.default_rng(12)
+        positions = rng.uniform(-20, 20, size=(1000, 3))
+        wrapped = box.wrap(positions)
+
+        frac = wrapped @ np.linalg.inv(box.vectors)
+        assert np.all(frac >= -1e-12)
+        assert np.all(frac < 1)
+        images = (positions - wrapped) @ np.linalg.inv(box.vectors)
+        assert np.allclose(images, np.round(images))
+        # Wrapping is idempotent
+        assert np.allclose(box.wrap(wrapped), wrapped)
+
+    @pytest.mark.parametrize("dtype", [np.float64, np.float32])
+    def test_wrap_tiny_negative(self, dtype):
+        box = molbox.Box(lengths=[2, 3, 4])
+        positions = np.asarray([[-1e-17, -1e-30, 0.0]], dtype=dtype)
+        wrapped = box.wrap(positions)
+        assert np.all(wrapped == 0.0)
+
+    def test_wrap_in_place(self):
+        box = molbox.Box(lengths=[3, 4, 5], angles=[90, 90, 120])
+        positions = np.asarray([[4.0, -1.0, 11.0], [0.5, 0.5, 0.5]])
+        expected = box.wrap(positions)
+        out = box.wrap(positions, out=positions)
+        assert out is positions
+        assert np.allclose(positions, expected)
+        assert np.allclose(positions[1], [0.5, 0.5, 0.5])
+
+    def test_wrap_float32(self):
+        box = molbox.Box(lengths=[2, 2, 2])
+        positions = np.asarray([[2.5, -0.5, 4.25]], dtype=np.float32)
+        wrapped = box.wrap(positions)
+        assert wrapped.dtype == np.float32
+        assert np.allclose(wrapped, [[0.5, 1.5, 0.25]])
+        assert np.allclose(box.wrap([2.5, -0.5, 4.25]), [0.5, 1.5, 0.25])
+
+    def test_wrap_bad_out(self):
+        box = molbox.Box(lengths=[2, 2, 2])
+        with pytest.raises(BoxError, match=r"does not match"):
+            box.wrap(np.zeros((3, 3)), out=np.zeros((2, 3)))
+
+    @staticmethod
+    def _brute_force_minimum_image(box, dr):
+        offsets = np.array(
+            [
+                (i, j, k)
+                for i in range(-4, 5)
+                for j in range(-4, 5)
+                for k in range(-4, 5)
+            ]
+        )
+        candidates = dr[:, np.newaxis, :] + offsets @ box.vectors
+        nearest = np.argmin(np.linalg.norm(candidates, axis=-1), axis=1)
+        return candidates[np.arange(len(dr)), nearest]
+
+    @pytest.mark.parametrize(
+        "lengths, angles",
+        [
+            ([2, 3, 4], [90, 90, 90]),
+            ([3, 4, 5], [90, 90, 120]),
+            ([3, 6, 7], [97, 99, 120]),
+            ([4, 4, 4], [60, 60, 60]),
+        ],
+    )
+    def test_minimum_image(self, lengths, angles):
+        box = molbox.Box(lengths=lengths, angles=angles)
+        rng = np.random.default_rng(7)
+        dr = rng.uniform(-6, 6, size=(2000, 3))
+        expected = self._brute_force_minimum_image(box, dr)
+        result = box.minimum_image(dr)
+        assert np.allclose(
+            np.linalg.norm(result, axis=-1), np.linalg.norm(expected, axis=-1)
+        )
+        # Minimum image displacements differ by lattice vectors
+        images = (dr - result) @ np.linalg.inv(box.vectors)
+        assert np.allclose(images, np.round(images))
+
+    def test_minimum_image_leading_dims(self):
+        box = molbox.Box(lengths=[3, 4, 5], angles=[90, 90, 120])
+        rng = np.random.default_rng(3)
+        dr = rng.uniform(-10, 10, size=(4, 5, 3))
+        result = box.minimum_image(dr)
+        assert result.shape == (4, 5, 3)
+        assert np.allclose(
+            result.reshape(-1, 3), box.minimum_image(dr.reshape(-1, 3))
+        )
+        assert np.allclose(box.minimum_image(dr[0, 0]), result[0, 0])
+
+    @pytest.mark.parametrize(
+        "lengths, angles",
+        [([2, 3, 4], [90, 90, 90]), ([3, 6, 7], [97, 99, 120])],
+    )
+    def test_distances(self, lengths, angles):
+        box = molbox.Box(lengths=lengths, angles=angles)
+        rng = np.random.default_rng(5)
+        a = box.wrap(rng.uniform(0, 10, size=(50, 3)))
+        b = box.wrap(rng.uniform(0, 10, size=(30, 3)))
+
+        dr = (b[np.newaxis, :, :] - a[:, np.newaxis, :]).reshape(-1, 3)
+        expected = np.linalg.norm(
+            self._brute_force_minimum_image(box, dr), axis=-1
+        ).reshape(50, 30)
+        assert np.allclose(box.distances(a, b), expected)
+        assert np.allclose(box.distances(a, b, chunk_size=7), expected)
+
+        self_dist = box.distances(a)
+        assert self_dist.shape == (50, 50)
+        assert np.allclose(np.diagonal(self_dist), 0.0)
+        assert np.allclose(self_dist, self_dist.T)
+
+        pairs = np.array([[0, 1], [4, 29], [49, 0]])
+        assert np.allclose(
+            box.distances(a, b, pairs=pairs, chunk_size=2),
+            expected[pairs[:, 0], pairs[:, 1]],
+        )
+        assert np.allclose(box.distances(a, pairs=[[0, 1]]), self_dist[0, 1])
+
+    @pytest.mark.parametrize(
+        "lengths, angles",
+        [([2, 3, 4], [90, 90, 90]), ([3, 6, 7], [97, 99, 120])],
+    )
+    def test_derived_matrices(self, lengths, angles):
+        box = molbox.Box(lengths=lengths, angles=angles)
+        vectors = box.vectors
+        assert np.allclose(box.inverse_vectors @ vectors, np.eye(3))
+        assert np.allclose(box.metric_tensor, vectors @ vectors.T)
+        assert np.allclose(vectors @ box.reciprocal_vectors.T, np.eye(3))
+        assert np.isclose(box.volume, abs(np.linalg.det(vectors)))
+        a, b, c = vectors
+        assert np.isclose(box.volume, np.dot(a, np.cross(b, c)))
+
+    def test_derived_matrices_cached(self):
+        box = molbox.Box(lengths=[3, 6, 7], angles=[97, 99, 120])
+        inverse = box.inverse_vectors
+        assert box.inverse_vectors is inverse
+        assert box.metric_tensor is box.metric_tensor
+        assert box.reciprocal_vectors is box.reciprocal_vectors
+        with pytest.raises(ValueError):
+            inverse[0, 0] = 1.0
+
+        box.precision = 3
+        assert box.inverse_vectors is not inverse
+        assert np.allclose(box.inverse_vectors, inverse)
+
+    @pytest.mark.parametrize(
+        "lengths, angles",
+        [([2, 3, 4], [90, 90, 90]), ([3, 6, 7], [97, 99, 120])],
+    )
+    def test_fractional_cartesian(self, lengths, angles):
+        box = molbox.Box(lengths=lengths, angles=angles)
+        rng = np.random.default_rng(9)
+        xyz = rng.uniform(-10, 10, size=(20, 10, 3))
+        frac = box.to_fractional(xyz)
+        assert frac.shape == xyz.shape
+        assert np.allclose(frac, xyz @ np.linalg.inv(box.vectors))
+        assert np.allclose(box.to_cartesian(frac), xyz)
+        assert np.allclose(box.to_cartesian([1, 0, 0]), box.vectors[0])
+        assert np.allclose(box.to_cartesian([1, 1, 1]), box.vectors.sum(0))
+
+    def test_fractional_cartesian_in_place(self):
+        box = molbox.Box(lengths=[3, 6, 7], angles=[97, 99, 120])
+        rng = np.random.default_rng(10)
+        xyz = rng.uniform(-10, 10, size=(100, 3)).astype(np.float32)
+        expected = xyz @ np.linalg.inv(box.vectors)
+        coords = xyz.copy()
+        assert box.to_fractional(coords, out=coords) is coords
+        assert coords.dtype == np.float32
+        assert np.allclose(coords, expected, atol=1e-5)
+        assert box.to_cartesian(coords, out=coords) is coords
+        assert np.allclose(coords, xyz, atol=1e-4)
+
+    def test_bad_coordinates_shape(self):
+        box = molbox.Box(lengths=[2, 2, 2])
+        with pytest.raises(BoxError, match=r"must be of shape"):
+            box.to_fractional(np.zeros((3, 2)))
+
+    def test_raw_parameters(self):
+        box = molbox.Box(lengths=[3, 6, 7], angles=[97, 99, 120], precision=2)
+        raw = box.raw
+        assert len(raw) == 9
+        assert np.allclose(raw.angles, [97, 99, 120], atol=0.1)
+        assert raw.lengths == (raw.Lx, raw.Ly, raw.Lz)
+        assert raw.tilt_factors == (raw.xy, raw.xz, raw.yz)
+        assert raw.lengths != box.lengths
+        assert box.lengths == tuple(round(length, 2) for length in raw.lengths)
+        assert box.angles == tuple(round(angle, 2) for angle in raw.angles)
+        assert box.tilt_factors == tuple(round(t, 2) for t in raw.tilt_factors)
+
+    def test_precision_change(self):
+        box = molbox.Box(lengths=[3, 6, 7], angles=[97, 99, 120], precision=2)
+        raw = box.raw
+        box.precision = 4
+        assert box.raw is raw
+        assert box.Lx == round(raw.Lx, 4)
+        assert box.angles == tuple(round(angle, 4) for angle in raw.angles)
+
+    def test_rounded_parameters_stored(self):
+        box = molbox.Box(lengths=[3, 6, 7], angles=[97, 99, 120], precision=2)
+        lengths = box.lengths
+        angles = box.angles
+        tilt_factors = box.tilt_factors
+        assert box.lengths is lengths
+        assert box.angles is angles
+        assert box.tilt_factors is tilt_factors
+        box.precision = 4
+        assert box.lengths is not lengths
+        assert box.angles is not angles
+        assert box.tilt_factors is not tilt_factors
+        assert box.lengths is box.lengths
+        assert box.lengths == tuple(round(x, 4) for x in box.raw.lengths)
+
+    @pytest.mark.parametrize(
+        "lengths, angles",
+        [([2, 3, 4], [90, 90, 90]), ([3, 6, 7], [97, 99, 120])],
+    )
+    def test_from_reduced_vectors(self, lengths, angles):
+        box = molbox.Box(lengths=lengths, angles=angles)
+        fast = molbox.Box.from_reduced_vectors(box.vectors)
+        assert np.allclose(fast.vectors, box.vectors)
+        assert fast.lengths == box.lengths
+        assert fast.angles == box.angles
+        assert fast.tilt_factors == box.tilt_factors
+
+        rotated = box.vectors[:, [1, 2, 0]]
+        validated = molbox.Box.from_reduced_vectors(rotated, validate=True)
+        assert np.allclose(
+            validated.vectors, molbox.Box.from_vectors(rotated).vectors
+        )
+
+    def test_readonly_vectors(self):
+        box = molbox.Box(lengths=[2, 3, 4])
+        volume = box.volume
+        with pytest.raises(ValueError):
+            box.vectors[:] *= 3
+        with pytest.raises(ValueError):
+            box.vectors[0, 0] = 1.0
+        assert box.volume == volume
+        assert np.allclose(box.vectors, np.diag([2, 3, 4]))
+
+    def test_slots(self):
+        box = molbox.Box(lengths=[2, 3, 4])
+        assert not hasattr(box, "__dict__")
+        with pytest.raises(AttributeError):
+            box.foo = 1
+
+    def test_memory_footprint(self):
+        import tracemalloc
+
+        n_boxes = 2000
+        tracemalloc.start()
+        try:
+            start = tracemalloc.get_traced_memory()[0]
+            boxes = [
+                molbox.Box([2 + i * 1e-3, 3, 4], [80, 95, 100])
+                for i in range(n_boxes)
+            ]
+            created = tracemalloc.get_traced_memory()[0]
+            for box in boxes:
+                box.lengths
+            accessed = tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+        assert (created - start) / n_boxes < 400
+        # Raw and rounded parameters are both stored once read
+        assert (accessed - start) / n_boxes < 1200
+
+    def test_pickle(self):
+        import pickle
+
+        box = molbox.Box(lengths=[3, 6, 7], angles=[97, 99, 120], precision=4)
+        loaded = pickle.loads(pickle.dumps(box))
+        assert np.allclose(loaded.vectors, box.vectors)
+        assert loaded.precision == 4
+        assert loaded.angles == box.angles
+
+    def test_replicate_box(self):
+        box = molbox.Box(lengths=[3, 6, 7], angles=[97, 99, 120])
+        supercell = box.replicate(2, 3, 4)
+        assert isinstance(supercell, molbox.Box)
+        assert np.allclose(supercell.lengths, [6, 18, 28], atol=1e-4)
+        assert np.allclose(supercell.angles, box.angles)
+        assert np.isclose(supercell.volume, 24 * box.volume)
+
+    def test_replicate_positions(self):
+        box = molbox.Box(lengths=[3, 6, 7], angles=[97, 99, 120])
+        positions = np.array([[0.1, 0.2, 0.3], [1.0, 1.0, 1.0]])
+        (supercell, tiled) = box.replicate(2, 1, 3, positions=positions)
+        assert tiled.shape == (12, 3)
+        assert np.allclose(tiled[:2], positions)
+        assert np.allclose(tiled[2:4], positions + box.vectors[2])
+        assert np.allclose(
+            tiled[-2:], positions + box.vectors[0] + 2 * box.vectors[2]
+        )
+        # All tiled positions are distinct once wrapped into the supercell
+        wrapped = supercell.wrap(tiled)
+        dist = supercell.distances(wrapped)
+        assert np.all(dist[np.triu_indices(12, k=1)] > 0.1)
+
+    @pytest.mark.parametrize("images_per_block", [1, 4, 100])
+    def test_iter_replicate(self, images_per_block):
+        box = molbox.Box(lengths=[2, 3, 4], angles=[90, 90, 120])
+        positions = np.random.default_rng(0).uniform(0, 2, size=(5, 3))
+        positions = positions.astype(np.float32)
+        (_, expected) = box.replicate(3, 2, 2, positions=positions)
+        blocks = list(
+            box.iter_replicate(
+                3, 2, 2, positions, images_per_block=images_per_block
+            )
+        )
+        assert len(blocks) == -(-12 // images_per_block)
+        assert blocks[0].dtype == np.float32
+        assert np.allclose(np.concatenate(blocks), expected)
+
+    @pytest.mark.parametrize("counts", [(0, 1, 1), (1, -2, 1), (1.5, 1, 1)])
+    def test_replicate_bad_counts(self, counts):
+        box = molbox.Box(lengths=[2, 3, 4])
+        with pytest.raises(BoxError, match=r"positive integers"):
+            box.replicate(*counts)
+
+    @pytest.mark.parametrize("dtype", [np.float32, np.float64])
+    def test_sample_uniform(self, dtype):
+        box = molbox.Box(lengths=[3, 6, 7], angles=[97, 99, 120])
+        points = box.sample_uniform(10000, rng=0, dtype=dtype)
+        assert points.shape == (10000, 3)
+        assert points.dtype == dtype
+        frac = box.to_fractional(points.astype(np.float64))
+        assert np.all((frac >= -1e-6) & (frac < 1.0 + 1e-6))
+        assert np.allclose(frac.mean(axis=0), 0.5, atol=0.02)
+        assert np.array_equal(
+            points, box.sample_uniform(10000, rng=0, dtype=dtype)
+        )
+
+    @pytest.mark.parametrize(
+        "lengths, angles",
+        [([2, 3, 4], [90, 90, 90]), ([3, 6, 7], [97, 99, 120])],
+    )
+    def test_derived_geometry(self, lengths, angles):
+        box = molbox.Box(lengths=lengths, angles=angles)
+        (a, b, c) = box.vectors
+        areas = [
+            np.linalg.norm(np.cross(b, c)),
+            np.linalg.norm(np.cross(c, a)),
+            np.linalg.norm(np.cross(a, b)),
+        ]
+        assert np.allclose(box.face_areas, areas)
+        # Plane spacings are the inverse norms of the reciprocal vectors
+        assert np.allclose(
+            box.perpendicular_widths,
+            1.0 / np.linalg.norm(box.reciprocal_vectors, axis=1),
+        )
+        assert np.isclose(box.max_cutoff, 0.5 * min(box.perpendicular_widths))
+        assert box.face_areas is box.face_areas
+
+    def test_orthorhombic_geometry(self):
+        box = molbox.Box(lengths=[2, 3, 4])
+        assert np.isclose(box.volume, 24.0)
+        assert np.allclose(box.face_areas, [12, 8, 6])
+        assert np.allclose(box.perpendicular_widths, [2, 3, 4])
+        assert np.isclose(box.max_cutoff, 1.0)
+
+    @pytest.mark.parametrize(
+        "tilt_factors",
+        [[5.3, -3.1, 7.2], [0.0, 4.0, 0.0], [-9.0, 0.0, 2.5]],
+    )
+    def test_reduce(self, tilt_factors):
+        box = molbox.Box.from_lengths_tilt_factors([2, 3, 4], tilt_factors)
+        (reduced, transform) = box.reduce()
+        assert transform.dtype.kind == "i"
+        assert round(np.linalg.det(transform)) == 1
+        assert np.isclose(reduced.volume, box.volume, rtol=1e-5)
+        self._check_reduced_bounds(reduced)
+        # Same lattice: the metric tensors agree up to the transformation
+        assert np.allclose(
+            reduced.metric_tensor,
+            transform @ box.metric_tensor @ transform.T,
+            atol=1e-4,
+        )
+        # Remapped coordinates keep their true minimum image distances,
+        # which need many images of the sheared box to be found by brute force
+        positions = box.sample_uniform(20, rng=0)
+        frac = box.to_fractional(positions) @ np.linalg.inv(transform)
+        new_positions = reduced.wrap(reduced.to_cartesian(frac))
+        offsets = np.stack(
+            np.meshgrid(*[np.arange(-12, 13)] * 3, indexing="ij"), axis=-1
+        ).reshape(-1, 3)
+        images = offsets @ box.vectors
+        dr = positions[:, np.newaxis] - positions[np.newaxis]
+        expected = np.linalg.norm(dr[:, :, np.newaxis] + images, axis=-1).min(
+            axis=-1
+        )
+        assert np.allclose(
+            reduced.distances(new_positions), expected, atol=1e-4
+        )
+
+    @staticmethod
+    def _check_reduced_bounds(box):
+        ((ax, _, _), (bx, by, _), (cx, cy, _)) = box.vectors
+        tol = 1e-5
+        assert abs(bx) <= 0.5 * ax + tol
+        assert abs(cx) <= 0.5 * ax + tol
+        assert abs(cy) <= 0.5 * by + tol
+
+    def test_reduce_random(self):
+        rng = np.random.default_rng(42)
+        for _ in range(500):
+            lengths = rng.uniform(1, 10, size=3)
+            tilt_factors = rng.uniform(-5, 5, size=3)
+            box = molbox.Box.from_lengths_tilt_factors(lengths, tilt_factors)
+            (reduced, transform) = box.reduce()
+            assert round(np.linalg.det(transform)) == 1
+            assert np.isclose(reduced.volume, box.volume, rtol=1e-4)
+            self._check_reduced_bounds(reduced)
+            assert np.allclose(
+                reduced.metric_tensor,
+                transform @ box.metric_tensor @ transform.T,
+                atol=1e-3,
+            )
+
+    def test_reduce_lammps_bounds(self):
+        box = molbox.Box.from_lengths_tilt_factors(
+            [5.3, 8.5, 5.1], [-0.6, -4.4, -1.2]
+        )
+        (reduced, _) = box.reduce()
+        self._check_reduced_bounds(reduced)
+
+    def test_reduce_reduced_box(self):
+        box = molbox.Box(lengths=[3, 4, 5], angles=[80, 95, 100])
+        (reduced, transform) = box.reduce()
+        assert np.array_equal(transform, np.eye(3))
+        assert np.allclose(reduced.vectors, box.vectors)
+
+    def test_isclose(self):
+        box = molbox.Box(lengths=[3, 4, 5], angles=[80, 95, 100])
+        assert box.isclose(molbox.Box.from_vectors(box.vectors))
+        close = molbox.Box(lengths=[3, 4, 5.00001], angles=[80, 95, 100])
+        assert not box.isclose(close, rtol=0)
+        assert box.isclose(close, atol=1e-4)
+        with pytest.raises(BoxError, match="another Box"):
+            box.isclose(box.vectors)
+
+    def test_bytes_roundtrip(self):
+        box = molbox.Box(lengths=[3, 4, 5], angles=[80, 95, 100], precision=4)
+        data = box.to_bytes()
+        assert len(data) == 49
+        loaded = molbox.Box.from_bytes(data)
+        assert type(loaded) is molbox.Box
+        assert np.array_equal(loaded.vectors, box.vectors)
+        assert loaded.precision == 4
+        with pytest.raises(BoxError, match="49 bytes"):
+            molbox.Box.from_bytes(data[:-1])
+
+    def test_bytes_lowered_precision(self):
+        box = molbox.Box(lengths=[3, 4, 5], angles=[80, 95, 100])
+        box.precision = 2
+        loaded = molbox.Box.from_bytes(box.to_bytes())
+        assert np.array_equal(loaded.vectors, box.vectors)
+        assert loaded.lengths == box.lengths
+
+    def test_pickle_uses_bytes(self):
+        import pickle
+
+        box = molbox.Box(lengths=[3, 4, 5], angles=[80, 95, 100])
+        box.volume
+        assert box.__reduce__() == (molbox.Box.from_bytes, (box.to_bytes(),))
+        loaded = pickle.loads(pickle.dumps(box))
+        assert np.array_equal(loaded.vectors, box.vectors)
+        assert loaded.angles == box.angles
+
+
+class TestFrozenBox:
+    @pytest.fixture(autouse=True)
+    def initdir(self, tmpdir):
+        tmpdir.chdir()
+
+    def test_equality_and_hash(self):
+        box = molbox.FrozenBox(lengths=[3, 4, 5], angles=[80, 95, 100])
+        same = molbox.Box(lengths=[3, 4, 5], angles=[80, 95, 100]).freeze()
+        other = molbox.FrozenBox(lengths=[3, 4, 5.1], angles=[80, 95, 100])
+        assert box == same
+        assert hash(box) == hash(same)
+        assert box != other
+        assert len({box, same, other}) == 2
+        # Mutable boxes are not hashable, and never equal to frozen ones
+        mutable = molbox.Box(lengths=[3, 4, 5], angles=[80, 95, 100])
+        assert box != mutable
+        with pytest.raises(TypeError, match="unhashable"):
+            hash(mutable)
+
+    def test_precision(self):
+        box = molbox.FrozenBox.from_vectors(np.eye(3) * 2.0000001, precision=4)
+        assert box == molbox.FrozenBox(lengths=[2, 2, 2], precision=4)
+        assert box != molbox.FrozenBox(lengths=[2, 2, 2], precision=6)
+        with pytest.raises(BoxError, match="cannot be changed"):
+            box.precision = 2
+
+    def test_immutable_vectors(self):
+        box = molbox.FrozenBox(lengths=[2, 3, 4])
+        with pytest.raises(ValueError):
+            box.vectors[0, 0] = 1.0
+
+    def test_freeze(self):
+        box = molbox.Box(lengths=[2, 3, 4])
+        box.inverse_vectors
+        frozen = box.freeze()
+        assert isinstance(frozen, molbox.FrozenBox)
+        assert frozen.freeze() is frozen
+        assert np.array_equal(frozen.vectors, box.vectors)
+        assert frozen.inverse_vectors is box.inverse_vectors
+        # The mutable box is unaffected
+        box.precision = 2
+        assert frozen.precision == 6
+
+    def test_constructors_return_frozen(self):
+        box = molbox.FrozenBox.from_lengths_angles([2, 3, 4], [90, 90, 90])
+        assert isinstance(box, molbox.FrozenBox)
+        assert isinstance(box.replicate(2, 2, 2), molbox.FrozenBox)
+
+    def test_pickle(self):
+        import pickle
+
+        box = molbox.FrozenBox(lengths=[3, 4, 5], angles=[80, 95, 100])
+        loaded = pickle.loads(pickle.dumps(box))
+        assert loaded == box
+        assert not loaded.vectors.flags.writeable
+
+    def test_interner(self):
+        interner = molbox.BoxInterner(maxsize=2)
+        first = interner.intern(molbox.Box(lengths=[2, 2, 2]))
+        assert interner(molbox.Box(lengths=[2, 2, 2])) is first
+        assert (interner.hits, interner.misses) == (1, 1)
+        second = interner(molbox.Box(lengths=[3, 3, 3]))
+        # Touch the first box so the second one is the least recently used
+        interner(molbox.Box(lengths=[2, 2, 2]))
+        interner(molbox.Box(lengths=[4, 4, 4]))
+        assert len(interner) == 2
+        assert first in interner
+        assert second not in interner
+        interner.clear()
+        assert len(interner) == 0
+        assert (interner.hits, interner.misses) == (0, 0)
+        with pytest.raises(BoxError, match="positive"):
+            molbox.BoxInterner(maxsize=0)
+
+    def test_intern_box_shares_caches(self):
+        frames = [molbox.Box(lengths=[5, 5, 5]) for _ in range(3)]
+        boxes = [molbox.intern_box(box) for box in frames]
+        assert all(box is boxes[0] for box in boxes)
+        assert boxes[1].volume is boxes[2].volume
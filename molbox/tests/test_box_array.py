@@ -0,0 +1,176 @@
+import warnings
+
+import numpy as np
+import pytest
+
+import molbox
+from molbox.box import BoxError
+
+
+class TestBoxArray:
+    @pytest.fixture(autouse=True)
+    def initdir(self, tmpdir):
+        tmpdir.chdir()
+
+    @pytest.fixture
+    def lengths_angles(self):
+        lengths = [[1, 1, 1], [1, 5, 7], [3, 4, 5], [3, 6, 7]]
+        angles = [[90, 90, 90], [90, 90, 90], [90, 90, 120], [97, 99, 120]]
+        return np.asarray(lengths), np.asarray(angles)
+
+    def test_from_lengths_angles(self, lengths_angles):
+        (lengths, angles) = lengths_angles
+        boxes = molbox.BoxArray.from_lengths_angles(lengths, angles)
+        assert len(boxes) == 4
+        assert boxes.vectors.shape == (4, 3, 3)
+        for i, (length, angle) in enumerate(zip(lengths, angles)):
+            box = molbox.Box(lengths=length, angles=angle)
+            assert np.allclose(boxes.vectors[i], box.vectors)
+            assert np.allclose(boxes.lengths[i], box.lengths)
+            assert np.allclose(boxes.angles[i], box.angles)
+            assert np.allclose(boxes.tilt_factors[i], box.tilt_factors)
+
+    def test_default_angles(self):
+        boxes = molbox.BoxArray(lengths=[[1, 2, 3], [4, 5, 6]])
+        assert np.allclose(boxes.angles, 90.0)
+        assert np.allclose(boxes.tilt_factors, 0.0)
+
+    def test_mismatched_shapes(self):
+        with pytest.raises(BoxError, match=r"do not match"):
+            molbox.BoxArray(lengths=[[1, 1, 1]], angles=[[90, 90, 90]] * 2)
+
+    def test_from_vectors(self):
+        vectors = np.asarray(
+            [
+                [[1, 0, 0], [0, 1, 0], [0, 0, 1]],
+                [
+                    [0.5, np.sqrt(3) / 2, 0.0],
+                    [0.5, -np.sqrt(3) / 2, 0],
+                    [0, 0, 1],
+                ],
+                [[2, 0, 0], [-1.5, 2.59808, 0], [0, 0, 4]],
+            ]
+        )
+        with pytest.warns(UserWarning, match=r"left\-handed basis in 1"):
+            boxes = molbox.BoxArray.from_vectors(vectors)
+        for i, vecs in enumerate(vectors):
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                box = molbox.Box.from_vectors(vecs)
+            assert np.allclose(boxes.vectors[i], box.vectors)
+            assert np.allclose(boxes.angles[i], box.angles)
+
+    def test_colinear_vectors(self):
+        vectors = [
+            [[1, 0, 0], [0, 1, 0], [0, 0, 1]],
+            [[1, 0, 0], [5, 0, 0], [0, 0, 1]],
+        ]
+        with pytest.raises(BoxError, match=r"co\-linear"):
+            molbox.BoxArray.from_vectors(vectors)
+
+    def test_from_lengths_tilt_factors(self):
+        lengths = [[1, 1, 1], [3.0, 3.0, 1.0]]
+        tilt_factors = [[0.0, 0.0, 0.0], [-0.57735, 0.0, 0.0]]
+        boxes = molbox.BoxArray.from_lengths_tilt_factors(lengths, tilt_factors)
+        assert np.allclose(boxes.lengths, lengths)
+        assert np.allclose(boxes.tilt_factors, tilt_factors)
+        assert np.allclose(boxes.angles, [[90, 90, 90], [90, 90, 120]])
+
+    def test_indexing(self, lengths_angles):
+        (lengths, angles) = lengths_angles
+        boxes = molbox.BoxArray(lengths, angles, precision=4)
+        box = boxes[3]
+        assert isinstance(box, molbox.Box)
+        assert box.precision == 4
+        assert np.allclose(box.vectors, boxes.vectors[3])
+        assert np.allclose(box.angles, angles[3])
+
+        sub = boxes[1:3]
+        assert isinstance(sub, molbox.BoxArray)
+        assert len(sub) == 2
+        assert np.allclose(sub.angles, angles[1:3])
+        assert [b.lengths for b in sub] == [b.lengths for b in boxes][1:3]
+
+    def test_from_boxes(self, lengths_angles):
+        (lengths, angles) = lengths_angles
+        boxes = [molbox.Box(l, a, precision=5) for l, a in zip(lengths, angles)]
+        box_array = molbox.BoxArray.from_boxes(boxes)
+        assert box_array.precision == 5
+        assert np.allclose(box_array.vectors, [b.vectors for b in boxes])
+
+    def test_derived_geometry(self, lengths_angles):
+        (lengths, angles) = lengths_angles
+        boxes = molbox.BoxArray(lengths, angles)
+        assert boxes.volume.shape == (4,)
+        assert boxes.face_areas.shape == (4, 3)
+        assert boxes.perpendicular_widths.shape == (4, 3)
+        assert boxes.max_cutoff.shape == (4,)
+        for i, box in enumerate(boxes):
+            assert np.isclose(boxes.volume[i], box.volume)
+            assert np.allclose(boxes.face_areas[i], box.face_areas)
+            assert np.allclose(
+                boxes.perpendicular_widths[i], box.perpendicular_widths
+            )
+            assert np.isclose(boxes.max_cutoff[i], box.max_cutoff)
+        assert boxes.volume is boxes.volume
+        # Per-frame densities in a single vectorized call
+        assert np.allclose(100 / boxes.volume, [100 / b.volume for b in boxes])
+
+    def test_bravais_parameters(self, lengths_angles):
+        (lengths, angles) = lengths_angles
+        boxes = molbox.BoxArray(lengths, angles)
+        assert boxes.bravais_parameters.shape == (4, 6)
+        for (params, box) in zip(boxes.bravais_parameters, boxes):
+            assert np.allclose(params, box.bravais_parameters)
+
+    def test_unique_boxes(self, lengths_angles):
+        (lengths, angles) = lengths_angles
+        rng = np.random.default_rng(0)
+        picks = rng.integers(0, 4, size=1000)
+        noise = rng.uniform(-1e-5, 1e-5, size=(1000, 3))
+        boxes = molbox.BoxArray(
+            np.asarray(lengths, dtype=float)[picks] + noise,
+            np.asarray(angles, dtype=float)[picks],
+        )
+        (unique, index, inverse) = molbox.unique_boxes(boxes)
+        assert len(unique) == 4
+        assert inverse.shape == (1000,)
+        # Groups are numbered by first occurrence
+        assert np.all(np.diff(index) > 0)
+        assert inverse[0] == 0
+        for (i, box) in enumerate(boxes):
+            assert unique[inverse[i]].isclose(box, atol=1e-4)
+        _, first = np.unique(picks, return_index=True)
+        assert np.array_equal(index, np.sort(first))
+
+    def test_unique_boxes_from_boxes(self):
+        boxes = [
+            molbox.Box([2, 2, 2]),
+            molbox.Box([3, 3, 3]),
+            molbox.Box([2, 2, 2.0001]),
+        ]
+        (unique, index, inverse) = molbox.unique_boxes(boxes)
+        assert np.array_equal(index, [0, 1])
+        assert np.array_equal(inverse, [0, 1, 0])
+        (unique, index, inverse) = molbox.unique_boxes(
+            boxes, length_tolerance=1e-6
+        )
+        assert len(unique) == 3
+        with pytest.raises(BoxError, match="positive"):
+            molbox.unique_boxes(boxes, angle_tolerance=0)
+
+    def test_save_load(self, lengths_angles):
+        (lengths, angles) = lengths_angles
+        boxes = molbox.BoxArray(lengths, angles)
+        boxes.save("boxes.npy")
+        assert np.load("boxes.npy").shape == (4, 6)
+        loaded = molbox.BoxArray.load("boxes.npy")
+        assert np.array_equal(loaded.vectors, boxes.vectors)
+        assert np.allclose(loaded.angles, boxes.angles)
+        # The per-box binary records use the same layout
+        assert np.load("boxes.npy")[2].tobytes() == boxes[2].to_bytes()[:48]
+
+    def test_load_wrong_shape(self):
+        np.save("wrong.npy", np.zeros((4, 3)))
+        with pytest.raises(BoxError, match="N,6"):
+            molbox.BoxArray.load("wrong.npy")
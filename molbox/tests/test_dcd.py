@@ -0,0 +1,91 @@
+import struct
+
+import numpy as np
+import pytest
+
+import molbox
+from molbox.box import BoxError
+from molbox.formats import dcd
+
+
+def write_dcd(
+    filename, unitcells, n_atoms=4, n_fixed=0, endian="<", charmm=True
+):
+    """Write a DCD file with the given (N,6) unit cells, in the DCD order."""
+
+    def record(f, payload):
+        f.write(struct.pack(f"{endian}i", len(payload)))
+        f.write(payload)
+        f.write(struct.pack(f"{endian}i", len(payload)))
+
+    icntrl = [0] * 20
+    icntrl[0] = len(unitcells)
+    icntrl[8] = n_fixed
+    icntrl[10] = 1
+    icntrl[19] = 24 if charmm else 0
+    with open(filename, "wb") as f:
+        record(f, b"CORD" + struct.pack(f"{endian}20i", *icntrl))
+        record(f, struct.pack(f"{endian}i", 1) + b"test".ljust(80))
+        record(f, struct.pack(f"{endian}i", n_atoms))
+        if n_fixed:
+            free = np.arange(1, n_atoms - n_fixed + 1, dtype=f"{endian}i4")
+            record(f, free.tobytes())
+        for (i, cell) in enumerate(unitcells):
+            record(f, np.asarray(cell, dtype=f"{endian}f8").tobytes())
+            n = n_atoms if i == 0 else n_atoms - n_fixed
+            for _ in range(3):
+                record(f, np.full(n, float(i), dtype=f"{endian}f4").tobytes())
+
+
+class TestDcd:
+    @pytest.fixture(autouse=True)
+    def initdir(self, tmpdir):
+        tmpdir.chdir()
+
+    @pytest.fixture
+    def unitcells(self):
+        # (A, gamma, B, beta, alpha, C)
+        return [
+            [30.0, 90.0, 40.0, 90.0, 90.0, 50.0],
+            [31.0, 100.0, 41.0, 95.0, 80.0, 51.0],
+            [32.0, 120.0, 32.0, 90.0, 90.0, 52.0],
+        ]
+
+    @pytest.mark.parametrize("endian", ["<", ">"])
+    def test_read_dcd_boxes(self, unitcells, endian):
+        write_dcd("traj.dcd", unitcells, endian=endian)
+        raw = dcd.read_dcd_unitcells("traj.dcd")
+        assert raw.shape == (3, 6)
+        assert np.allclose(raw, unitcells)
+        boxes = dcd.read_dcd_boxes("traj.dcd")
+        assert isinstance(boxes, molbox.BoxArray)
+        assert np.allclose(boxes.lengths[1], [31, 41, 51])
+        assert np.allclose(boxes.angles[1], [80, 95, 100])
+        assert np.allclose(boxes.angles[2], [90, 90, 120])
+
+    def test_cosines(self, unitcells):
+        cosines = np.array(unitcells)
+        cosines[:, [1, 3, 4]] = np.cos(np.radians(cosines[:, [1, 3, 4]]))
+        write_dcd("traj.dcd", cosines)
+        boxes = dcd.read_dcd_boxes("traj.dcd")
+        assert np.allclose(boxes.angles[1], [80, 95, 100])
+
+    def test_fixed_atoms(self, unitcells):
+        write_dcd("traj.dcd", unitcells, n_atoms=10, n_fixed=3)
+        boxes = dcd.read_dcd_boxes("traj.dcd")
+        assert np.allclose(boxes.lengths[:, 0], [30, 31, 32])
+
+    def test_truncated_frame(self, unitcells):
+        write_dcd("traj.dcd", unitcells)
+        with open("traj.dcd", "rb+") as f:
+            f.truncate(f.seek(0, 2) - 10)
+        assert len(dcd.read_dcd_boxes("traj.dcd")) == 2
+
+    def test_errors(self, unitcells):
+        write_dcd("traj.dcd", unitcells, charmm=False)
+        with pytest.raises(BoxError, match="does not store unit cells"):
+            dcd.read_dcd_boxes("traj.dcd")
+        with open("not.dcd", "wb") as f:
+            f.write(b"\0" * 100)
+        with pytest.raises(BoxError, match="not a DCD file"):
+            dcd.read_dcd_boxes("not.dcd")
@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+import molbox
+from molbox.box import BoxError
+from molbox.formats import gro
+
+
+def write_gro(filename, box_lines, n_atoms=3):
+    with open(filename, "w") as f:
+        for (i, box_line) in enumerate(box_lines):
+            f.write(f"frame {i}, t= {i}.0\n{n_atoms:5d}\n")
+            for j in range(n_atoms):
+                f.write(
+                    f"{1:5d}{'SOL':<5s}{'OW':>5s}{j + 1:5d}"
+                    f"{0.1:8.3f}{0.2:8.3f}{0.3:8.3f}\n"
+                )
+            f.write(box_line + "\n")
+
+
+class TestGro:
+    @pytest.fixture(autouse=True)
+    def initdir(self, tmpdir):
+        tmpdir.chdir()
+
+    @pytest.fixture
+    def boxes(self):
+        return molbox.BoxArray(
+            lengths=[[3, 4, 5], [3, 4, 5], [2, 2, 2]],
+            angles=[[80, 95, 100], [90, 90, 90], [60, 60, 90]],
+        )
+
+    def test_roundtrip(self, boxes):
+        lines = gro.format_gro_boxes(boxes)
+        assert len(lines[0].split()) == 9
+        assert len(lines[1].split()) == 3
+        write_gro("conf.gro", lines)
+        read = gro.read_gro_boxes("conf.gro")
+        assert isinstance(read, molbox.BoxArray)
+        assert np.allclose(read.vectors, boxes.vectors, atol=1e-5)
+        for (box, expected) in zip(gro.iter_gro_boxes("conf.gro"), boxes):
+            assert box.isclose(expected, atol=1e-5)
+
+    def test_format_gro_box(self):
+        box = molbox.Box(lengths=[3, 4, 5])
+        assert gro.format_gro_box(box) == "   3.00000   4.00000   5.00000"
+
+    def test_triclinic_line(self):
+        write_gro(
+            "conf.gro",
+            [
+                "   5.00000   5.00000   3.53553   0.00000   0.00000   0.00000"
+                "   0.00000   0.00000   3.53553"
+            ],
+            n_atoms=10,
+        )
+        (box,) = gro.iter_gro_boxes("conf.gro")
+        assert np.allclose(box.vectors[2], [0.0, 3.53553, 3.53553])
+        assert np.allclose(box.angles, [45, 90, 90], atol=1e-3)
+
+    def test_invalid_box_line(self):
+        write_gro("conf.gro", ["   5.00000   5.00000"])
+        with pytest.raises(BoxError, match="3 or 9 values"):
+            gro.read_gro_boxes("conf.gro")
+
+    def test_empty_title(self):
+        with open("conf.gro", "w") as f:
+            f.write(
+                "\n    2\n"
+                "    1SOL     OW    1   0.100   0.200   0.300\n"
+                "    1SOL    HW1    2   0.200   0.200   0.300\n"
+                "   3.00000   4.00000   5.00000\n"
+                "\n    1\n"
+                "    1SOL     OW    1   0.100   0.200   0.300\n"
+                "   2.00000   2.00000   2.00000\n\n\n"
+            )
+        boxes = gro.read_gro_boxes("conf.gro")
+        assert np.allclose(boxes.lengths, [[3, 4, 5], [2, 2, 2]])
@@ -0,0 +1,50 @@
+import subprocess
+import sys
+
+import pytest
+
+import molbox
+
+# Generous budget for `import molbox`, including the import of numpy, meant
+# to catch accidental heavy imports (e.g. versioneer calling git) rather than
+# to measure small regressions, see the asv benchmarks for that.
+IMPORT_TIME_BUDGET = 2.0
+
+
+def _run_python(code):
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return result.stdout.strip()
+
+
+class TestImport:
+    def test_version(self):
+        assert isinstance(molbox.__version__, str)
+        assert molbox.__version__
+        assert "__git_revision__" in dir(molbox)
+
+    def test_missing_attribute(self):
+        with pytest.raises(AttributeError, match=r"has no attribute"):
+            molbox.not_an_attribute
+
+    def test_version_is_lazy(self):
+        code = (
+            "import sys, molbox; "
+            "print('molbox._version' in sys.modules); "
+            "molbox.__version__; "
+            "print('molbox._version' in sys.modules)"
+        )
+        assert _run_python(code).split() == ["False", "True"]
+
+    def test_import_time(self):
+        code = (
+            "import time; start = time.perf_counter(); import molbox; "
+            "print(time.perf_counter() - start)"
+        )
+        # Best of a few runs to be robust against a busy machine
+        elapsed = min(float(_run_python(code)) for _ in range(3))
+        assert elapsed < IMPORT_TIME_BUDGET
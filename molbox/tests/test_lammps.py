@@ -0,0 +1,123 @@
+import numpy as np
+import pytest
+
+import molbox
+from molbox.box import BoxError
+from molbox.formats import _utils, lammps
+
+
+def write_dump(filename, frames, n_atoms=5, triclinic=True):
+    """Write a dump file, frames are (timestep, lx, ly, lz, xy, xz, yz)."""
+    with open(filename, "w") as f:
+        for (timestep, lx, ly, lz, xy, xz, yz) in frames:
+            f.write(f"ITEM: TIMESTEP\n{timestep}\n")
+            f.write(f"ITEM: NUMBER OF ATOMS\n{n_atoms}\n")
+            (xlo, ylo, zlo) = (-0.5 * lx, 1.0, 2.0)
+            if triclinic:
+                f.write("ITEM: BOX BOUNDS xy xz yz pp pp pp\n")
+                xlo_b = xlo + min(0.0, xy, xz, xy + xz)
+                xhi_b = xlo + lx + max(0.0, xy, xz, xy + xz)
+                ylo_b = ylo + min(0.0, yz)
+                yhi_b = ylo + ly + max(0.0, yz)
+                f.write(f"{xlo_b} {xhi_b} {xy}\n")
+                f.write(f"{ylo_b} {yhi_b} {xz}\n")
+                f.write(f"{zlo} {zlo + lz} {yz}\n")
+            else:
+                f.write("ITEM: BOX BOUNDS pp pp pp\n")
+                f.write(f"{xlo} {xlo + lx}\n{ylo} {ylo + ly}\n")
+                f.write(f"{zlo} {zlo + lz}\n")
+            f.write("ITEM: ATOMS id type x y z\n")
+            for i in range(n_atoms):
+                f.write(f"{i + 1} 1 0.1 0.2 0.3\n")
+
+
+class TestLammps:
+    @pytest.fixture(autouse=True)
+    def initdir(self, tmpdir):
+        tmpdir.chdir()
+
+    @pytest.fixture
+    def frames(self):
+        return [
+            (0, 10.0, 8.0, 6.0, 2.0, -1.0, 1.5),
+            (100, 10.5, 8.2, 6.1, -2.5, 1.0, -0.5),
+            (200, 11.0, 8.4, 6.2, 0.0, 0.0, 0.0),
+        ]
+
+    def test_iter_dump_boxes(self, frames):
+        write_dump("dump.lammpstrj", frames)
+        boxes = list(lammps.iter_dump_boxes("dump.lammpstrj"))
+        assert [timestep for (timestep, _) in boxes] == [0, 100, 200]
+        (_, box) = boxes[0]
+        assert isinstance(box, molbox.Box)
+        assert np.allclose(box.vectors, [[10, 0, 0], [2, 8, 0], [-1, 1.5, 6]])
+        (_, box) = boxes[1]
+        assert np.allclose(
+            box.vectors, [[10.5, 0, 0], [-2.5, 8.2, 0], [1, -0.5, 6.1]]
+        )
+
+    def test_read_dump_boxes(self, frames):
+        write_dump("dump.lammpstrj", frames, n_atoms=50)
+        (timesteps, boxes) = lammps.read_dump_boxes("dump.lammpstrj")
+        assert np.array_equal(timesteps, [0, 100, 200])
+        assert isinstance(boxes, molbox.BoxArray)
+        for ((_, box), expected) in zip(
+            lammps.iter_dump_boxes("dump.lammpstrj"), boxes
+        ):
+            assert np.array_equal(box.vectors, expected.vectors)
+        assert np.allclose(boxes.volume, [480.0, 10.5 * 8.2 * 6.1, 572.88])
+
+    def test_orthorhombic_dump(self, frames):
+        write_dump("dump.lammpstrj", frames, triclinic=False)
+        (_, boxes) = lammps.read_dump_boxes("dump.lammpstrj")
+        assert np.allclose(boxes.lengths[0], [10, 8, 6])
+        assert np.allclose(boxes.angles, 90.0)
+
+    def test_skip_across_chunks(self, frames, monkeypatch):
+        monkeypatch.setattr(_utils, "_SKIP_CHUNK_SIZE", 7)
+        write_dump("dump.lammpstrj", frames, n_atoms=13)
+        (timesteps, boxes) = lammps.read_dump_boxes("dump.lammpstrj")
+        assert np.array_equal(timesteps, [0, 100, 200])
+        assert np.allclose(boxes.lengths[:, 0], [10.0, 10.5, 11.0])
+
+    def test_missing_final_newline(self, frames):
+        write_dump("dump.lammpstrj", frames)
+        with open("dump.lammpstrj", "rb+") as f:
+            f.truncate(f.seek(0, 2) - 1)
+        (timesteps, _) = lammps.read_dump_boxes("dump.lammpstrj")
+        assert np.array_equal(timesteps, [0, 100, 200])
+
+    def test_truncated_dump(self, frames):
+        write_dump("dump.lammpstrj", frames, n_atoms=5)
+        with open("dump.lammpstrj") as f:
+            lines = f.readlines()
+        with open("dump.lammpstrj", "w") as f:
+            f.writelines(lines[:-2])
+        with pytest.raises(BoxError, match="Unexpected end of file"):
+            lammps.read_dump_boxes("dump.lammpstrj")
+
+    def test_read_data_box(self):
+        with open("system.data", "w") as f:
+            f.write(
+                "LAMMPS data file\n\n"
+                "2 atoms\n1 atom types\n\n"
+                "-5.0 5.0 xlo xhi\n"
+                "0.0 8.0 ylo yhi  # comment\n"
+                "1.0 7.0 zlo zhi\n"
+                "2.0 -1.0 1.5 xy xz yz\n\n"
+                "Atoms # atomic\n\n"
+                "1 1 0.0 0.0 0.0\n"
+                "2 1 1.0 1.0 1.0\n"
+            )
+        box = lammps.read_data_box("system.data")
+        assert np.allclose(box.vectors, [[10, 0, 0], [2, 8, 0], [-1, 1.5, 6]])
+
+    def test_read_data_box_errors(self):
+        with open("system.data", "w") as f:
+            f.write("LAMMPS data file\n\n-5.0 5.0 xlo xhi\n\nAtoms\n")
+        with pytest.raises(BoxError, match="Incomplete"):
+            lammps.read_data_box("system.data")
+        with open("system.data", "w") as f:
+            f.write("LAMMPS data file\n\n1.0 0.0 0.0 avec\n\nAtoms\n")
+        with pytest.raises(BoxError, match="General triclinic"):
+            lammps.read_data_box("system.data")
@@ -0,0 +1,202 @@
+import numpy as np
+import pytest
+
+import molbox
+from molbox.box import BoxError
+from molbox.neighbors import CellList, VerletList, neighbor_list
+
+
+def _brute_force_pairs(box, positions, cutoff):
+    dist = box.distances(positions)
+    (i, j) = np.nonzero(dist < cutoff)
+    keep = i < j
+    return set(zip(i[keep], j[keep]))
+
+
+def _csr_to_pairs(indptr, indices):
+    counts = np.diff(indptr)
+    i = np.repeat(np.arange(len(counts)), counts)
+    return set(zip(i, indices))
+
+
+class TestNeighbors:
+    @pytest.fixture(autouse=True)
+    def initdir(self, tmpdir):
+        tmpdir.chdir()
+
+    @pytest.mark.parametrize(
+        "lengths, angles, cutoff",
+        [
+            ([10, 10, 10], [90, 90, 90], 1.5),
+            ([10, 12, 9], [90, 90, 120], 1.2),
+            ([8, 9, 10], [80, 100, 110], 1.7),
+            ([5, 5, 5], [90, 90, 90], 2.4),
+        ],
+    )
+    def test_neighbor_list(self, lengths, angles, cutoff):
+        box = molbox.Box(lengths=lengths, angles=angles)
+        rng = np.random.default_rng(11)
+        positions = rng.uniform(-10, 20, size=(400, 3))
+        expected = _brute_force_pairs(box, positions, cutoff)
+
+        (indptr, indices, distances) = neighbor_list(
+            box, positions, cutoff, return_distances=True
+        )
+        assert indptr.shape == (401,)
+        assert _csr_to_pairs(indptr, indices) == expected
+        assert np.all(distances < cutoff)
+        pairs = np.array(sorted(_csr_to_pairs(indptr, indices)))
+        assert np.allclose(
+            np.sort(distances), np.sort(box.distances(positions, pairs=pairs))
+        )
+
+    def test_full_neighbor_list(self):
+        box = molbox.Box(lengths=[6, 7, 8], angles=[90, 90, 120])
+        rng = np.random.default_rng(1)
+        positions = rng.uniform(0, 8, size=(200, 3))
+        (indptr, indices) = neighbor_list(box, positions, 1.5, full=True)
+        pairs = _csr_to_pairs(indptr, indices)
+        half = _brute_force_pairs(box, positions, 1.5)
+        assert pairs == half | {(j, i) for (i, j) in half}
+        for i in range(200):
+            nbrs = indices[indptr[i] : indptr[i + 1]]
+            assert np.all(np.diff(nbrs) > 0)
+
+    def test_no_neighbors(self):
+        box = molbox.Box(lengths=[10, 10, 10])
+        (indptr, indices) = neighbor_list(box, [[0, 0, 0], [5, 5, 5]], 1.0)
+        assert np.array_equal(indptr, [0, 0, 0])
+        assert indices.size == 0
+
+    def test_shape(self):
+        box = molbox.Box(lengths=[10, 5, 3])
+        cell_list = CellList(box, 1.2)
+        assert cell_list.shape == (8, 4, 2)
+        assert cell_list.cutoff == 1.2
+        assert cell_list.box is box
+
+    def test_cell_ids(self):
+        box = molbox.Box(lengths=[10, 5, 3])
+        cell_list = CellList(box, 1.2)
+        indices = cell_list.cell_indices([[9.9, 0.1, 2.9], [0.0, 2.6, 1.0]])
+        assert np.array_equal(indices, [[7, 0, 1], [0, 2, 0]])
+        assert np.array_equal(
+            cell_list.cell_ids(indices),
+            np.ravel_multi_index(indices.T, cell_list.shape),
+        )
+
+        neighbor_ids = cell_list.neighbor_cell_ids(indices)
+        # 3 x 3 cells in the first two directions, only 2 in the last one
+        assert neighbor_ids.shape == (2, 18)
+        assert len(set(neighbor_ids[0].tolist())) == 18
+        expected = {
+            np.ravel_multi_index(((7 + i) % 8, j % 4, k), (8, 4, 2))
+            for i in (-1, 0, 1)
+            for j in (-1, 0, 1)
+            for k in (0, 1)
+        }
+        assert set(neighbor_ids[0].tolist()) == expected
+
+    def test_cutoff_too_large(self):
+        box = molbox.Box(lengths=[10, 10, 3])
+        with pytest.raises(BoxError, match=r"larger than half"):
+            CellList(box, 2.0)
+        with pytest.raises(BoxError, match=r"must be positive"):
+            CellList(box, 0.0)
+
+    def test_update_box(self):
+        box = molbox.Box(lengths=[10, 10, 10])
+        cell_list = CellList(box, 1.5)
+        assert cell_list.shape == (6, 6, 6)
+
+        slightly_larger = molbox.Box(lengths=[10.1, 10.05, 10.2])
+        assert not cell_list.update_box(slightly_larger)
+        assert cell_list.shape == (6, 6, 6)
+        assert cell_list.box is slightly_larger
+
+        smaller = molbox.Box(lengths=[8.5, 10, 10])
+        assert cell_list.update_box(smaller)
+        assert cell_list.shape == (5, 6, 6)
+
+        rng = np.random.default_rng(2)
+        positions = rng.uniform(0, 10, size=(300, 3))
+        (indptr, indices) = cell_list.neighbors(positions)
+        assert _csr_to_pairs(indptr, indices) == _brute_force_pairs(
+            smaller, positions, 1.5
+        )
+
+
+class TestVerletList:
+    @pytest.fixture(autouse=True)
+    def initdir(self, tmpdir):
+        tmpdir.chdir()
+
+    @pytest.fixture
+    def system(self):
+        box = molbox.Box(lengths=[8, 9, 10], angles=[90, 90, 110])
+        rng = np.random.default_rng(4)
+        positions = box.wrap(rng.uniform(0, 10, size=(300, 3)))
+        return box, positions
+
+    def test_first_update_builds(self, system):
+        (box, positions) = system
+        verlet = VerletList(box, cutoff=1.5, skin=0.4)
+        assert verlet.needs_rebuild(positions)
+        assert verlet.update(positions)
+        assert verlet.n_builds == 1
+        assert _csr_to_pairs(verlet.indptr, verlet.indices) == (
+            _brute_force_pairs(box, positions, 1.9)
+        )
+
+    def test_small_displacements_reuse(self, system):
+        (box, positions) = system
+        verlet = VerletList(box, cutoff=1.5, skin=0.4)
+        rng = np.random.default_rng(5)
+        for _ in range(5):
+            positions = positions + rng.uniform(-0.02, 0.02, positions.shape)
+            (indptr, indices) = verlet.neighbors(positions)
+            assert _csr_to_pairs(indptr, indices) == _brute_force_pairs(
+                box, positions, 1.5
+            )
+        assert verlet.n_updates == 5
+        assert verlet.n_builds == 1
+        assert verlet.max_displacement(positions) <= 0.2
+
+    def test_large_displacement_rebuilds(self, system):
+        (box, positions) = system
+        verlet = VerletList(box, cutoff=1.5, skin=0.4)
+        verlet.update(positions)
+        moved = positions.copy()
+        moved[10] += [0.3, 0.0, 0.0]
+        assert not verlet.update(positions)
+        assert verlet.update(moved)
+        assert verlet.n_builds == 2
+        (indptr, indices, distances) = verlet.neighbors(
+            moved, return_distances=True
+        )
+        assert np.all(distances < 1.5)
+
+    def test_wrapped_displacement(self, system):
+        (box, positions) = system
+        verlet = VerletList(box, cutoff=1.5, skin=0.4)
+        verlet.update(positions)
+        # Translating by a box vector is not a displacement
+        shifted = positions + box.vectors[0]
+        assert verlet.max_displacement(shifted) < 1e-9
+        assert not verlet.update(shifted)
+
+    def test_box_change_rebuilds(self, system):
+        (box, positions) = system
+        verlet = VerletList(box, cutoff=1.5, skin=0.4)
+        verlet.update(positions)
+        same_box = molbox.Box(lengths=[8, 9, 10], angles=[90, 90, 110])
+        assert not verlet.update(positions, box=same_box)
+        larger = molbox.Box(lengths=[8.1, 9, 10], angles=[90, 90, 110])
+        assert verlet.update(positions, box=larger)
+        assert verlet.box is larger
+        assert verlet.n_builds == 2
+
+    def test_negative_skin(self, system):
+        (box, positions) = system
+        with pytest.raises(BoxError, match=r"must not be negative"):
+            VerletList(box, cutoff=1.5, skin=-0.1)
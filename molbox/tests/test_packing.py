@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+import molbox
+from molbox.box import BoxError
+from molbox.packing import insert_points
+
+
+class TestPacking:
+    @pytest.fixture(autouse=True)
+    def initdir(self, tmpdir):
+        tmpdir.chdir()
+
+    @pytest.mark.parametrize(
+        "lengths, angles",
+        [([5, 6, 7], [90, 90, 90]), ([5, 6, 7], [80, 100, 115])],
+    )
+    def test_insert_points(self, lengths, angles):
+        box = molbox.Box(lengths=lengths, angles=angles)
+        points = insert_points(box, 100, 1.0, rng=3)
+        assert points.shape == (100, 3)
+        dist = box.distances(points)
+        assert np.all(dist[np.triu_indices(100, k=1)] >= 1.0)
+        frac = box.to_fractional(points)
+        assert np.all((frac >= 0.0) & (frac < 1.0))
+
+    def test_existing(self):
+        box = molbox.Box(lengths=[6, 6, 6])
+        existing = np.array([[3.0, 3.0, 3.0], [0.0, 0.0, 0.0]])
+        points = insert_points(box, 50, 1.2, existing=existing, rng=1)
+        dist = box.distances(points, existing)
+        assert np.all(dist >= 1.2)
+
+    def test_reproducible(self):
+        box = molbox.Box(lengths=[6, 6, 6])
+        first = insert_points(box, 20, 1.0, rng=42)
+        second = insert_points(box, 20, 1.0, rng=np.random.default_rng(42))
+        assert np.array_equal(first, second)
+
+    def test_too_many_points(self):
+        box = molbox.Box(lengths=[3, 3, 3])
+        with pytest.raises(BoxError, match=r"Could only insert"):
+            insert_points(box, 100, 1.4, rng=0, max_attempts=2000)
+
+    def test_bad_min_distance(self):
+        box = molbox.Box(lengths=[6, 6, 3])
+        with pytest.raises(BoxError, match=r"minimum distance 2.0 is larger"):
+            insert_points(box, 10, 2.0)
+        with pytest.raises(BoxError, match=r"must be positive"):
+            insert_points(box, 10, 0.0)
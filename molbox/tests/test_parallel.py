@@ -0,0 +1,102 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pytest
+
+import molbox
+from molbox import parallel
+from molbox.box import BoxError
+from molbox.formats import lammps
+
+pytest.importorskip("multiprocessing.shared_memory")
+
+
+def make_boxes(seed):
+    """Return a seed dependent series of boxes with extra outputs."""
+    rng = np.random.default_rng(seed)
+    boxes = molbox.BoxArray(
+        rng.uniform(2, 3, size=(seed + 1, 3)),
+        rng.uniform(80, 100, (seed + 1, 3)),
+    )
+    return np.arange(seed + 1), boxes, f"seed {seed}"
+
+
+def write_dump(filename, lengths):
+    with open(filename, "w") as f:
+        for (timestep, length) in enumerate(lengths):
+            f.write(f"ITEM: TIMESTEP\n{timestep}\nITEM: NUMBER OF ATOMS\n1\n")
+            f.write("ITEM: BOX BOUNDS pp pp pp\n")
+            f.write(f"0 {length}\n0 {length}\n0 {length}\n")
+            f.write("ITEM: ATOMS id type x y z\n1 1 0.0 0.0 0.0\n")
+
+
+@pytest.fixture(scope="module")
+def executor():
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        yield executor
+
+
+class TestParallel:
+    @pytest.fixture(autouse=True)
+    def initdir(self, tmpdir):
+        tmpdir.chdir()
+
+    def test_map_boxes_order(self, executor):
+        results = list(
+            parallel.map_boxes(
+                make_boxes, range(10), executor=executor, max_in_flight=3
+            )
+        )
+        assert len(results) == 10
+        for (seed, (frames, boxes, label)) in enumerate(results):
+            (expected_frames, expected, expected_label) = make_boxes(seed)
+            assert np.array_equal(frames, expected_frames)
+            assert isinstance(boxes, molbox.BoxArray)
+            assert np.array_equal(boxes.vectors, expected.vectors)
+            assert label == expected_label
+
+    def test_map_readers(self, executor, tmpdir):
+        # Worker processes may have been started from another directory
+        filenames = []
+        for i in range(4):
+            filenames.append(str(tmpdir.join(f"dump{i}.lammpstrj")))
+            write_dump(filenames[-1], [10.0 + i, 11.0 + i])
+        results = parallel.map_boxes(
+            lammps.read_dump_boxes, filenames, executor=executor
+        )
+        for (i, (timesteps, boxes)) in enumerate(results):
+            assert np.array_equal(timesteps, [0, 1])
+            assert np.allclose(boxes.lengths[:, 0], [10.0 + i, 11.0 + i])
+
+    def test_early_stop(self, executor):
+        results = parallel.map_boxes(
+            make_boxes, range(20), executor=executor, max_in_flight=4
+        )
+        (frames, _, _) = next(results)
+        assert np.array_equal(frames, [0])
+        # Closing the generator frees the blocks of the pending results
+        results.close()
+
+    def test_from_vectors(self, executor):
+        rng = np.random.default_rng(0)
+        boxes = molbox.BoxArray(
+            rng.uniform(2, 3, size=(1000, 3)), rng.uniform(80, 100, (1000, 3))
+        )
+        converted = parallel.from_vectors(
+            boxes.vectors, chunk_size=128, executor=executor
+        )
+        expected = molbox.BoxArray.from_vectors(boxes.vectors)
+        assert np.array_equal(converted.vectors, expected.vectors)
+        assert np.array_equal(converted.angles, expected.angles)
+        assert len(parallel.from_vectors(np.zeros((0, 3, 3)))) == 0
+
+    def test_invalid_in_flight(self):
+        with pytest.raises(BoxError, match="max_in_flight"):
+            parallel.map_boxes(make_boxes, range(2), max_in_flight=0)
+
+    def test_requires_shared_memory(self, monkeypatch):
+        monkeypatch.setattr(parallel, "shared_memory", None)
+        with pytest.raises(BoxError, match="Python 3.8"):
+            parallel.map_boxes(make_boxes, range(2))
+        with pytest.raises(BoxError, match="Python 3.8"):
+            parallel.from_vectors(np.zeros((2, 3, 3)))
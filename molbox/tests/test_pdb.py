@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+import molbox
+from molbox.box import BoxError
+from molbox.formats import pdb
+
+
+def write_pdb(filename, records, n_atoms=3):
+    with open(filename, "w") as f:
+        for (i, record) in enumerate(records):
+            f.write(record + "\n")
+            f.write(f"MODEL     {i + 1:4d}\n")
+            for j in range(n_atoms):
+                f.write(
+                    f"ATOM  {j + 1:5d}  C   UNL     1    "
+                    f"{1.0:8.3f}{2.0:8.3f}{3.0:8.3f}  1.00  0.00           C\n"
+                )
+            f.write("ENDMDL\n")
+        f.write("END\n")
+
+
+class TestPdb:
+    @pytest.fixture(autouse=True)
+    def initdir(self, tmpdir):
+        tmpdir.chdir()
+
+    @pytest.fixture
+    def boxes(self):
+        return molbox.BoxArray(
+            lengths=[[30, 40, 50], [31, 41, 51], [20, 20, 20]],
+            angles=[[80, 95, 100], [90, 90, 90], [60, 60, 90]],
+        )
+
+    def test_format_cryst1(self):
+        box = molbox.Box(lengths=[30, 40, 50], angles=[80, 95, 100])
+        record = pdb.format_cryst1(box)
+        assert record == (
+            "CRYST1   30.000   40.000   50.000  80.00  95.00 100.00 "
+            "P 1           1"
+        )
+        assert len(record) == 70
+
+    def test_roundtrip(self, boxes):
+        write_pdb("traj.pdb", pdb.format_cryst1_records(boxes))
+        read = pdb.read_cryst1_boxes("traj.pdb")
+        assert isinstance(read, molbox.BoxArray)
+        assert np.allclose(read.lengths, boxes.lengths, atol=1e-3)
+        assert np.allclose(read.angles, boxes.angles, atol=1e-2)
+        for (box, expected) in zip(pdb.iter_cryst1_boxes("traj.pdb"), boxes):
+            assert box.isclose(expected, atol=1e-2)
+
+    def test_records_across_chunks(self, boxes, monkeypatch):
+        monkeypatch.setattr(pdb, "_SCAN_CHUNK_SIZE", 50)
+        write_pdb("traj.pdb", pdb.format_cryst1_records(boxes), n_atoms=7)
+        read = pdb.read_cryst1_boxes("traj.pdb")
+        assert np.allclose(read.lengths, boxes.lengths, atol=1e-3)
+
+    def test_no_records(self):
+        write_pdb("traj.pdb", [])
+        assert len(pdb.read_cryst1_boxes("traj.pdb")) == 0
+
+    def test_invalid_record(self):
+        write_pdb("traj.pdb", ["CRYST1   30.000   abc"])
+        with pytest.raises(BoxError, match="CRYST1"):
+            pdb.read_cryst1_boxes("traj.pdb")
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+import molbox
+from molbox.box import BoxError
+from molbox.series import BoxSeries
+
+
+class TestBoxSeries:
+    @pytest.fixture(autouse=True)
+    def initdir(self, tmpdir):
+        tmpdir.chdir()
+
+    @pytest.fixture
+    def boxes(self):
+        rng = np.random.default_rng(0)
+        lengths = rng.uniform(2, 3, size=(50, 3))
+        angles = rng.uniform(80, 100, size=(50, 3))
+        return molbox.BoxArray(lengths, angles)
+
+    @pytest.mark.parametrize("layout", ["vectors", "reduced", "lengths_angles"])
+    def test_layouts(self, boxes, layout):
+        if layout == "vectors":
+            np.save("series.npy", boxes.vectors)
+        elif layout == "reduced":
+            boxes.save("series.npy")
+        else:
+            np.save("series.npy", boxes.bravais_parameters)
+        series = BoxSeries("series.npy", layout=layout)
+        assert isinstance(series.data, np.memmap)
+        assert len(series) == 50
+        box = series[17]
+        assert isinstance(box, molbox.Box)
+        assert box.isclose(boxes[17], atol=1e-5)
+        assert series[-1].isclose(boxes[49], atol=1e-5)
+        sliced = series[10:20:3]
+        assert isinstance(sliced, molbox.BoxArray)
+        assert np.allclose(sliced.vectors, boxes.vectors[10:20:3], atol=1e-5)
+        picked = series[[3, 1, 4]]
+        assert np.allclose(picked.vectors, boxes.vectors[[3, 1, 4]], atol=1e-5)
+
+    def test_default_layout(self, boxes):
+        np.save("vectors.npy", boxes.vectors)
+        boxes.save("reduced.npy")
+        assert BoxSeries("vectors.npy").layout == "vectors"
+        assert BoxSeries("reduced.npy").layout == "reduced"
+
+    def test_array_source(self, boxes):
+        series = BoxSeries(boxes.vectors, precision=3)
+        assert series.precision == 3
+        assert series[0].precision == 3
+        assert np.allclose(series[0].lengths, boxes[0].lengths, atol=1e-3)
+
+    def test_iteration(self, boxes):
+        boxes.save("series.npy")
+        series = BoxSeries("series.npy")
+        chunks = list(series.iter_chunks(chunk_size=16))
+        assert [start for (start, _) in chunks] == [0, 16, 32, 48]
+        assert [len(chunk) for (_, chunk) in chunks] == [16, 16, 16, 2]
+        for (box, expected) in zip(series, boxes):
+            assert np.array_equal(box.vectors, expected.vectors)
+        with pytest.raises(BoxError, match="positive"):
+            next(series.iter_chunks(chunk_size=0))
+
+    def test_errors(self, boxes):
+        with pytest.raises(BoxError, match="Unknown layout"):
+            BoxSeries(boxes.vectors, layout="matrix")
+        with pytest.raises(BoxError, match="shape"):
+            BoxSeries(boxes.vectors, layout="reduced")
+        with pytest.raises(BoxError, match="shape"):
+            BoxSeries(np.zeros((5, 4)))
@@ -0,0 +1,98 @@
+import numpy as np
+import pytest
+
+import molbox
+from molbox.box import BoxError
+from molbox.storage import BoxStore
+
+BACKENDS = [("hdf5", "boxes.h5"), ("zarr", "boxes.zarr"), ("npy", "boxes")]
+
+
+class TestBoxStore:
+    @pytest.fixture(autouse=True)
+    def initdir(self, tmpdir):
+        tmpdir.chdir()
+
+    @pytest.fixture(params=BACKENDS, ids=["hdf5", "zarr", "npy"])
+    def store_args(self, request):
+        (backend, path) = request.param
+        if backend == "hdf5":
+            pytest.importorskip("h5py")
+        elif backend == "zarr":
+            pytest.importorskip("zarr")
+        return {"path": path, "backend": backend}
+
+    @pytest.fixture
+    def boxes(self):
+        rng = np.random.default_rng(0)
+        return molbox.BoxArray(
+            rng.uniform(2, 3, size=(25, 3)), rng.uniform(80, 100, (25, 3))
+        )
+
+    @pytest.mark.parametrize("compression", [None, "gzip"])
+    def test_append_and_read(self, store_args, boxes, compression):
+        with BoxStore(
+            **store_args, mode="w", chunk_size=4, compression=compression
+        ) as store:
+            store.append(boxes[:10])
+            store.append(boxes[10])
+            store.append(list(boxes[11:]))
+            assert len(store) == 25
+        with BoxStore(**store_args, mode="r") as store:
+            assert store.backend == store_args["backend"]
+            assert len(store) == 25
+            read = store.read()
+            assert isinstance(read, molbox.BoxArray)
+            assert np.array_equal(read.vectors, boxes.vectors)
+            assert np.array_equal(
+                store.read(5, 15).vectors, boxes.vectors[5:15]
+            )
+            assert np.array_equal(store[3:22:5].vectors, boxes.vectors[3:22:5])
+            assert store[-1].isclose(boxes[24])
+            assert len(store.read(10, 5)) == 0
+            with pytest.raises(IndexError):
+                store[25]
+            with pytest.raises(BoxError, match="read mode"):
+                store.append(boxes[0])
+
+    def test_reopen_append(self, store_args, boxes):
+        with BoxStore(**store_args, chunk_size=8) as store:
+            store.append(boxes[:5])
+        with BoxStore(**store_args) as store:
+            store.append(boxes[5:])
+            assert np.array_equal(store.read().vectors, boxes.vectors)
+        with BoxStore(**store_args, mode="w") as store:
+            assert len(store) == 0
+
+    def test_precision(self, store_args, boxes):
+        with BoxStore(**store_args, precision=3) as store:
+            store.append(boxes)
+            assert store.precision == 3
+        with BoxStore(**store_args, mode="r") as store:
+            assert store.precision == 3
+            assert store[0].precision == 3
+
+    def test_infer_backend(self):
+        store = BoxStore("boxes_dir")
+        assert store.backend == "npy"
+        with pytest.raises(BoxError, match="No box series"):
+            BoxStore("missing", mode="r")
+
+    def test_hdf5_group(self, boxes):
+        h5py = pytest.importorskip("h5py")
+        with h5py.File("traj.h5", "w") as f:
+            f.create_dataset("coordinates", data=np.zeros((25, 3, 3)))
+            store = BoxStore(f, name="cell")
+            store.append(boxes)
+            assert store.backend == "hdf5"
+        with h5py.File("traj.h5", "r") as f:
+            assert f["cell"].shape == (25, 6)
+            assert "coordinates" in f
+
+    def test_errors(self):
+        with pytest.raises(BoxError, match="Invalid mode"):
+            BoxStore("boxes", mode="x")
+        with pytest.raises(BoxError, match="Unknown backend"):
+            BoxStore("boxes", backend="sqlite")
+        with pytest.raises(BoxError, match="Unsupported compression"):
+            BoxStore("boxes", compression="lz4")
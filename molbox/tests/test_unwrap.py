@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+import molbox
+from molbox.box import BoxError
+from molbox.unwrap import Unwrapper, unwrap
+
+
+def _random_walk(n_frames, n_particles, step, seed=0):
+    rng = np.random.default_rng(seed)
+    start = rng.uniform(0, 3, size=(1, n_particles, 3))
+    steps = rng.normal(scale=step, size=(n_frames - 1, n_particles, 3))
+    return np.concatenate([start, start + np.cumsum(steps, axis=0)])
+
+
+class TestUnwrap:
+    @pytest.fixture(autouse=True)
+    def initdir(self, tmpdir):
+        tmpdir.chdir()
+
+    @pytest.mark.parametrize(
+        "lengths, angles",
+        [([4, 5, 6], [90, 90, 90]), ([4, 5, 6], [80, 95, 110])],
+    )
+    def test_constant_box(self, lengths, angles):
+        box = molbox.Box(lengths=lengths, angles=angles)
+        trajectory = _random_walk(50, 20, 0.3)
+        frames = ((box.wrap(xyz), box) for xyz in trajectory)
+        for (expected, unwrapped) in zip(trajectory, unwrap(frames)):
+            # The unwrapped trajectory matches the original one up to a
+            # constant lattice translation fixed by the first frame.
+            assert np.allclose(
+                unwrapped - expected, box.wrap(trajectory[0]) - trajectory[0]
+            )
+
+    def test_images(self):
+        box = molbox.Box(lengths=[4, 5, 6], angles=[90, 90, 120])
+        trajectory = _random_walk(100, 10, 0.4, seed=1)
+        unwrapper = Unwrapper()
+        assert unwrapper.images is None
+        for xyz in trajectory:
+            unwrapper.update(box.wrap(xyz), box)
+        assert unwrapper.n_frames == 100
+        # Image counts are the number of box crossings along each vector
+        images = np.floor(box.to_fractional(trajectory[-1])) - np.floor(
+            box.to_fractional(trajectory[0])
+        )
+        assert np.array_equal(unwrapper.images, images)
+
+    def test_changing_box(self):
+        trajectory = _random_walk(60, 15, 0.25, seed=2)
+        scales = 1.0 + 0.05 * np.sin(np.linspace(0, 6, 60))
+        boxes = [molbox.Box(lengths=[4 * s, 5 * s, 6 * s]) for s in scales]
+        steps = np.diff(trajectory, axis=0)
+        out = np.empty((15, 3))
+        unwrapper = Unwrapper()
+        previous = None
+        for (xyz, box, step) in zip(trajectory, boxes, [None, *steps]):
+            current = unwrapper.update(box.wrap(xyz), box, out=out).copy()
+            if previous is not None:
+                # Displacements between frames are recovered up to the small
+                # change of the box, without any jump across the box
+                assert np.all(np.abs(current - previous - step) < 0.1)
+            previous = current
+        assert np.allclose(current, out)
+
+    def test_mismatched_frames(self):
+        box = molbox.Box(lengths=[4, 5, 6])
+        unwrapper = Unwrapper()
+        unwrapper.update(np.zeros((3, 3)), box)
+        with pytest.raises(BoxError, match=r"does not match"):
+            unwrapper.update(np.zeros((4, 3)), box)
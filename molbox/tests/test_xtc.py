@@ -0,0 +1,63 @@
+import struct
+
+import numpy as np
+import pytest
+
+import molbox
+from molbox.box import BoxError
+from molbox.formats import xtc
+
+
+def write_xtc(filename, boxes, n_atoms=100):
+    """Write XTC frames with the given (3,3) boxes and dummy coordinates."""
+    with open(filename, "wb") as f:
+        for (i, box) in enumerate(boxes):
+            f.write(struct.pack(">3if", 1995, n_atoms, 10 * i, 0.5 * i))
+            f.write(struct.pack(">9f", *np.ravel(box)))
+            f.write(struct.pack(">i", n_atoms))
+            if n_atoms <= 9:
+                f.write(struct.pack(f">{3 * n_atoms}f", *[0.1] * 3 * n_atoms))
+                continue
+            # The compressed block is never decoded, only its size matters
+            size = 37 + 13 * i
+            f.write(struct.pack(">f3i3iii", 1000.0, *[0] * 7, size))
+            f.write(b"\xff" * size + b"\0" * (-size % 4))
+
+
+class TestXtc:
+    @pytest.fixture(autouse=True)
+    def initdir(self, tmpdir):
+        tmpdir.chdir()
+
+    @pytest.fixture
+    def boxes(self):
+        return molbox.BoxArray(
+            lengths=[[3, 4, 5], [3.1, 4.1, 5.1], [4, 4, 4]],
+            angles=[[90, 90, 90], [80, 95, 100], [60, 60, 90]],
+        )
+
+    @pytest.mark.parametrize("n_atoms", [5, 100])
+    def test_read_xtc_boxes(self, boxes, n_atoms):
+        write_xtc("traj.xtc", boxes.vectors, n_atoms=n_atoms)
+        (steps, times, read) = xtc.read_xtc_boxes("traj.xtc")
+        assert np.array_equal(steps, [0, 10, 20])
+        assert np.allclose(times, [0.0, 0.5, 1.0])
+        assert isinstance(read, molbox.BoxArray)
+        assert np.allclose(read.vectors, boxes.vectors, atol=1e-5)
+        for ((step, _, box), expected) in zip(
+            xtc.iter_xtc_boxes("traj.xtc"), boxes
+        ):
+            assert box.isclose(expected, atol=1e-5)
+
+    def test_truncated(self, boxes):
+        write_xtc("traj.xtc", boxes.vectors)
+        with open("traj.xtc", "rb+") as f:
+            f.truncate(f.seek(0, 2) - 8)
+        with pytest.raises(BoxError, match="Truncated"):
+            xtc.read_xtc_boxes("traj.xtc")
+
+    def test_invalid(self):
+        with open("traj.xtc", "wb") as f:
+            f.write(b"\0" * 200)
+        with pytest.raises(BoxError, match="Invalid XTC"):
+            xtc.read_xtc_boxes("traj.xtc")
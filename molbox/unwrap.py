@@ -0,0 +1,103 @@
+"""Unwrapping of periodic coordinates across trajectory frames."""
+import numpy as np
+
+from molbox.box import BoxError
+
+__all__ = ["Unwrapper", "unwrap"]
+
+
+class Unwrapper(object):
+    """Incrementally unwrap wrapped coordinates, one frame at a time.
+
+    Between two consecutive frames, the displacement of each particle is
+    brought back to its minimum image in the box of the newer frame, and
+    accumulated onto the unwrapped coordinates of the previous frame. This
+    handles boxes changing between frames (e.g. NPT trajectories) without the
+    artifacts of multiplying image counts by the current box vectors. Only the
+    latest wrapped and unwrapped coordinates and the image counts are stored,
+    the state is O(N) regardless of the trajectory length.
+
+    Particles are assumed to move less than half the box between two frames.
+
+    Attributes
+    ----------
+    images : np.ndarray, shape=(N, 3), dtype=int
+        Number of times each particle crossed the box along each box vector.
+    n_frames : int
+        Number of frames processed.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Forget all previous frames."""
+        self._wrapped = None
+        self._unwrapped = None
+        self._images = None
+        self.n_frames = 0
+
+    @property
+    def images(self):
+        """Number of box crossings of each particle along each box vector."""
+        return None if self._images is None else self._images.copy()
+
+    def update(self, positions, box, out=None):
+        """Process the next frame and return its unwrapped coordinates.
+
+        Parameters
+        ----------
+        positions : array-like, shape=(N, 3), dtype=float
+            Wrapped Cartesian coordinates of the frame.
+        box : molbox.Box
+            The box of the frame.
+        out : np.ndarray, shape=(N, 3), optional, default=None
+            Array to store the unwrapped coordinates in.
+
+        Returns
+        -------
+        unwrapped : np.ndarray, shape=(N, 3)
+            The unwrapped coordinates, `out` if it was provided.
+        """
+        positions = np.array(positions, dtype=np.float64).reshape(-1, 3)
+        if self._wrapped is None:
+            self._unwrapped = positions.copy()
+            self._images = np.zeros(positions.shape, dtype=np.int64)
+        else:
+            if positions.shape != self._wrapped.shape:
+                raise BoxError(
+                    f"Frame with {positions.shape[0]} particles does not match "
+                    f"the {self._wrapped.shape[0]} particles of the previous "
+                    "frames."
+                )
+            dfrac = box.to_fractional(positions - self._wrapped)
+            jumps = np.round(dfrac)
+            self._images -= jumps.astype(np.int64)
+            dfrac -= jumps
+            self._unwrapped += box.to_cartesian(dfrac, out=dfrac)
+        self._wrapped = positions
+        self.n_frames += 1
+
+        if out is None:
+            return self._unwrapped.copy()
+        out[...] = self._unwrapped
+        return out
+
+
+def unwrap(frames):
+    """Unwrap the coordinates of a stream of frames.
+
+    Parameters
+    ----------
+    frames : iterable of (positions, box)
+        Wrapped Cartesian coordinates, shape=(N, 3), and `molbox.Box` of each
+        frame, in trajectory order.
+
+    Yields
+    ------
+    unwrapped : np.ndarray, shape=(N, 3)
+        The unwrapped coordinates of each frame.
+    """
+    unwrapper = Unwrapper()
+    for (positions, box) in frames:
+        yield unwrapper.update(positions, box)